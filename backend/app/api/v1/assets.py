@@ -1,7 +1,7 @@
 """
 Asset API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime
@@ -10,6 +10,7 @@ from ...core.database import get_db
 from ...models.asset import Asset
 from ...models.employee import Employee
 from ...schemas.asset import AssetCreate, AssetUpdate, AssetResponse
+from ...utils.pagination import keyset_paginate, set_page_headers
 
 router = APIRouter()
 
@@ -52,8 +53,10 @@ async def create_asset(asset: AssetCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[AssetResponse])
 async def list_assets(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     category: Optional[str] = None,
     status: Optional[str] = None,
     condition: Optional[str] = None,
@@ -90,12 +93,12 @@ async def list_assets(
             (Asset.model.ilike(f"%{search}%"))
         )
     
-    query = query.order_by(Asset.asset_tag)
-    assets = query.offset(skip).limit(limit).all()
+    page = keyset_paginate(query, [Asset.asset_tag], Asset.id, limit=limit, cursor=cursor, skip=skip)
+    set_page_headers(response, page)
     
     # Add employee names to response
     results = []
-    for asset in assets:
+    for asset in page.rows:
         result = AssetResponse.model_validate(asset)
         if asset.employee:
             result.employee_name = f"{asset.employee.first_name} {asset.employee.last_name}"
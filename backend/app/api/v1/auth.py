@@ -8,8 +8,12 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from uuid import uuid4, UUID
 
+from app.core.auth_cache import AuthenticatedUser, principal_cache, revoke_tokens
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token, create_refresh_token, decode_token
+from app.core.security import (
+    verify_password_async, get_password_hash_async, password_needs_rehash,
+    create_access_token, create_refresh_token, decode_token
+)
 from app.core.config import settings
 from app.models.user import User
 from app.schemas.user import UserResponse, Token, TokenRefresh
@@ -36,13 +40,19 @@ class DevUser:
         self.last_login = datetime.utcnow()
         self.created_at = datetime.utcnow()
         self.updated_at = datetime.utcnow()
+        self.token_version = 0
 
 
-async def get_current_user(
+def get_current_user(
     token: Annotated[Optional[str], Depends(oauth2_scheme)],
     db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token"""
+) -> AuthenticatedUser:
+    """
+    Get current authenticated user from JWT token
+    Returns a detached snapshot; handlers that modify the user load the row.
+    Verified users are cached per token version, so repeat requests skip the
+    users query.
+    """
     
     # Development mode bypass - return a fake admin user
     if settings.DEV_MODE:
@@ -65,15 +75,21 @@ async def get_current_user(
     username: str = payload.get("sub")
     if username is None:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    
-    if not user.is_active:
+    token_version = payload.get("ver", 0)
+    
+    principal = principal_cache.get(username, token_version)
+    if principal is None:
+        user = db.query(User).filter(User.username == username).first()
+        # A bumped token_version revokes tokens issued before it
+        if user is None or (user.token_version or 0) != token_version:
+            raise credentials_exception
+        principal = AuthenticatedUser(user)
+        principal_cache.set(username, principal)
+    
+    if not principal.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    return user
+    return principal
 
 
 @router.post("/login", response_model=Token)
@@ -92,8 +108,8 @@ async def login(
     if not user:
         user = db.query(User).filter(User.email == form_data.username).first()
     
-    # Verify user exists and password is correct
-    if not user or not verify_password(form_data.password, user.password_hash):
+    # Verify user exists and password is correct (bcrypt runs off the event loop)
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -103,15 +119,22 @@ async def login(
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
+    # Upgrade hashes made with a different BCRYPT_ROUNDS while we have the password
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(form_data.password)
+        db.commit()
+    
     # Create access token
     access_token = create_access_token(
         subject=user.username,
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        token_version=user.token_version or 0
     )
     
     # Create refresh token
     refresh_token = create_refresh_token(
-        subject=user.username
+        subject=user.username,
+        token_version=user.token_version or 0
     )
     
     return {
@@ -148,15 +171,22 @@ async def refresh_token(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive"
         )
+    if (user.token_version or 0) != payload.get("ver", 0):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
     
     # Create new tokens
     access_token = create_access_token(
         subject=user.username,
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        token_version=user.token_version or 0
     )
     
     refresh_token = create_refresh_token(
-        subject=user.username
+        subject=user.username,
+        token_version=user.token_version or 0
     )
     
     return {
@@ -179,7 +209,25 @@ async def logout(
     current_user: Annotated[User, Depends(get_current_user)]
 ):
     """
-    Logout endpoint.
-    In a stateless JWT setup, the client should discard the token.
+    Logout endpoint for the current session.
+    In a stateless JWT setup, the client should discard the token; other
+    sessions of the user stay signed in.
     """
     return {"message": "Successfully logged out"}
+
+
+@router.post("/logout-all")
+def logout_all(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Session = Depends(get_db)
+):
+    """
+    Log out everywhere.
+    Revokes every access and refresh token issued to the user so far, on
+    all devices, including the one making this request.
+    """
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user:
+        revoke_tokens(user)
+        db.commit()
+    return {"message": "Logged out of all sessions"}
@@ -1,7 +1,7 @@
 """
 Employee API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -9,6 +9,7 @@ from datetime import datetime
 from ...core.database import get_db
 from ...models.employee import Employee
 from ...schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse
+from ...utils.pagination import keyset_paginate, set_page_headers
 
 router = APIRouter()
 
@@ -36,8 +37,10 @@ async def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db
 
 @router.get("/", response_model=List[EmployeeResponse])
 async def list_employees(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     is_active: Optional[bool] = None,
     department: Optional[str] = None,
     search: Optional[str] = None,
@@ -60,9 +63,12 @@ async def list_employees(
             (Employee.email.ilike(f"%{search}%"))
         )
     
-    query = query.order_by(Employee.last_name, Employee.first_name)
-    employees = query.offset(skip).limit(limit).all()
-    return employees
+    page = keyset_paginate(
+        query, [Employee.last_name, Employee.first_name], Employee.id,
+        limit=limit, cursor=cursor, skip=skip
+    )
+    set_page_headers(response, page)
+    return page.rows
 
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
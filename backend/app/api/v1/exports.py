@@ -0,0 +1,231 @@
+"""
+Streaming export endpoints for full-period compliance downloads
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import or_
+from sqlalchemy.orm import aliased
+
+from app.api.v1.auth import get_current_user
+from app.models.audit import AuditLog, AuditAction
+from app.models.inventory import InventoryCurrent
+from app.models.inventory_item import InventoryItem
+from app.models.item import Item
+from app.models.location import Location
+from app.models.par_level import ParLevel
+from app.models.rfid import InventoryMovement, MovementType
+from app.models.user import User
+from app.services.export_stream import ExportFormat, stream_export
+
+router = APIRouter()
+
+CURSOR_DESCRIPTION = "cursor of the last row received, to resume an interrupted export"
+
+
+def _stamp() -> str:
+    return datetime.utcnow().strftime("%Y%m%d")
+
+
+@router.get("/movements")
+async def export_movements(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv or ndjson"),
+    start_date: Optional[datetime] = Query(None, description="Movements from this time"),
+    end_date: Optional[datetime] = Query(None, description="Movements up to this time"),
+    location_id: Optional[UUID] = Query(None, description="Filter by from/to location"),
+    item_id: Optional[UUID] = Query(None, description="Filter by item"),
+    movement_type: Optional[MovementType] = Query(None, description="Filter by movement type"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export the inventory movement log, oldest first
+    """
+    from_location = aliased(Location)
+    to_location = aliased(Location)
+    columns = {
+        "id": InventoryMovement.id,
+        "created_at": InventoryMovement.created_at,
+        "movement_type": InventoryMovement.movement_type,
+        "item_code": Item.item_code,
+        "item_name": Item.name,
+        "quantity": InventoryMovement.quantity,
+        "from_location": from_location.name,
+        "to_location": to_location.name,
+        "reference_number": InventoryMovement.reference_number,
+        "notes": InventoryMovement.notes,
+        "performed_by": User.username,
+    }
+
+    def refine(query):
+        query = query.select_from(InventoryMovement).outerjoin(
+            Item, InventoryMovement.item_id == Item.id
+        ).outerjoin(
+            from_location, InventoryMovement.from_location_id == from_location.id
+        ).outerjoin(
+            to_location, InventoryMovement.to_location_id == to_location.id
+        ).outerjoin(
+            User, InventoryMovement.user_id == User.id
+        )
+        if start_date:
+            query = query.filter(InventoryMovement.created_at >= start_date)
+        if end_date:
+            query = query.filter(InventoryMovement.created_at <= end_date)
+        if location_id:
+            query = query.filter(or_(
+                InventoryMovement.from_location_id == location_id,
+                InventoryMovement.to_location_id == location_id
+            ))
+        if item_id:
+            query = query.filter(InventoryMovement.item_id == item_id)
+        if movement_type:
+            query = query.filter(InventoryMovement.movement_type == movement_type)
+        return query
+
+    return stream_export(
+        request, f"movements-{_stamp()}", columns, ["created_at", "id"], refine,
+        fmt=format, cursor=cursor
+    )
+
+
+@router.get("/audit")
+async def export_audit_log(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv or ndjson"),
+    start_date: Optional[datetime] = Query(None, description="Entries from this time"),
+    end_date: Optional[datetime] = Query(None, description="Entries up to this time"),
+    user_id: Optional[UUID] = Query(None, description="Filter by user"),
+    action: Optional[AuditAction] = Query(None, description="Filter by action type"),
+    entity_type: Optional[str] = Query(None, description="Filter by entity type"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export the audit log, oldest first
+    """
+    columns = {
+        "id": AuditLog.id,
+        "timestamp": AuditLog.timestamp,
+        "user": User.username,
+        "action": AuditLog.action,
+        "entity_type": AuditLog.entity_type,
+        "entity_id": AuditLog.entity_id,
+        "changes": AuditLog.changes,
+        "ip_address": AuditLog.ip_address,
+        "user_agent": AuditLog.user_agent,
+    }
+
+    def refine(query):
+        query = query.select_from(AuditLog).outerjoin(User, AuditLog.user_id == User.id)
+        if start_date:
+            query = query.filter(AuditLog.timestamp >= start_date)
+        if end_date:
+            query = query.filter(AuditLog.timestamp <= end_date)
+        if user_id:
+            query = query.filter(AuditLog.user_id == user_id)
+        if action:
+            query = query.filter(AuditLog.action == action)
+        if entity_type:
+            query = query.filter(AuditLog.entity_type == entity_type)
+        return query
+
+    return stream_export(
+        request, f"audit-log-{_stamp()}", columns, ["timestamp", "id"], refine,
+        fmt=format, cursor=cursor
+    )
+
+
+@router.get("/inventory")
+async def export_inventory_snapshot(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv or ndjson"),
+    location_id: Optional[UUID] = Query(None, description="Filter by location"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export current on-hand stock per location and item with par levels
+    """
+    columns = {
+        "id": InventoryCurrent.id,
+        "location": Location.name,
+        "item_code": Item.item_code,
+        "item_name": Item.name,
+        "unit_of_measure": Item.unit_of_measure,
+        "quantity_on_hand": InventoryCurrent.quantity_on_hand,
+        "quantity_allocated": InventoryCurrent.quantity_allocated,
+        "quantity_available": InventoryCurrent.quantity_on_hand - InventoryCurrent.quantity_allocated,
+        "par_quantity": ParLevel.par_quantity,
+        "reorder_quantity": ParLevel.reorder_quantity,
+        "last_counted_at": InventoryCurrent.last_counted_at,
+    }
+
+    def refine(query):
+        query = query.select_from(InventoryCurrent).join(
+            Item, InventoryCurrent.item_id == Item.id
+        ).join(
+            Location, InventoryCurrent.location_id == Location.id
+        ).outerjoin(
+            ParLevel,
+            (ParLevel.location_id == InventoryCurrent.location_id) &
+            (ParLevel.item_id == InventoryCurrent.item_id)
+        )
+        if location_id:
+            query = query.filter(InventoryCurrent.location_id == location_id)
+        return query
+
+    return stream_export(
+        request, f"inventory-{_stamp()}", columns, ["id"], refine,
+        fmt=format, cursor=cursor
+    )
+
+
+@router.get("/expirations")
+async def export_expirations(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv or ndjson"),
+    days_ahead: int = Query(90, ge=1, le=3650, description="Look ahead days"),
+    include_expired: bool = Query(True, description="Include already expired items"),
+    location_id: Optional[UUID] = Query(None, description="Filter by location"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Export individually tracked units by expiration date, soonest first
+    """
+    now = datetime.utcnow()
+    columns = {
+        "id": InventoryItem.id,
+        "rfid_tag": InventoryItem.rfid_tag,
+        "item_code": Item.item_code,
+        "item_name": Item.name,
+        "location": Location.name,
+        "lot_number": InventoryItem.lot_number,
+        "expiration_date": InventoryItem.expiration_date,
+        "cost_per_unit": Item.cost_per_unit,
+    }
+
+    def refine(query):
+        query = query.select_from(InventoryItem).join(
+            Item, InventoryItem.item_id == Item.id
+        ).join(
+            Location, InventoryItem.location_id == Location.id
+        ).filter(
+            InventoryItem.expiration_date.isnot(None),
+            InventoryItem.expiration_date <= now + timedelta(days=days_ahead),
+            Item.is_active == True,
+            Location.is_active == True
+        )
+        if not include_expired:
+            query = query.filter(InventoryItem.expiration_date >= now)
+        if location_id:
+            query = query.filter(InventoryItem.location_id == location_id)
+        return query
+
+    return stream_export(
+        request, f"expirations-{_stamp()}", columns, ["expiration_date", "id"], refine,
+        fmt=format, cursor=cursor
+    )
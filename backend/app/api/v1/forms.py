@@ -1,7 +1,7 @@
 """
 Form API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime
@@ -18,6 +18,7 @@ from ...schemas.form import (
 )
 from app.api.v1.auth import get_current_user
 from ...models.user import User
+from ...utils.pagination import keyset_paginate, set_page_headers
 
 router = APIRouter()
 
@@ -187,8 +188,10 @@ async def create_form_submission(
 
 @router.get("/submissions", response_model=List[FormSubmissionResponse])
 async def list_form_submissions(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     template_id: Optional[str] = None,
     status: Optional[str] = None,
     submitted_by: Optional[str] = None,
@@ -218,12 +221,15 @@ async def list_form_submissions(
     if end_date:
         query = query.filter(FormSubmission.created_at <= end_date)
     
-    query = query.order_by(FormSubmission.created_at.desc())
-    submissions = query.offset(skip).limit(limit).all()
+    page = keyset_paginate(
+        query, [FormSubmission.created_at], FormSubmission.id,
+        limit=limit, cursor=cursor, skip=skip, descending=True
+    )
+    set_page_headers(response, page)
     
     # Add template names to response
     results = []
-    for submission in submissions:
+    for submission in page.rows:
         result = FormSubmissionResponse.model_validate(submission)
         if submission.template:
             result.template_name = submission.template.name
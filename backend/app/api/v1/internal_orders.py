@@ -5,7 +5,7 @@ Manages internal restock orders for logistics operations
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from pydantic import BaseModel
@@ -16,6 +16,7 @@ from app.models.user import User
 from app.models.internal_order import InternalOrder, InternalOrderItem, InternalOrderStatus
 from app.models.item import Item
 from app.models.location import Location
+from app.utils.pagination import keyset_paginate, set_page_headers
 
 router = APIRouter()
 
@@ -53,9 +54,11 @@ class InternalOrderDetailResponse(BaseModel):
 
 @router.get("/", response_model=List[InternalOrderResponse])
 async def list_internal_orders(
+    response: Response,
     status: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -69,10 +72,14 @@ async def list_internal_orders(
         except ValueError:
             pass  # Invalid status, ignore filter
     
-    orders = query.order_by(desc(InternalOrder.order_date)).offset(skip).limit(limit).all()
+    page = keyset_paginate(
+        query, [InternalOrder.order_date], InternalOrder.id,
+        limit=limit, cursor=cursor, skip=skip, descending=True
+    )
+    set_page_headers(response, page)
     
-    response = []
-    for order in orders:
+    results = []
+    for order in page.rows:
         # Get total items and quantity
         items = db.query(InternalOrderItem).filter(InternalOrderItem.order_id == order.id).all()
         total_items = len(set(item.item_id for item in items))
@@ -87,7 +94,7 @@ async def list_internal_orders(
         creator = db.query(User).filter(User.id == order.created_by).first() if order.created_by else None
         created_by_name = f"{creator.first_name} {creator.last_name}" if creator else None
         
-        response.append(InternalOrderResponse(
+        results.append(InternalOrderResponse(
             id=str(order.id),
             order_number=order.order_number,
             status=order.status.value,
@@ -100,7 +107,7 @@ async def list_internal_orders(
             notes=order.notes
         ))
     
-    return response
+    return results
 
 
 @router.get("/{order_id}", response_model=InternalOrderDetailResponse)
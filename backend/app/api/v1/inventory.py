@@ -2,12 +2,13 @@
 Inventory API Routes
 Manages inventory levels, movements, and transfers between locations
 """
+import enum
 from typing import List, Optional, Annotated
 from uuid import UUID
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, desc, and_
 from pydantic import BaseModel
 
 from app.core.database import get_db
@@ -15,13 +16,17 @@ from app.api.v1.auth import get_current_user
 from app.models.user import User
 from app.models.inventory import InventoryCurrent
 from app.models.par_level import ParLevel
+from app.models.par_breach import ParBreach
 from app.models.rfid import InventoryMovement, MovementType
-from app.models.item import Item
+from app.models.item import Item, Category
 from app.models.location import Location
 from app.models.audit import AuditLog, AuditAction
 from app.models.inventory_item import InventoryItem
 from app.models.order import PurchaseOrder, PurchaseOrderItem, OrderStatus, Vendor
 from app.models.internal_order import InternalOrder, InternalOrderItem, InternalOrderStatus
+from app.services.location_tree import in_subtree
+from app.services import par_breach
+from app.utils.pagination import keyset_paginate, set_page_headers
 
 router = APIRouter()
 
@@ -78,7 +83,7 @@ class InventoryMovementResponse(BaseModel):
     movement_type: MovementType
     reference_number: Optional[str]
     notes: Optional[str]
-    performed_by_id: UUID
+    performed_by_id: Optional[UUID]
     created_at: datetime
     
     # Enriched data
@@ -93,8 +98,9 @@ class InventoryMovementResponse(BaseModel):
 
 
 @router.get("/current", response_model=List[InventoryCurrentResponse])
-async def get_current_inventory(
+def get_current_inventory(
     location_id: Optional[UUID] = None,
+    subtree_of: Optional[UUID] = Query(None, description="Limit to this location and every location below it"),
     item_id: Optional[UUID] = None,
     below_par: bool = False,
     skip: int = Query(0, ge=0),
@@ -105,57 +111,62 @@ async def get_current_inventory(
     """
     Get current inventory levels across all locations or for specific location/item
     """
-    query = db.query(InventoryCurrent)
+    # Inventory rows with item and location details in one query
+    quantity_available = InventoryCurrent.quantity_on_hand - InventoryCurrent.quantity_allocated
+    query = db.query(
+        InventoryCurrent.id,
+        InventoryCurrent.location_id,
+        InventoryCurrent.item_id,
+        InventoryCurrent.quantity_on_hand,
+        InventoryCurrent.quantity_allocated,
+        InventoryCurrent.last_counted_at,
+        InventoryCurrent.last_counted_by,
+        Item.name.label("item_name"),
+        Item.item_code,
+        Item.unit_of_measure,
+        Location.name.label("location_name")
+    ).join(
+        Item, Item.id == InventoryCurrent.item_id
+    ).join(
+        Location, Location.id == InventoryCurrent.location_id
+    )
     
     if location_id:
         query = query.filter(InventoryCurrent.location_id == location_id)
+    if subtree_of:
+        query = query.filter(in_subtree(InventoryCurrent.location_id, subtree_of))
     if item_id:
         query = query.filter(InventoryCurrent.item_id == item_id)
-    
-    inventory_records = query.offset(skip).limit(limit).all()
-    
-    # Enrich with item and location data
-    result = []
-    for inv in inventory_records:
-        item = db.query(Item).filter(Item.id == inv.item_id).first()
-        location = db.query(Location).filter(Location.id == inv.location_id).first()
-        
-        if not item or not location:
-            continue
-        
-        quantity_available = inv.quantity_on_hand - inv.quantity_allocated
-        
-        # Check if below par level if requested
-        if below_par:
-            from app.models.par_level import ParLevel
-            par_level = db.query(ParLevel).filter(
-                ParLevel.location_id == inv.location_id,
-                ParLevel.item_id == inv.item_id
-            ).first()
-            
-            if not par_level or quantity_available >= par_level.par_quantity:
-                continue
-        
-        result.append(InventoryCurrentResponse(
-            id=inv.id,
-            location_id=inv.location_id,
-            item_id=inv.item_id,
-            quantity_on_hand=inv.quantity_on_hand,
-            quantity_allocated=inv.quantity_allocated,
-            quantity_available=quantity_available,
-            last_counted_at=inv.last_counted_at,
-            last_counted_by_id=inv.last_counted_by,
-            item_name=item.name,
-            item_code=item.item_code,
-            location_name=location.name,
-            unit_of_measure=item.unit_of_measure
-        ))
-    
-    return result
+    if below_par:
+        # Only rows with a par level at their location and less available than it
+        query = query.join(
+            ParLevel, and_(
+                ParLevel.location_id == InventoryCurrent.location_id,
+                ParLevel.item_id == InventoryCurrent.item_id
+            )
+        ).filter(quantity_available < ParLevel.par_quantity)
+    
+    return [
+        InventoryCurrentResponse(
+            id=row.id,
+            location_id=row.location_id,
+            item_id=row.item_id,
+            quantity_on_hand=row.quantity_on_hand,
+            quantity_allocated=row.quantity_allocated,
+            quantity_available=row.quantity_on_hand - row.quantity_allocated,
+            last_counted_at=row.last_counted_at,
+            last_counted_by_id=row.last_counted_by,
+            item_name=row.item_name,
+            item_code=row.item_code,
+            location_name=row.location_name,
+            unit_of_measure=row.unit_of_measure
+        )
+        for row in query.offset(skip).limit(limit).all()
+    ]
 
 
 @router.post("/count")
-async def physical_count(
+def physical_count(
     count_data: PhysicalCountRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -239,7 +250,7 @@ async def physical_count(
 
 
 @router.post("/transfer")
-async def transfer_inventory(
+def transfer_inventory(
     transfer_data: InventoryTransferRequest,
     # current_user: User = Depends(get_current_user),  # TEMP: Disabled for testing
     db: Session = Depends(get_db)
@@ -326,6 +337,8 @@ async def transfer_inventory(
     # )
     # db.add(audit_log)
     
+    # Stock alerts for this write follow the check_on_transfer setting
+    par_breach.mark_source(db, par_breach.TRANSFER)
     db.commit()
     
     return {
@@ -337,21 +350,29 @@ async def transfer_inventory(
 
 
 @router.get("/movements", response_model=List[InventoryMovementResponse])
-async def get_movements(
+def get_movements(
+    response: Response,
     location_id: Optional[UUID] = None,
+    subtree_of: Optional[UUID] = Query(None, description="Limit to this location and every location below it"),
     item_id: Optional[UUID] = None,
     movement_type: Optional[MovementType] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get inventory movement history with filters
+    Get inventory movement history with filters, newest first
     """
-    query = db.query(InventoryMovement)
+    query = db.query(InventoryMovement).options(
+        joinedload(InventoryMovement.item),
+        joinedload(InventoryMovement.from_location),
+        joinedload(InventoryMovement.to_location),
+        joinedload(InventoryMovement.user)
+    )
     
     # Apply filters
     if location_id:
@@ -359,6 +380,11 @@ async def get_movements(
             (InventoryMovement.from_location_id == location_id) |
             (InventoryMovement.to_location_id == location_id)
         )
+    if subtree_of:
+        query = query.filter(
+            in_subtree(InventoryMovement.from_location_id, subtree_of) |
+            in_subtree(InventoryMovement.to_location_id, subtree_of)
+        )
     if item_id:
         query = query.filter(InventoryMovement.item_id == item_id)
     if movement_type:
@@ -368,16 +394,16 @@ async def get_movements(
     if end_date:
         query = query.filter(InventoryMovement.created_at <= end_date)
     
-    movements = query.order_by(desc(InventoryMovement.created_at)).offset(skip).limit(limit).all()
+    page = keyset_paginate(
+        query, [InventoryMovement.created_at], InventoryMovement.id,
+        limit=limit, cursor=cursor, skip=skip, descending=True
+    )
+    set_page_headers(response, page)
     
-    # Enrich with related data
     result = []
-    for mov in movements:
-        item = db.query(Item).filter(Item.id == mov.item_id).first()
-        from_loc = db.query(Location).filter(Location.id == mov.from_location_id).first() if mov.from_location_id else None
-        to_loc = db.query(Location).filter(Location.id == mov.to_location_id).first() if mov.to_location_id else None
-        user = db.query(User).filter(User.id == mov.performed_by_id).first()
-        
+    for mov in page.rows:
+        item = mov.item
+        user = mov.user
         result.append(InventoryMovementResponse(
             id=mov.id,
             item_id=mov.item_id,
@@ -387,12 +413,12 @@ async def get_movements(
             movement_type=mov.movement_type,
             reference_number=mov.reference_number,
             notes=mov.notes,
-            performed_by_id=mov.performed_by_id,
+            performed_by_id=mov.user_id,
             created_at=mov.created_at,
             item_name=item.name if item else "Unknown",
             item_code=item.item_code if item else "Unknown",
-            from_location_name=from_loc.name if from_loc else None,
-            to_location_name=to_loc.name if to_loc else None,
+            from_location_name=mov.from_location.name if mov.from_location else None,
+            to_location_name=mov.to_location.name if mov.to_location else None,
             performed_by_name=f"{user.first_name} {user.last_name}" if user else "Unknown"
         ))
     
@@ -400,24 +426,71 @@ async def get_movements(
 
 
 @router.get("/low-stock", response_model=List[InventoryCurrentResponse])
-async def get_low_stock_items(
+def get_low_stock_items(
     location_id: Optional[UUID] = None,
+    subtree_of: Optional[UUID] = Query(None, description="Limit to this location and every location below it"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get items that are below their par levels
+    
+    Reads the par breach state maintained on every inventory write
+    (see app.services.par_breach) instead of comparing all stock with par.
+    Lists inventory records, so par levels without a stock row are left out.
     """
-    return await get_current_inventory(
-        location_id=location_id,
-        below_par=True,
-        current_user=current_user,
-        db=db
+    query = db.query(
+        InventoryCurrent.id,
+        InventoryCurrent.location_id,
+        InventoryCurrent.item_id,
+        InventoryCurrent.quantity_on_hand,
+        InventoryCurrent.quantity_allocated,
+        InventoryCurrent.last_counted_at,
+        InventoryCurrent.last_counted_by,
+        Item.name.label("item_name"),
+        Item.item_code,
+        Item.unit_of_measure,
+        Location.name.label("location_name")
+    ).select_from(ParBreach).join(
+        InventoryCurrent, and_(
+            InventoryCurrent.item_id == ParBreach.item_id,
+            InventoryCurrent.location_id == ParBreach.location_id
+        )
+    ).join(
+        Item, Item.id == ParBreach.item_id
+    ).join(
+        Location, Location.id == ParBreach.location_id
+    ).filter(
+        # Breaches also hold pairs only below their reorder quantity
+        ParBreach.quantity_available < ParBreach.par_quantity
     )
+    
+    if location_id:
+        query = query.filter(ParBreach.location_id == location_id)
+    if subtree_of:
+        query = query.filter(in_subtree(ParBreach.location_id, subtree_of))
+    
+    return [
+        InventoryCurrentResponse(
+            id=row.id,
+            location_id=row.location_id,
+            item_id=row.item_id,
+            quantity_on_hand=row.quantity_on_hand,
+            quantity_allocated=row.quantity_allocated,
+            quantity_available=row.quantity_on_hand - row.quantity_allocated,
+            last_counted_at=row.last_counted_at,
+            last_counted_by_id=row.last_counted_by,
+            item_name=row.item_name,
+            item_code=row.item_code,
+            location_name=row.location_name,
+            unit_of_measure=row.unit_of_measure
+        )
+        for row in query.order_by(ParBreach.id).limit(1000).all()
+    ]
 
 
 @router.post("/bulk-par-levels")
-async def bulk_update_par_levels(
+def bulk_update_par_levels(
     update_data: BulkParLevelUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -498,10 +571,114 @@ class ExpiringItemResponse(BaseModel):
         from_attributes = True
 
 
+class ExpirationGrouping(str, enum.Enum):
+    """How expiration summaries are grouped"""
+    ITEM = "item"
+    LOCATION = "location"
+    LOT = "lot"  # item + lot number
+
+
+class ExpirationGroupResponse(BaseModel):
+    """Tracked units sharing an item, location or lot, summarized in SQL"""
+    item_id: Optional[UUID] = None
+    item_name: Optional[str] = None
+    item_code: Optional[str] = None
+    location_id: Optional[UUID] = None
+    location_name: Optional[str] = None
+    lot_number: Optional[str] = None
+    unit_count: int
+    item_count: int
+    location_count: int
+    earliest_expiration: datetime
+    latest_expiration: datetime
+
+
+def _scope_expirations(query, date_filters: list, location_id: Optional[UUID], subtree_of: Optional[UUID]):
+    """Apply the expiration window and location filters to a query over InventoryItem"""
+    query = query.filter(InventoryItem.expiration_date.isnot(None), *date_filters)
+    if location_id:
+        query = query.filter(InventoryItem.location_id == location_id)
+    if subtree_of:
+        query = query.filter(in_subtree(InventoryItem.location_id, subtree_of))
+    return query
+
+
+def _expiration_units(db: Session, date_filters: list, location_id: Optional[UUID],
+                      subtree_of: Optional[UUID], skip: int, limit: int):
+    """Tracked units in the window with item, location and category names, in one query"""
+    query = db.query(
+        InventoryItem.id,
+        InventoryItem.item_id,
+        InventoryItem.location_id,
+        InventoryItem.rfid_tag,
+        InventoryItem.expiration_date,
+        InventoryItem.lot_number,
+        Item.name.label("item_name"),
+        Item.item_code,
+        Location.name.label("location_name"),
+        Category.name.label("category_name")
+    ).join(
+        Item, Item.id == InventoryItem.item_id
+    ).join(
+        Location, Location.id == InventoryItem.location_id
+    ).outerjoin(
+        Category, Category.id == Item.category_id
+    )
+    query = _scope_expirations(query, date_filters, location_id, subtree_of)
+    
+    now = datetime.utcnow()
+    return [
+        ExpiringItemResponse(
+            id=row.id,
+            item_id=row.item_id,
+            location_id=row.location_id,
+            rfid_tag=row.rfid_tag,
+            expiration_date=row.expiration_date,
+            lot_number=row.lot_number,
+            days_until_expiration=(row.expiration_date - now).days,
+            item_name=row.item_name,
+            item_code=row.item_code,
+            location_name=row.location_name,
+            category_name=row.category_name
+        )
+        for row in query.order_by(InventoryItem.expiration_date, InventoryItem.id).offset(skip).limit(limit).all()
+    ]
+
+
+def _expiration_groups(db: Session, date_filters: list, group_by: ExpirationGrouping,
+                       location_id: Optional[UUID], subtree_of: Optional[UUID],
+                       skip: int, limit: int) -> List[ExpirationGroupResponse]:
+    """Unit counts and expiration ranges per item, location or lot, aggregated in SQL"""
+    if group_by == ExpirationGrouping.LOCATION:
+        keys = [Location.id.label("location_id"), Location.name.label("location_name")]
+    elif group_by == ExpirationGrouping.LOT:
+        keys = [Item.id.label("item_id"), Item.name.label("item_name"), Item.item_code, InventoryItem.lot_number]
+    else:
+        keys = [Item.id.label("item_id"), Item.name.label("item_name"), Item.item_code]
+    earliest = func.min(InventoryItem.expiration_date)
+    
+    query = db.query(
+        *keys,
+        func.count(InventoryItem.id).label("unit_count"),
+        func.count(func.distinct(InventoryItem.item_id)).label("item_count"),
+        func.count(func.distinct(InventoryItem.location_id)).label("location_count"),
+        earliest.label("earliest_expiration"),
+        func.max(InventoryItem.expiration_date).label("latest_expiration")
+    ).select_from(InventoryItem).join(
+        Item, Item.id == InventoryItem.item_id
+    ).join(
+        Location, Location.id == InventoryItem.location_id
+    )
+    query = _scope_expirations(query, date_filters, location_id, subtree_of)
+    rows = query.group_by(*keys).order_by(earliest).offset(skip).limit(limit).all()
+    return [ExpirationGroupResponse(**row._asdict()) for row in rows]
+
+
 @router.get("/expiring-items", response_model=List[ExpiringItemResponse])
-async def get_expiring_items(
+def get_expiring_items(
     days_ahead: int = Query(30, ge=1, le=365, description="Number of days to look ahead"),
     location_id: Optional[UUID] = None,
+    subtree_of: Optional[UUID] = Query(None, description="Limit to this location and every location below it"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     current_user: User = Depends(get_current_user),
@@ -513,60 +690,43 @@ async def get_expiring_items(
     Args:
         days_ahead: Number of days to look ahead (default 30)
         location_id: Filter by specific location
+        subtree_of: Filter to a location and everything below it
         skip: Number of records to skip
         limit: Maximum number of records to return
     
     Returns:
         List of expiring items with enriched data
     """
-    from datetime import timedelta
-    
-    # Calculate cutoff date
-    cutoff_date = datetime.utcnow() + timedelta(days=days_ahead)
-    
-    # Build query
-    query = db.query(InventoryItem).filter(
-        InventoryItem.expiration_date.isnot(None),
-        InventoryItem.expiration_date <= cutoff_date,
-        InventoryItem.expiration_date >= datetime.utcnow()  # Exclude already expired
-    )
-    
-    if location_id:
-        query = query.filter(InventoryItem.location_id == location_id)
-    
-    # Order by expiration date (soonest first)
-    query = query.order_by(InventoryItem.expiration_date)
-    
-    items = query.offset(skip).limit(limit).all()
-    
-    # Enrich with item and location data
-    results = []
-    for inv_item in items:
-        item = db.query(Item).filter(Item.id == inv_item.item_id).first()
-        location = db.query(Location).filter(Location.id == inv_item.location_id).first()
-        
-        if not item or not location:
-            continue
-        
-        # Calculate days until expiration
-        days_until = (inv_item.expiration_date - datetime.utcnow()).days
-        
-        result = ExpiringItemResponse(
-            id=inv_item.id,
-            item_id=inv_item.item_id,
-            location_id=inv_item.location_id,
-            rfid_tag=inv_item.rfid_tag,
-            expiration_date=inv_item.expiration_date,
-            lot_number=inv_item.lot_number,
-            days_until_expiration=days_until,
-            item_name=item.name,
-            item_code=item.item_code,
-            location_name=location.name,
-            category_name=item.category.name if item.category else None
-        )
-        results.append(result)
-    
-    return results
+    now = datetime.utcnow()
+    date_filters = [
+        InventoryItem.expiration_date >= now,  # Exclude already expired
+        InventoryItem.expiration_date <= now + timedelta(days=days_ahead)
+    ]
+    # Soonest first, with names joined in the same query
+    return _expiration_units(db, date_filters, location_id, subtree_of, skip, limit)
+
+
+@router.get("/expiring-items/summary", response_model=List[ExpirationGroupResponse])
+def get_expiring_items_summary(
+    group_by: ExpirationGrouping = Query(ExpirationGrouping.ITEM, description="item, location or lot"),
+    days_ahead: int = Query(30, ge=1, le=365, description="Number of days to look ahead"),
+    location_id: Optional[UUID] = None,
+    subtree_of: Optional[UUID] = Query(None, description="Limit to this location and every location below it"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Count units expiring within the specified number of days per item,
+    location or lot, soonest first
+    """
+    now = datetime.utcnow()
+    date_filters = [
+        InventoryItem.expiration_date >= now,
+        InventoryItem.expiration_date <= now + timedelta(days=days_ahead)
+    ]
+    return _expiration_groups(db, date_filters, group_by, location_id, subtree_of, skip, limit)
 
 
 class RestockOrderRequest(BaseModel):
@@ -600,7 +760,7 @@ class RestockOrderResponse(BaseModel):
 
 
 @router.post("/create-restock-order")
-async def create_restock_order(
+def create_restock_order(
     request: RestockOrderRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -753,10 +913,11 @@ async def create_restock_order(
     }
 
 @router.get("/expired-items", response_model=List[ExpiringItemResponse])
-async def get_expired_items(
+def get_expired_items(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     location_id: Optional[UUID] = None,
+    subtree_of: Optional[UUID] = Query(None, description="Limit to this location and every location below it"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -765,52 +926,31 @@ async def get_expired_items(
     
     Args:
         location_id: Filter by specific location
+        subtree_of: Filter to a location and everything below it
         skip: Number of records to skip
         limit: Maximum number of records to return
     
     Returns:
         List of expired items with enriched data
     """
-    # Build query for expired items
-    query = db.query(InventoryItem).filter(
-        InventoryItem.expiration_date.isnot(None),
-        InventoryItem.expiration_date < datetime.utcnow()
-    )
-    
-    if location_id:
-        query = query.filter(InventoryItem.location_id == location_id)
-    
-    # Order by expiration date (oldest first)
-    query = query.order_by(InventoryItem.expiration_date)
-    
-    items = query.offset(skip).limit(limit).all()
-    
-    # Enrich with item and location data
-    results = []
-    for inv_item in items:
-        item = db.query(Item).filter(Item.id == inv_item.item_id).first()
-        location = db.query(Location).filter(Location.id == inv_item.location_id).first()
-        
-        if not item or not location:
-            continue
-        
-        # Calculate days since expiration (negative number)
-        days_until = (inv_item.expiration_date - datetime.utcnow()).days
-        
-        result = ExpiringItemResponse(
-            id=inv_item.id,
-            item_id=inv_item.item_id,
-            location_id=inv_item.location_id,
-            rfid_tag=inv_item.rfid_tag,
-            expiration_date=inv_item.expiration_date,
-            lot_number=inv_item.lot_number,
-            days_until_expiration=days_until,
-            item_name=item.name,
-            item_code=item.item_code,
-            location_name=location.name,
-            category_name=item.category.name if item.category else None
-        )
-        results.append(result)
-    
-    return results
+    # Oldest first, with names joined in the same query
+    date_filters = [InventoryItem.expiration_date < datetime.utcnow()]
+    return _expiration_units(db, date_filters, location_id, subtree_of, skip, limit)
+
+
+@router.get("/expired-items/summary", response_model=List[ExpirationGroupResponse])
+def get_expired_items_summary(
+    group_by: ExpirationGrouping = Query(ExpirationGrouping.ITEM, description="item, location or lot"),
+    location_id: Optional[UUID] = None,
+    subtree_of: Optional[UUID] = Query(None, description="Limit to this location and every location below it"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Count expired units per item, location or lot, oldest first
+    """
+    date_filters = [InventoryItem.expiration_date < datetime.utcnow()]
+    return _expiration_groups(db, date_filters, group_by, location_id, subtree_of, skip, limit)
 
@@ -0,0 +1,61 @@
+"""
+Background Jobs API Routes
+Run history of the scheduled jobs and manual runs (admin only)
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db, SessionLocal
+from app.api.v1.users import require_admin
+from app.models.user import User
+from app.models.job_run import JobRun, JobStatus
+from app.services.scheduler import JOBS, get_job, run_job
+
+router = APIRouter()
+
+
+class JobRunResponse(BaseModel):
+    id: int
+    job_name: str
+    status: JobStatus
+    started_at: datetime
+    finished_at: Optional[datetime]
+    duration_ms: Optional[int]
+    stats: Optional[Dict[str, int]]
+    error: Optional[str]
+    
+    class Config:
+        from_attributes = True
+
+
+@router.get("/runs", response_model=List[JobRunResponse])
+def list_job_runs(
+    job_name: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """Most recent job runs, newest first"""
+    query = db.query(JobRun)
+    if job_name:
+        query = query.filter(JobRun.job_name == job_name)
+    return query.order_by(JobRun.started_at.desc()).limit(limit).all()
+
+
+@router.post("/{job_name}/run", response_model=JobRunResponse)
+def run_job_now(
+    job_name: str,
+    admin: User = Depends(require_admin)
+):
+    """Run a job immediately and return its recorded run"""
+    job = get_job(job_name)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown job; expected one of: {', '.join(job.name for job in JOBS)}"
+        )
+    return run_job(SessionLocal, job)
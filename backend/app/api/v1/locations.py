@@ -4,24 +4,32 @@ Manages location hierarchy: Supply Station → Station Cabinets → Vehicles
 """
 from typing import List, Optional, Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case, and_, select
 
 from app.core.database import get_db
 from app.api.v1.auth import get_current_user
 from app.models.user import User
-from app.models.location import Location, LocationType
+from app.models.location import Location, LocationType, LocationClosure
 from app.models.inventory import InventoryCurrent
+from app.models.inventory_item import InventoryItem
 from app.models.item import Item
+from app.models.par_level import ParLevel
 from app.schemas.user import UserResponse
+from app.services.location_tree import in_subtree, join_subtree, creates_cycle
+from app.utils.etag import make_etag, etag_matches, set_etag, not_modified
+from app.utils.pagination import keyset_paginate, set_page_headers
 
 router = APIRouter()
 
 
 # Pydantic schemas for locations
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Window for the expiring-soon counts in subtree rollups
+EXPIRING_SOON_DAYS = 30
 
 
 class LocationBase(BaseModel):
@@ -74,10 +82,44 @@ class LocationInventoryResponse(BaseModel):
     items_below_par: int
 
 
+class SubtreeLocationResponse(LocationResponse):
+    """Location inside a subtree with its distance from the subtree root"""
+    depth: int
+
+
+class RollupItemResponse(BaseModel):
+    """Stock, par and expirations of one item summed over a location subtree"""
+    item_id: UUID
+    item_name: str
+    item_code: str
+    unit_of_measure: str
+    quantity_on_hand: int = 0
+    quantity_allocated: int = 0
+    quantity_available: int = 0
+    par_quantity: Optional[int] = None
+    reorder_quantity: Optional[int] = None
+    is_below_par: bool = False
+    expiring_soon_count: int = 0
+    expired_count: int = 0
+
+
+class LocationRollupResponse(BaseModel):
+    """Location with inventory rolled up over it and every location below it"""
+    location: LocationResponse
+    location_count: int
+    items: List[RollupItemResponse]
+    total_items: int
+    items_below_par: int
+    expiring_soon_count: int
+    expired_count: int
+
+
 @router.get("/", response_model=List[LocationResponse])
 async def list_locations(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     type: Optional[LocationType] = None,
     is_active: Optional[bool] = None,
     # current_user: User = Depends(get_current_user),  # Disabled for testing
@@ -94,12 +136,14 @@ async def list_locations(
     if is_active is not None:
         query = query.filter(Location.is_active == is_active)
     
-    locations = query.order_by(Location.name).offset(skip).limit(limit).all()
-    return locations
+    page = keyset_paginate(query, [Location.name], Location.id, limit=limit, cursor=cursor, skip=skip)
+    set_page_headers(response, page)
+    return page.rows
 
 
 @router.get("/hierarchy", response_model=List[LocationResponse])
 async def get_location_hierarchy(
+    subtree_of: Optional[UUID] = Query(None, description="Only this location and everything below it"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -108,9 +152,10 @@ async def get_location_hierarchy(
     Returns all locations in hierarchical order
     """
     # Get all active locations ordered by type (supply station first, then cabinets, then vehicles)
-    locations = db.query(Location).filter(
-        Location.is_active == True
-    ).order_by(
+    query = db.query(Location).filter(Location.is_active == True)
+    if subtree_of:
+        query = query.filter(in_subtree(Location.id, subtree_of))
+    locations = query.order_by(
         Location.type,
         Location.name
     ).all()
@@ -134,65 +179,90 @@ async def get_location(
     return location
 
 
+def _location_inventory_fingerprint(db: Session, location_id: UUID) -> tuple:
+    """Counts, last changes and quantity sums behind a location's inventory, in one query"""
+    par_count = select(func.count(ParLevel.id)).where(ParLevel.location_id == location_id).scalar_subquery()
+    par_changed_at = select(func.max(ParLevel.updated_at)).where(ParLevel.location_id == location_id).scalar_subquery()
+    return tuple(db.query(
+        func.count(InventoryCurrent.id),
+        func.max(InventoryCurrent.updated_at),
+        func.max(Item.updated_at),
+        func.sum(InventoryCurrent.quantity_on_hand),
+        func.sum(InventoryCurrent.quantity_allocated),
+        par_count,
+        par_changed_at
+    ).join(
+        Item, Item.id == InventoryCurrent.item_id
+    ).filter(InventoryCurrent.location_id == location_id).one())
+
+
 @router.get("/{location_id}/inventory", response_model=LocationInventoryResponse)
-async def get_location_inventory(
+def get_location_inventory(
     location_id: UUID,
+    response: Response,
+    below_par_only: bool = Query(False, description="Only items below their par level at this location"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get inventory for a specific location with par level comparison
+    
+    Responses carry an ETag derived from the location's inventory and par
+    levels; send it back in If-None-Match to get 304 while nothing changed.
     """
     location = db.query(Location).filter(Location.id == location_id).first()
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
     
-    # Get all inventory items for this location
-    inventory_items = db.query(InventoryCurrent).filter(
+    etag = make_etag(location.updated_at, below_par_only, *_location_inventory_fingerprint(db, location_id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    # Inventory rows with item details and this location's par level in one query
+    quantity_available = InventoryCurrent.quantity_on_hand - InventoryCurrent.quantity_allocated
+    query = db.query(
+        InventoryCurrent.item_id,
+        Item.name,
+        Item.item_code,
+        Item.unit_of_measure,
+        InventoryCurrent.quantity_on_hand,
+        InventoryCurrent.quantity_allocated,
+        ParLevel.par_quantity
+    ).join(
+        Item, Item.id == InventoryCurrent.item_id
+    ).outerjoin(
+        ParLevel, and_(
+            ParLevel.location_id == InventoryCurrent.location_id,
+            ParLevel.item_id == InventoryCurrent.item_id
+        )
+    ).filter(
         InventoryCurrent.location_id == location_id
-    ).all()
+    )
+    if below_par_only:
+        query = query.filter(ParLevel.par_quantity > 0, quantity_available < ParLevel.par_quantity)
     
     items_list = []
-    items_below_par = 0
-    
-    for inv in inventory_items:
-        # Get item details
-        item = db.query(Item).filter(Item.id == inv.item_id).first()
-        if not item:
-            continue
-        
-        # Get par level for this location/item
-        from app.models.par_level import ParLevel
-        par_level_obj = db.query(ParLevel).filter(
-            ParLevel.location_id == location_id,
-            ParLevel.item_id == inv.item_id
-        ).first()
-        
-        par_quantity = par_level_obj.par_quantity if par_level_obj else None
-        quantity_available = inv.quantity_on_hand - inv.quantity_allocated
-        is_below_par = False
-        
-        if par_quantity and quantity_available < par_quantity:
-            is_below_par = True
-            items_below_par += 1
-        
+    for row in query.order_by(Item.item_code).all():
+        available = row.quantity_on_hand - row.quantity_allocated
         items_list.append(InventoryItemResponse(
-            item_id=item.id,
-            item_name=item.name,
-            item_code=item.item_code,
-            quantity_on_hand=inv.quantity_on_hand,
-            quantity_allocated=inv.quantity_allocated,
-            quantity_available=quantity_available,
-            unit_of_measure=item.unit_of_measure,
-            par_quantity=par_quantity,
-            is_below_par=is_below_par
+            item_id=row.item_id,
+            item_name=row.name,
+            item_code=row.item_code,
+            quantity_on_hand=row.quantity_on_hand,
+            quantity_allocated=row.quantity_allocated,
+            quantity_available=available,
+            unit_of_measure=row.unit_of_measure,
+            par_quantity=row.par_quantity,
+            is_below_par=bool(row.par_quantity) and available < row.par_quantity
         ))
     
     return LocationInventoryResponse(
         location=LocationResponse.model_validate(location),
         items=items_list,
         total_items=len(items_list),
-        items_below_par=items_below_par
+        items_below_par=sum(1 for item in items_list if item.is_below_par)
     )
 
 
@@ -216,6 +286,115 @@ async def get_child_locations(
     return children
 
 
+@router.get("/{location_id}/subtree", response_model=List[SubtreeLocationResponse])
+def get_location_subtree(
+    location_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a location and every location below it, nearest first
+    """
+    rows = join_subtree(
+        db.query(Location, LocationClosure.depth), Location.id, location_id
+    ).order_by(LocationClosure.depth, Location.name).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Location not found")
+    
+    return [
+        SubtreeLocationResponse(**LocationResponse.model_validate(location).model_dump(), depth=depth)
+        for location, depth in rows
+    ]
+
+
+@router.get("/{location_id}/rollup", response_model=LocationRollupResponse)
+def get_location_rollup(
+    location_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get stock, par levels and expirations summed over a location and every
+    location below it (e.g. a station cabinet and its trucks)
+    """
+    location = db.query(Location).filter(Location.id == location_id).first()
+    if not location:
+        raise HTTPException(status_code=404, detail="Location not found")
+    
+    location_count = db.query(func.count(LocationClosure.descendant_id)).filter(
+        LocationClosure.ancestor_id == location_id
+    ).scalar()
+    
+    # One grouped query per source, each joined to the closure
+    stock = {
+        row.item_id: row
+        for row in join_subtree(db.query(
+            InventoryCurrent.item_id,
+            func.sum(InventoryCurrent.quantity_on_hand).label("on_hand"),
+            func.sum(InventoryCurrent.quantity_allocated).label("allocated")
+        ), InventoryCurrent.location_id, location_id).group_by(InventoryCurrent.item_id).all()
+    }
+    pars = {
+        row.item_id: row
+        for row in join_subtree(db.query(
+            ParLevel.item_id,
+            func.sum(ParLevel.par_quantity).label("par"),
+            func.sum(ParLevel.reorder_quantity).label("reorder")
+        ), ParLevel.location_id, location_id).group_by(ParLevel.item_id).all()
+    }
+    now = datetime.utcnow()
+    soon = now + timedelta(days=EXPIRING_SOON_DAYS)
+    expirations = {
+        row.item_id: row
+        for row in join_subtree(db.query(
+            InventoryItem.item_id,
+            func.sum(case(
+                (and_(InventoryItem.expiration_date > now, InventoryItem.expiration_date <= soon), 1),
+                else_=0
+            )).label("expiring_soon"),
+            func.sum(case((InventoryItem.expiration_date <= now, 1), else_=0)).label("expired")
+        ), InventoryItem.location_id, location_id).filter(
+            InventoryItem.expiration_date.isnot(None),
+            InventoryItem.expiration_date <= soon
+        ).group_by(InventoryItem.item_id).all()
+    }
+    
+    item_ids = set(stock) | set(pars) | set(expirations)
+    items = db.query(Item).filter(Item.id.in_(item_ids)).order_by(Item.item_code).all() if item_ids else []
+    
+    rows = []
+    for item in items:
+        on_hand = int(stock[item.id].on_hand or 0) if item.id in stock else 0
+        allocated = int(stock[item.id].allocated or 0) if item.id in stock else 0
+        par = pars.get(item.id)
+        expiring = expirations.get(item.id)
+        par_quantity = int(par.par or 0) if par else None
+        rows.append(RollupItemResponse(
+            item_id=item.id,
+            item_name=item.name,
+            item_code=item.item_code,
+            unit_of_measure=item.unit_of_measure,
+            quantity_on_hand=on_hand,
+            quantity_allocated=allocated,
+            quantity_available=on_hand - allocated,
+            par_quantity=par_quantity,
+            reorder_quantity=int(par.reorder or 0) if par else None,
+            is_below_par=bool(par_quantity) and on_hand - allocated < par_quantity,
+            expiring_soon_count=int(expiring.expiring_soon or 0) if expiring else 0,
+            expired_count=int(expiring.expired or 0) if expiring else 0
+        ))
+    
+    return LocationRollupResponse(
+        location=LocationResponse.model_validate(location),
+        location_count=location_count,
+        items=rows,
+        total_items=len(rows),
+        items_below_par=sum(1 for row in rows if row.is_below_par),
+        expiring_soon_count=sum(row.expiring_soon_count for row in rows),
+        expired_count=sum(row.expired_count for row in rows)
+    )
+
+
 @router.post("/", response_model=LocationResponse)
 async def create_location(
     location_data: LocationCreate,
@@ -256,6 +435,18 @@ async def update_location(
     
     # Update only provided fields
     update_data = location_data.model_dump(exclude_unset=True)
+    
+    # Verify a new parent exists and is not the location itself or below it
+    new_parent_id = update_data.get("parent_location_id")
+    if new_parent_id and new_parent_id != location.parent_location_id:
+        if not db.query(Location.id).filter(Location.id == new_parent_id).first():
+            raise HTTPException(status_code=404, detail="Parent location not found")
+        if creates_cycle(db, location_id, new_parent_id):
+            raise HTTPException(
+                status_code=400,
+                detail="A location cannot be moved under itself or one of its sub-locations"
+            )
+    
     for field, value in update_data.items():
         setattr(location, field, value)
     
@@ -0,0 +1,87 @@
+"""
+Notifications API Routes
+Alerts for the current user and system-wide alerts (expirations, low stock)
+
+Expiration notifications are created by the expiration sweep job (see
+app.services.expiration_sweep), not by these endpoints.
+"""
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.v1.auth import get_current_user
+from app.models.user import User
+from app.models.notification import Notification, NotificationType, NotificationSeverity
+
+router = APIRouter()
+
+
+class NotificationResponse(BaseModel):
+    id: UUID
+    user_id: Optional[UUID]
+    type: NotificationType
+    title: str
+    message: str
+    severity: NotificationSeverity
+    is_read: bool
+    related_entity_type: Optional[str]
+    related_entity_id: Optional[UUID]
+    read_at: Optional[datetime]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+def _visible_to(current_user: User):
+    """Notifications addressed to the user plus system-wide ones"""
+    return or_(Notification.user_id == current_user.id, Notification.user_id.is_(None))
+
+
+@router.get("/", response_model=List[NotificationResponse])
+def list_notifications(
+    unread_only: bool = False,
+    type: Optional[NotificationType] = None,
+    severity: Optional[NotificationSeverity] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """List notifications for the current user, newest first"""
+    query = db.query(Notification).filter(_visible_to(current_user))
+    if unread_only:
+        query = query.filter(Notification.is_read.is_(False))
+    if type:
+        query = query.filter(Notification.type == type)
+    if severity:
+        query = query.filter(Notification.severity == severity)
+    return query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+
+
+@router.post("/{notification_id}/read", response_model=NotificationResponse)
+def mark_notification_read(
+    notification_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Mark a notification as read"""
+    notification = db.query(Notification).filter(
+        Notification.id == notification_id,
+        _visible_to(current_user)
+    ).first()
+    if not notification:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
+    
+    if not notification.is_read:
+        notification.is_read = True
+        notification.read_at = datetime.utcnow()
+        db.commit()
+        db.refresh(notification)
+    return notification
@@ -1,7 +1,7 @@
 """
 Purchase Orders API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, and_, or_
 from typing import List, Optional
@@ -17,6 +17,9 @@ from app.models.item import Item
 from app.models.inventory import InventoryCurrent
 from app.models.rfid import InventoryMovement, MovementType
 from app.models.audit import AuditLog, AuditAction
+from app.schemas.reorder import ReorderSuggestion
+from app.services.reorder_engine import compute_reorder_suggestions
+from app.utils.pagination import keyset_paginate, set_page_headers
 
 router = APIRouter()
 
@@ -282,12 +285,14 @@ async def delete_vendor(
 
 @router.get("/", response_model=List[PurchaseOrderResponse])
 async def list_purchase_orders(
+    response: Response,
     status: Optional[OrderStatus] = Query(None, description="Filter by status"),
     vendor_id: Optional[UUID] = Query(None, description="Filter by vendor"),
     from_date: Optional[date] = Query(None, description="Orders from this date"),
     to_date: Optional[date] = Query(None, description="Orders to this date"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -303,11 +308,15 @@ async def list_purchase_orders(
     if to_date:
         query = query.filter(PurchaseOrder.order_date <= to_date)
     
-    orders = query.order_by(desc(PurchaseOrder.order_date)).offset(skip).limit(limit).all()
+    page = keyset_paginate(
+        query, [PurchaseOrder.order_date], PurchaseOrder.id,
+        limit=limit, cursor=cursor, skip=skip, descending=True
+    )
+    set_page_headers(response, page)
     
     # Enrich with vendor names and item details
     result = []
-    for order in orders:
+    for order in page.rows:
         carrier_value = order.carrier.value if order.carrier else None
         order_dict = {
             "id": order.id,
@@ -754,23 +763,6 @@ async def cancel_purchase_order(
 # REORDER SUGGESTIONS
 # =============================================================================
 
-class ReorderSuggestion(PydanticBase):
-    item_id: UUID
-    item_code: str
-    item_name: str
-    category_name: Optional[str] = None
-    current_total_stock: int
-    total_par_level: int
-    total_reorder_level: int
-    shortage: int
-    suggested_order_qty: int
-    preferred_vendor_id: Optional[UUID] = None
-    preferred_vendor_name: Optional[str] = None
-    estimated_cost: Optional[float] = None
-    locations_below_par: int
-    urgency: str  # "critical", "high", "medium", "low"
-
-
 @router.get("/suggestions/reorder", response_model=List[ReorderSuggestion])
 async def get_reorder_suggestions(
     vendor_id: Optional[UUID] = Query(None, description="Filter by preferred vendor"),
@@ -785,138 +777,9 @@ async def get_reorder_suggestions(
     Returns items that are below their reorder point with suggested quantities
     and preferred vendor information.
     """
-    from app.models.par_level import ParLevel
-    from app.models.item import Category
-    
-    # Get all active items with their inventory and par levels
-    items = db.query(Item).filter(Item.is_active == True)
-    
-    if category_id:
-        items = items.filter(Item.category_id == category_id)
-    
-    items = items.all()
-    
-    suggestions = []
-    
-    for item in items:
-        # Get all inventory across locations
-        inventories = db.query(InventoryCurrent).filter(
-            InventoryCurrent.item_id == item.id
-        ).all()
-        
-        # Get par levels for all locations
-        par_levels = db.query(ParLevel).filter(
-            ParLevel.item_id == item.id
-        ).all()
-        
-        if not par_levels:
-            continue
-        
-        # Calculate totals
-        total_stock = sum(inv.quantity_on_hand - inv.quantity_allocated for inv in inventories)
-        total_par = sum(p.par_quantity for p in par_levels)
-        total_reorder = sum(p.reorder_quantity for p in par_levels)
-        
-        # Count locations below par
-        locations_below = 0
-        for par in par_levels:
-            inv = next((i for i in inventories if i.location_id == par.location_id), None)
-            if inv:
-                available = inv.quantity_on_hand - inv.quantity_allocated
-                if available < par.reorder_quantity:
-                    locations_below += 1
-            else:
-                locations_below += 1  # No inventory = below par
-        
-        # Skip if stock is above reorder level
-        if total_stock >= total_reorder:
-            continue
-        
-        shortage = total_par - total_stock
-        
-        # Calculate suggested order quantity (bring to par level + 10% buffer)
-        suggested_qty = int(shortage * 1.1)
-        if suggested_qty < 1:
-            suggested_qty = 1
-        
-        # Apply max reorder quantity per station limit if set
-        if item.max_reorder_quantity_per_station and locations_below > 0:
-            max_total = item.max_reorder_quantity_per_station * locations_below
-            suggested_qty = min(suggested_qty, max_total)
-        
-        # Determine urgency
-        stock_ratio = total_stock / total_reorder if total_reorder > 0 else 0
-        if stock_ratio <= 0.25:
-            item_urgency = "critical"
-        elif stock_ratio <= 0.5:
-            item_urgency = "high"
-        elif stock_ratio <= 0.75:
-            item_urgency = "medium"
-        else:
-            item_urgency = "low"
-        
-        # Skip if filtering by urgency and doesn't match
-        if urgency and item_urgency != urgency:
-            continue
-        
-        # Get preferred vendor from item or auto-order rules
-        preferred_vendor = None
-        if item.preferred_vendor:
-            preferred_vendor = db.query(Vendor).filter(
-                Vendor.name == item.preferred_vendor,
-                Vendor.is_active == True
-            ).first()
-        
-        # Check auto-order rules
-        from app.models.order import AutoOrderRule
-        auto_rule = db.query(AutoOrderRule).filter(
-            AutoOrderRule.item_id == item.id,
-            AutoOrderRule.is_active == True
-        ).first()
-        
-        if auto_rule and auto_rule.preferred_vendor_id:
-            preferred_vendor = db.query(Vendor).filter(
-                Vendor.id == auto_rule.preferred_vendor_id,
-                Vendor.is_active == True
-            ).first()
-            if auto_rule.order_quantity:
-                suggested_qty = max(suggested_qty, auto_rule.order_quantity)
-        
-        # Skip if filtering by vendor and doesn't match
-        if vendor_id:
-            if not preferred_vendor or preferred_vendor.id != vendor_id:
-                continue
-        
-        # Get category name
-        category = db.query(Category).filter(Category.id == item.category_id).first()
-        
-        # Calculate estimated cost
-        estimated_cost = None
-        if item.cost_per_unit:
-            estimated_cost = round(suggested_qty * float(item.cost_per_unit), 2)
-        
-        suggestions.append(ReorderSuggestion(
-            item_id=item.id,
-            item_code=item.item_code,
-            item_name=item.name,
-            category_name=category.name if category else None,
-            current_total_stock=total_stock,
-            total_par_level=total_par,
-            total_reorder_level=total_reorder,
-            shortage=shortage,
-            suggested_order_qty=suggested_qty,
-            preferred_vendor_id=preferred_vendor.id if preferred_vendor else None,
-            preferred_vendor_name=preferred_vendor.name if preferred_vendor else None,
-            estimated_cost=estimated_cost,
-            locations_below_par=locations_below,
-            urgency=item_urgency
-        ))
-    
-    # Sort by urgency (critical first) then by shortage
-    urgency_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    suggestions.sort(key=lambda x: (urgency_order.get(x.urgency, 4), -x.shortage))
-    
-    return suggestions
+    return compute_reorder_suggestions(
+        db, vendor_id=vendor_id, category_id=category_id, urgency=urgency
+    )
 
 
 @router.post("/suggestions/create-po")
@@ -937,11 +800,7 @@ async def create_po_from_suggestions(
         raise HTTPException(status_code=404, detail="Vendor not found")
     
     # Get suggestions for selected items
-    suggestions = await get_reorder_suggestions(
-        vendor_id=None, category_id=None, urgency=None, db=db, current_user=current_user
-    )
-    
-    selected_suggestions = [s for s in suggestions if s.item_id in item_ids]
+    selected_suggestions = compute_reorder_suggestions(db, item_ids=item_ids)
     
     if not selected_suggestions:
         raise HTTPException(status_code=400, detail="No valid items found for reorder")
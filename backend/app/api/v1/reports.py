@@ -1,23 +1,29 @@
 """
 Reports API endpoints for analytics and reporting
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, and_, or_, case
 from typing import List, Optional
 from datetime import datetime, timedelta
 from uuid import UUID
 
 from app.core.database import get_db
+from app.core.cache import cached_report, report_cache
 from app.models.user import User
 from app.models.item import Item, Category
 from app.models.location import Location
 from app.models.inventory import InventoryCurrent
 from app.models.rfid import InventoryMovement
 from app.models.par_level import ParLevel
+from app.models.par_breach import ParBreach
 from app.models.audit import AuditLog
 from app.models.order import PurchaseOrder, PurchaseOrderItem
+from app.models.stock_rollup import ItemStockRollup, ALL_LOCATIONS
 from app.api.v1.auth import get_current_user
+from app.services.location_tree import in_subtree
+from app.services.movement_rollup import movement_totals
+from app.utils.pagination import keyset_paginate, set_page_headers
 from pydantic import BaseModel
 
 
@@ -81,74 +87,87 @@ class AuditReportEntry(BaseModel):
     ip_address: Optional[str]
 
 
+def _daily_totals_subquery(db: Session, start_date: datetime):
+    """Per-item used/received totals since start_date (see movement_rollup.movement_totals)"""
+    return movement_totals(db, start_date).subquery()
+
+
+@router.get("/cache-stats")
+def get_report_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get report cache hit/miss counters for monitoring
+    """
+    return report_cache.get_stats()
+
+
 @router.get("/low-stock", response_model=List[LowStockItem])
-async def get_low_stock_report(
+def get_low_stock_report(
     location_id: Optional[UUID] = Query(None, description="Filter by location"),
+    subtree_of: Optional[UUID] = Query(None, description="Filter to a location and everything below it"),
     category_id: Optional[UUID] = Query(None, description="Filter by category"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get report of items below their reorder point
+    
+    Reads the par breach state maintained on every inventory write
+    (see app.services.par_breach).
     """
-    # Query for items below reorder quantity
+    shortage = ParBreach.par_quantity - ParBreach.quantity_available
     query = db.query(
-        Item,
-        Location,
-        InventoryCurrent,
-        ParLevel,
-        Category
-    ).join(
-        InventoryCurrent, Item.id == InventoryCurrent.item_id
+        ParBreach.item_id,
+        ParBreach.location_id,
+        ParBreach.quantity_available,
+        ParBreach.par_quantity,
+        ParBreach.reorder_quantity,
+        shortage.label("shortage"),
+        Item.item_code,
+        Item.name.label("item_name"),
+        Location.name.label("location_name"),
+        Category.name.label("category")
     ).join(
-        Location, InventoryCurrent.location_id == Location.id
+        Item, Item.id == ParBreach.item_id
     ).join(
-        ParLevel, and_(
-            ParLevel.item_id == Item.id,
-            ParLevel.location_id == Location.id
-        )
+        Location, Location.id == ParBreach.location_id
     ).join(
         Category, Item.category_id == Category.id
     ).filter(
+        ParBreach.below_reorder == True,
         Item.is_active == True,
         Location.is_active == True
     )
     
     # Apply filters
     if location_id:
-        query = query.filter(Location.id == location_id)
+        query = query.filter(ParBreach.location_id == location_id)
+    if subtree_of:
+        query = query.filter(in_subtree(ParBreach.location_id, subtree_of))
     if category_id:
         query = query.filter(Category.id == category_id)
     
-    results = query.all()
-    
-    low_stock_items = []
-    for item, location, inventory, par_level, category in results:
-        available = inventory.quantity_on_hand - inventory.quantity_allocated
-        
-        # Check if below reorder point
-        if available < par_level.reorder_quantity:
-            low_stock_items.append(LowStockItem(
-                item_id=item.id,
-                item_code=item.item_code,
-                item_name=item.name,
-                location_id=location.id,
-                location_name=location.name,
-                current_quantity=available,
-                par_quantity=par_level.par_quantity,
-                reorder_quantity=par_level.reorder_quantity,
-                shortage=par_level.par_quantity - available,
-                category=category.name
-            ))
-    
     # Sort by shortage (most critical first)
-    low_stock_items.sort(key=lambda x: x.shortage, reverse=True)
-    
-    return low_stock_items
+    return [
+        LowStockItem(
+            item_id=row.item_id,
+            item_code=row.item_code,
+            item_name=row.item_name,
+            location_id=row.location_id,
+            location_name=row.location_name,
+            current_quantity=row.quantity_available,
+            par_quantity=row.par_quantity,
+            reorder_quantity=row.reorder_quantity,
+            shortage=row.shortage,
+            category=row.category
+        )
+        for row in query.order_by(shortage.desc()).all()
+    ]
 
 
 @router.get("/usage", response_model=List[UsageStatistic])
-async def get_usage_statistics(
+def get_usage_statistics(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     category_id: Optional[UUID] = Query(None, description="Filter by category"),
     limit: int = Query(50, ge=1, le=500, description="Maximum items to return"),
@@ -160,33 +179,28 @@ async def get_usage_statistics(
     """
     start_date = datetime.utcnow() - timedelta(days=days)
     
-    # Get all items
-    items_query = db.query(Item).join(Category).filter(Item.is_active == True)
+    totals = _daily_totals_subquery(db, start_date)
     
-    if category_id:
-        items_query = items_query.filter(Item.category_id == category_id)
+    # Items with activity in the period
+    query = db.query(
+        Item,
+        Category.name,
+        totals.c.used,
+        totals.c.received
+    ).join(
+        Category, Item.category_id == Category.id
+    ).join(
+        totals, Item.id == totals.c.item_id
+    ).filter(Item.is_active == True)
     
-    items = items_query.all()
+    if category_id:
+        query = query.filter(Item.category_id == category_id)
     
     usage_stats = []
     
-    for item in items:
-        # Get movements for this item in the period
-        movements = db.query(InventoryMovement).filter(
-            InventoryMovement.item_id == item.id,
-            InventoryMovement.created_at >= start_date
-        ).all()
-        
-        total_used = 0
-        total_received = 0
-        
-        for movement in movements:
-            if movement.from_location_id and not movement.to_location_id:
-                # Item was removed (used/consumed)
-                total_used += movement.quantity
-            elif movement.to_location_id and not movement.from_location_id:
-                # Item was received
-                total_received += movement.quantity
+    for item, category_name, total_used, total_received in query.all():
+        total_used = int(total_used or 0)
+        total_received = int(total_received or 0)
         
         # Only include items with activity
         if total_used > 0 or total_received > 0:
@@ -197,7 +211,7 @@ async def get_usage_statistics(
                 item_id=item.id,
                 item_code=item.item_code,
                 item_name=item.name,
-                category=item.category.name,
+                category=category_name,
                 total_used=total_used,
                 total_received=total_received,
                 net_change=net_change,
@@ -212,7 +226,8 @@ async def get_usage_statistics(
 
 
 @router.get("/inventory-summary", response_model=InventorySummary)
-async def get_inventory_summary(
+@cached_report("inventory-summary")
+def get_inventory_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -253,7 +268,7 @@ async def get_inventory_summary(
         
         # Calculate value if cost is available
         if item.cost_per_unit:
-            total_value += available * item.cost_per_unit
+            total_value += available * float(item.cost_per_unit)
     
     # Get category breakdown
     categories_data = []
@@ -282,13 +297,15 @@ async def get_inventory_summary(
 
 
 @router.get("/audit", response_model=List[AuditReportEntry])
-async def get_audit_report(
+def get_audit_report(
+    response: Response,
     start_date: Optional[datetime] = Query(None, description="Filter from date"),
     end_date: Optional[datetime] = Query(None, description="Filter to date"),
     user_id: Optional[UUID] = Query(None, description="Filter by user"),
     action: Optional[str] = Query(None, description="Filter by action type"),
     entity_type: Optional[str] = Query(None, description="Filter by entity type"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -296,7 +313,7 @@ async def get_audit_report(
     Get audit log report with filtering options
     Requires admin role for full access
     """
-    query = db.query(AuditLog).outerjoin(User, AuditLog.user_id == User.id)
+    query = db.query(AuditLog).options(joinedload(AuditLog.user))
     
     # Apply filters
     if start_date:
@@ -317,10 +334,12 @@ async def get_audit_report(
     if entity_type:
         query = query.filter(AuditLog.entity_type == entity_type)
     
-    # Order by most recent first
-    query = query.order_by(AuditLog.timestamp.desc())
-    
-    logs = query.limit(limit).all()
+    # Most recent first
+    page = keyset_paginate(
+        query, [AuditLog.timestamp], AuditLog.id,
+        limit=limit, cursor=cursor, descending=True
+    )
+    set_page_headers(response, page)
     
     return [
         AuditReportEntry(
@@ -333,12 +352,12 @@ async def get_audit_report(
             changes=log.changes,
             ip_address=log.ip_address
         )
-        for log in logs
+        for log in page.rows
     ]
 
 
 @router.get("/order-history")
-async def get_order_history(
+def get_order_history(
     days: int = Query(90, ge=1, le=365, description="Number of days to analyze"),
     status: Optional[str] = Query(None, description="Filter by order status"),
     db: Session = Depends(get_db),
@@ -387,9 +406,10 @@ async def get_order_history(
 
 
 @router.get("/movement-history")
-async def get_movement_history(
+def get_movement_history(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     location_id: Optional[UUID] = Query(None, description="Filter by location"),
+    subtree_of: Optional[UUID] = Query(None, description="Filter to a location and everything below it"),
     item_id: Optional[UUID] = Query(None, description="Filter by item"),
     limit: int = Query(100, ge=1, le=500, description="Maximum records to return"),
     db: Session = Depends(get_db),
@@ -412,6 +432,14 @@ async def get_movement_history(
             )
         )
     
+    if subtree_of:
+        query = query.filter(
+            or_(
+                in_subtree(InventoryMovement.from_location_id, subtree_of),
+                in_subtree(InventoryMovement.to_location_id, subtree_of)
+            )
+        )
+    
     if item_id:
         query = query.filter(InventoryMovement.item_id == item_id)
     
@@ -480,32 +508,64 @@ class CostAnalysisResponse(BaseModel):
 
 
 @router.get("/cost-analysis", response_model=CostAnalysisResponse)
-async def get_cost_analysis(
+@cached_report("cost-analysis")
+def get_cost_analysis(
     category_id: Optional[str] = Query(None, description="Filter by category"),
     location_id: Optional[UUID] = Query(None, description="Filter by location"),
+    subtree_of: Optional[UUID] = Query(None, description="Filter to a location and everything below it"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get comprehensive cost analysis of inventory
     """
-    # Base query for inventory with item details
-    query = db.query(
-        Item,
-        InventoryCurrent,
-        Category
-    ).outerjoin(
-        InventoryCurrent, Item.id == InventoryCurrent.item_id
-    ).outerjoin(
-        Category, Item.category_id == Category.id
-    ).filter(Item.is_active == True)
+    if location_id:
+        # Base query for inventory at one location with item details
+        query = db.query(
+            Item,
+            InventoryCurrent.quantity_on_hand,
+            Category
+        ).join(
+            InventoryCurrent, Item.id == InventoryCurrent.item_id
+        ).outerjoin(
+            Category, Item.category_id == Category.id
+        ).filter(
+            Item.is_active == True,
+            InventoryCurrent.location_id == location_id
+        )
+    elif subtree_of:
+        # Per-item totals over the location and everything below it
+        subtree_stock = db.query(
+            InventoryCurrent.item_id,
+            func.sum(InventoryCurrent.quantity_on_hand).label("quantity_on_hand")
+        ).filter(
+            in_subtree(InventoryCurrent.location_id, subtree_of)
+        ).group_by(InventoryCurrent.item_id).subquery()
+        query = db.query(
+            Item,
+            subtree_stock.c.quantity_on_hand,
+            Category
+        ).join(
+            subtree_stock, Item.id == subtree_stock.c.item_id
+        ).outerjoin(
+            Category, Item.category_id == Category.id
+        ).filter(Item.is_active == True)
+    else:
+        # All locations - per-item totals from the maintained rollup
+        query = db.query(
+            Item,
+            ItemStockRollup.quantity_on_hand,
+            Category
+        ).outerjoin(
+            ItemStockRollup,
+            and_(Item.id == ItemStockRollup.item_id, ItemStockRollup.station_group == ALL_LOCATIONS)
+        ).outerjoin(
+            Category, Item.category_id == Category.id
+        ).filter(Item.is_active == True)
     
     if category_id:
         query = query.filter(Item.category_id == category_id)
     
-    if location_id:
-        query = query.filter(InventoryCurrent.location_id == location_id)
-    
     results = query.all()
     
     # Calculate costs per item
@@ -513,9 +573,9 @@ async def get_cost_analysis(
     total_value = 0
     total_quantity = 0
     
-    for item, inventory, category in results:
+    for item, quantity_on_hand, category in results:
         unit_cost = float(item.cost_per_unit or 0)
-        qty = inventory.quantity_on_hand if inventory else 0
+        qty = quantity_on_hand or 0
         value = unit_cost * qty
         
         total_value += value
@@ -692,7 +752,7 @@ class ExpirationReport(BaseModel):
 
 
 @router.get("/product-life-projection", response_model=List[ProductLifeProjection])
-async def get_product_life_projection(
+def get_product_life_projection(
     days_history: int = Query(30, ge=7, le=365, description="Days of history to analyze"),
     category_id: Optional[str] = Query(None, description="Filter by category"),
     include_zero_stock: bool = Query(False, description="Include items with zero stock"),
@@ -705,37 +765,34 @@ async def get_product_life_projection(
     """
     start_date = datetime.utcnow() - timedelta(days=days_history)
     
-    # Get all active items
-    items_query = db.query(Item).filter(Item.is_active == True)
+    totals = _daily_totals_subquery(db, start_date)
+    
+    # Active items with stock across all locations and usage in the period
+    query = db.query(
+        Item,
+        Category.name,
+        ItemStockRollup.quantity_available,
+        totals.c.used
+    ).outerjoin(
+        Category, Item.category_id == Category.id
+    ).outerjoin(
+        ItemStockRollup,
+        and_(Item.id == ItemStockRollup.item_id, ItemStockRollup.station_group == ALL_LOCATIONS)
+    ).outerjoin(
+        totals, Item.id == totals.c.item_id
+    ).filter(Item.is_active == True)
     if category_id:
-        items_query = items_query.filter(Item.category_id == category_id)
-    items = items_query.all()
+        query = query.filter(Item.category_id == category_id)
     
     projections = []
     
-    for item in items:
-        # Get current stock across all locations
-        total_stock = 0
-        inventory_records = db.query(InventoryCurrent).filter(
-            InventoryCurrent.item_id == item.id
-        ).all()
-        
-        for inv in inventory_records:
-            total_stock += inv.quantity_on_hand - inv.quantity_allocated
+    for item, category_name, available, total_used in query.all():
+        total_stock = available or 0
         
         if not include_zero_stock and total_stock <= 0:
             continue
         
-        # Get usage history for this item
-        movements = db.query(InventoryMovement).filter(
-            InventoryMovement.item_id == item.id,
-            InventoryMovement.created_at >= start_date
-        ).all()
-        
-        total_used = 0
-        for movement in movements:
-            if movement.from_location_id and not movement.to_location_id:
-                total_used += movement.quantity
+        total_used = int(total_used or 0)
         
         # Calculate average daily usage
         avg_daily = total_used / days_history if days_history > 0 else 0
@@ -771,7 +828,7 @@ async def get_product_life_projection(
             item_id=item.id,
             item_code=item.item_code,
             item_name=item.name,
-            category=item.category.name if item.category else "Uncategorized",
+            category=category_name or "Uncategorized",
             current_stock=total_stock,
             average_daily_usage=round(avg_daily, 2),
             projected_days_remaining=days_remaining,
@@ -788,7 +845,8 @@ async def get_product_life_projection(
 
 
 @router.get("/cost-of-goods", response_model=COGReport)
-async def get_cost_of_goods_report(
+@cached_report("cost-of-goods")
+def get_cost_of_goods_report(
     days: int = Query(30, ge=1, le=365, description="Period in days to analyze"),
     category_id: Optional[str] = Query(None, description="Filter by category"),
     db: Session = Depends(get_db),
@@ -800,27 +858,27 @@ async def get_cost_of_goods_report(
     """
     start_date = datetime.utcnow() - timedelta(days=days)
     
+    totals = _daily_totals_subquery(db, start_date)
+    
     # Get all items with usage in the period
-    items_query = db.query(Item).filter(Item.is_active == True)
+    query = db.query(
+        Item,
+        Category.name,
+        totals.c.used
+    ).outerjoin(
+        Category, Item.category_id == Category.id
+    ).join(
+        totals, Item.id == totals.c.item_id
+    ).filter(Item.is_active == True)
     if category_id:
-        items_query = items_query.filter(Item.category_id == category_id)
-    items = items_query.all()
+        query = query.filter(Item.category_id == category_id)
     
     cog_items = []
     total_cost = 0.0
     category_costs = {}
     
-    for item in items:
-        # Get movements (usage) for this item
-        movements = db.query(InventoryMovement).filter(
-            InventoryMovement.item_id == item.id,
-            InventoryMovement.created_at >= start_date
-        ).all()
-        
-        total_used = 0
-        for movement in movements:
-            if movement.from_location_id and not movement.to_location_id:
-                total_used += movement.quantity
+    for item, category_name, total_used in query.all():
+        total_used = int(total_used or 0)
         
         if total_used == 0:
             continue
@@ -835,7 +893,7 @@ async def get_cost_of_goods_report(
         total_cost += cost_used
         
         # Aggregate by category
-        cat_name = item.category.name if item.category else "Uncategorized"
+        cat_name = category_name or "Uncategorized"
         cat_id = item.category_id or "UNCATEGORIZED"
         if cat_id not in category_costs:
             category_costs[cat_id] = {
@@ -884,7 +942,7 @@ async def get_cost_of_goods_report(
 
 
 @router.get("/usage-history-detail")
-async def get_detailed_usage_history(
+def get_detailed_usage_history(
     days: int = Query(30, ge=7, le=365, description="Period in days"),
     item_id: Optional[UUID] = Query(None, description="Filter by specific item"),
     category_id: Optional[str] = Query(None, description="Filter by category"),
@@ -899,39 +957,34 @@ async def get_detailed_usage_history(
     start_date = datetime.utcnow() - timedelta(days=days)
     
     # Get items to analyze
-    items_query = db.query(Item).filter(Item.is_active == True)
+    items_query = db.query(Item, Category.name).outerjoin(
+        Category, Item.category_id == Category.id
+    ).filter(Item.is_active == True)
     if item_id:
         items_query = items_query.filter(Item.id == item_id)
     if category_id:
         items_query = items_query.filter(Item.category_id == category_id)
     items = items_query.all()
     
+    # Daily totals for all selected items in one grouped query
+    daily_rows = movement_totals(db, start_date, by_day=True, item_id=item_id).all()
+    
+    daily_by_item = {}
+    for row in daily_rows:
+        # str() covers both date objects and SQLite's date strings
+        daily_by_item.setdefault(row.item_id, {})[str(row.date)[:10]] = {
+            "used": int(row.used or 0),
+            "received": int(row.received or 0),
+            "count": int(row.movement_count or 0)
+        }
+    
     detailed_reports = []
     
-    for item in items:
-        # Get all movements for this item
-        movements = db.query(InventoryMovement).filter(
-            InventoryMovement.item_id == item.id,
-            InventoryMovement.created_at >= start_date
-        ).order_by(InventoryMovement.created_at).all()
-        
-        if not movements:
+    for item, category_name in items:
+        daily_data = daily_by_item.get(item.id)
+        if not daily_data:
             continue
         
-        # Aggregate by day
-        daily_data = {}
-        for movement in movements:
-            day_key = movement.created_at.strftime("%Y-%m-%d")
-            if day_key not in daily_data:
-                daily_data[day_key] = {"used": 0, "received": 0, "count": 0}
-            
-            if movement.from_location_id and not movement.to_location_id:
-                daily_data[day_key]["used"] += movement.quantity
-            elif movement.to_location_id and not movement.from_location_id:
-                daily_data[day_key]["received"] += movement.quantity
-            
-            daily_data[day_key]["count"] += 1
-        
         # Calculate totals and find peak
         total_used = 0
         total_received = 0
@@ -976,7 +1029,7 @@ async def get_detailed_usage_history(
             "item_id": str(item.id),
             "item_code": item.item_code,
             "item_name": item.name,
-            "category": item.category.name if item.category else "Uncategorized",
+            "category": category_name or "Uncategorized",
             "period_days": days,
             "total_used": total_used,
             "total_received": total_received,
@@ -1003,10 +1056,12 @@ async def get_detailed_usage_history(
 
 
 @router.get("/expiration-tracking", response_model=ExpirationReport)
-async def get_expiration_tracking(
+@cached_report("expiration-tracking")
+def get_expiration_tracking(
     days_ahead: int = Query(90, ge=1, le=365, description="Look ahead days"),
     include_expired: bool = Query(True, description="Include already expired items"),
     location_id: Optional[UUID] = Query(None, description="Filter by location"),
+    subtree_of: Optional[UUID] = Query(None, description="Filter to a location and everything below it"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -1036,6 +1091,8 @@ async def get_expiration_tracking(
     
     if location_id:
         query = query.filter(InventoryItem.location_id == location_id)
+    if subtree_of:
+        query = query.filter(in_subtree(InventoryItem.location_id, subtree_of))
     
     if not include_expired:
         query = query.filter(InventoryItem.expiration_date >= now)
@@ -1125,8 +1182,63 @@ async def get_expiration_tracking(
     )
 
 
+def _movement_totals_subquery(db: Session, start_date: datetime):
+    """
+    Per-item used/received totals since start_date as a grouped subquery.
+    From-only movements count as used, to-only movements as received.
+    """
+    used = func.sum(case(
+        (and_(InventoryMovement.from_location_id.isnot(None), InventoryMovement.to_location_id.is_(None)),
+         InventoryMovement.quantity),
+        else_=0
+    ))
+    received = func.sum(case(
+        (and_(InventoryMovement.to_location_id.isnot(None), InventoryMovement.from_location_id.is_(None)),
+         InventoryMovement.quantity),
+        else_=0
+    ))
+    return db.query(
+        InventoryMovement.item_id.label("item_id"),
+        used.label("total_used"),
+        received.label("total_received")
+    ).filter(
+        InventoryMovement.created_at >= start_date
+    ).group_by(InventoryMovement.item_id).subquery()
+
+
+def _item_stock_and_usage(db: Session, start_date: datetime, category_id: Optional[str]):
+    """
+    Active items joined to their stock rollup, category name and movement
+    totals since start_date, in a single statement.
+    """
+    movements = _movement_totals_subquery(db, start_date)
+    query = db.query(
+        Item,
+        Category.name,
+        ItemStockRollup.quantity_on_hand,
+        ItemStockRollup.quantity_available,
+        ItemStockRollup.total_par,
+        ItemStockRollup.total_reorder,
+        func.coalesce(movements.c.total_used, 0),
+        func.coalesce(movements.c.total_received, 0)
+    ).outerjoin(
+        Category, Item.category_id == Category.id
+    ).outerjoin(
+        ItemStockRollup,
+        and_(Item.id == ItemStockRollup.item_id, ItemStockRollup.station_group == ALL_LOCATIONS)
+    ).outerjoin(
+        movements, Item.id == movements.c.item_id
+    ).filter(Item.is_active == True)
+    
+    if category_id:
+        query = query.filter(Item.category_id == category_id)
+    
+    return query.all()
+
+
 @router.get("/inventory-turnover")
-async def get_inventory_turnover(
+@cached_report("inventory-turnover")
+def get_inventory_turnover(
     days: int = Query(30, ge=7, le=365, description="Period to analyze"),
     category_id: Optional[str] = Query(None, description="Filter by category"),
     db: Session = Depends(get_db),
@@ -1138,36 +1250,16 @@ async def get_inventory_turnover(
     """
     start_date = datetime.utcnow() - timedelta(days=days)
     
-    items_query = db.query(Item).filter(Item.is_active == True)
-    if category_id:
-        items_query = items_query.filter(Item.category_id == category_id)
-    items = items_query.all()
-    
     turnover_data = []
     
-    for item in items:
-        # Get current stock
-        inventory_records = db.query(InventoryCurrent).filter(
-            InventoryCurrent.item_id == item.id
-        ).all()
-        
-        current_stock = sum(inv.quantity_on_hand for inv in inventory_records)
+    rows = _item_stock_and_usage(db, start_date, category_id)
+    for item, category_name, on_hand, _, _, _, total_used, total_received in rows:
+        current_stock = on_hand or 0
         if current_stock <= 0:
             continue
         
-        # Get usage in period
-        movements = db.query(InventoryMovement).filter(
-            InventoryMovement.item_id == item.id,
-            InventoryMovement.created_at >= start_date
-        ).all()
-        
-        total_used = 0
-        total_received = 0
-        for mov in movements:
-            if mov.from_location_id and not mov.to_location_id:
-                total_used += mov.quantity
-            elif mov.to_location_id and not mov.from_location_id:
-                total_received += mov.quantity
+        total_used = int(total_used)
+        total_received = int(total_received)
         
         # Calculate turnover ratio (annualized)
         # Turnover = Cost of Goods Used / Average Inventory
@@ -1197,7 +1289,7 @@ async def get_inventory_turnover(
             "item_id": str(item.id),
             "item_code": item.item_code,
             "item_name": item.name,
-            "category": item.category.name if item.category else "Uncategorized",
+            "category": category_name or "Uncategorized",
             "current_stock": current_stock,
             "total_used": total_used,
             "total_received": total_received,
@@ -1231,7 +1323,8 @@ async def get_inventory_turnover(
 
 
 @router.get("/reorder-forecast")
-async def get_reorder_forecast(
+@cached_report("reorder-forecast")
+def get_reorder_forecast(
     days_ahead: int = Query(30, ge=7, le=90, description="Forecast days ahead"),
     category_id: Optional[str] = Query(None, description="Filter by category"),
     db: Session = Depends(get_db),
@@ -1245,31 +1338,15 @@ async def get_reorder_forecast(
     history_days = 30  # Use last 30 days for projection
     start_date = datetime.utcnow() - timedelta(days=history_days)
     
-    items_query = db.query(Item).filter(Item.is_active == True)
-    if category_id:
-        items_query = items_query.filter(Item.category_id == category_id)
-    items = items_query.all()
-    
     forecast_data = []
     total_projected_cost = 0.0
     
-    for item in items:
-        # Get current stock
-        inventory_records = db.query(InventoryCurrent).filter(
-            InventoryCurrent.item_id == item.id
-        ).all()
-        current_stock = sum(inv.quantity_on_hand - inv.quantity_allocated for inv in inventory_records)
-        
-        # Get historical usage
-        movements = db.query(InventoryMovement).filter(
-            InventoryMovement.item_id == item.id,
-            InventoryMovement.created_at >= start_date
-        ).all()
-        
-        total_used = 0
-        for mov in movements:
-            if mov.from_location_id and not mov.to_location_id:
-                total_used += mov.quantity
+    rows = _item_stock_and_usage(db, start_date, category_id)
+    for item, category_name, _, available, total_par, total_reorder, total_used, _ in rows:
+        current_stock = available or 0
+        total_par = total_par or 0
+        total_reorder = total_reorder or 0
+        total_used = int(total_used)
         
         avg_daily_usage = total_used / history_days if history_days > 0 else 0
         
@@ -1280,11 +1357,6 @@ async def get_reorder_forecast(
         projected_usage = avg_daily_usage * days_ahead
         projected_stock_at_end = current_stock - projected_usage
         
-        # Get par level for reorder calculation
-        par_levels = db.query(ParLevel).filter(ParLevel.item_id == item.id).all()
-        total_par = sum(p.par_quantity for p in par_levels)
-        total_reorder = sum(p.reorder_quantity for p in par_levels)
-        
         # Will we need to reorder?
         needs_reorder = projected_stock_at_end < total_reorder
         
@@ -1305,7 +1377,7 @@ async def get_reorder_forecast(
                 "item_id": str(item.id),
                 "item_code": item.item_code,
                 "item_name": item.name,
-                "category": item.category.name if item.category else "Uncategorized",
+                "category": category_name or "Uncategorized",
                 "current_stock": int(current_stock),
                 "projected_usage": round(projected_usage, 1),
                 "projected_stock_at_end": round(projected_stock_at_end, 1),
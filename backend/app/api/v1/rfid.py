@@ -6,9 +6,10 @@ Handles item tracking, scanning, and location-based movements
 from typing import List, Optional, Annotated
 from uuid import UUID
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from app.core.database import get_db
 from app.api.v1.auth import get_current_user
@@ -17,7 +18,12 @@ from app.models.rfid import RFIDTag, TagStatus, InventoryMovement, MovementType
 from app.models.item import Item
 from app.models.location import Location
 from app.models.inventory import InventoryCurrent
+from app.models.par_level import ParLevel
 from app.models.audit import AuditLog, AuditAction
+from app.schemas.scan import RFIDTagResponse, ScanRequest, ScanResponse
+from app.services.scan_ingest import ScanIngestor, ingest_scans, not_found_result
+from app.services.code_index import RETIRED_STATUSES, RFID_TAG, get_code_index
+from app.services import par_breach
 
 router = APIRouter()
 
@@ -32,44 +38,6 @@ class RFIDTagCreate(BaseModel):
     expiration_date: Optional[datetime] = None
 
 
-class RFIDTagResponse(BaseModel):
-    id: UUID
-    tag_id: str
-    item_id: UUID
-    current_location_id: Optional[UUID]
-    status: TagStatus
-    lot_number: Optional[str]
-    serial_number: Optional[str]
-    expiration_date: Optional[datetime]
-    assigned_date: datetime
-    last_scanned_at: Optional[datetime]
-    
-    # Enriched data
-    item_name: str
-    item_code: str
-    location_name: Optional[str]
-    unit_of_measure: str
-    
-    class Config:
-        from_attributes = True
-
-
-class ScanRequest(BaseModel):
-    """Request from scanner device (Zebra TC22/27)"""
-    tag_id: str  # RFID/barcode value scanned
-    scanner_location_id: Optional[UUID] = None  # Current scanner location
-    scan_type: str = "barcode"  # "rfid" or "barcode"
-
-
-class ScanResponse(BaseModel):
-    """Response to scanner with item information"""
-    success: bool
-    tag_info: Optional[RFIDTagResponse] = None
-    item_info: Optional[dict] = None
-    message: str
-    suggested_action: Optional[str] = None
-
-
 class MoveItemRequest(BaseModel):
     """Move item via RFID scan"""
     tag_id: str
@@ -126,7 +94,7 @@ class InventoryScanResult(BaseModel):
 
 
 @router.post("/scan", response_model=ScanResponse)
-async def scan_tag(
+def scan_tag(
     scan_data: ScanRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -136,103 +104,70 @@ async def scan_tag(
     Returns item information and current location
     For Zebra TC22/27 scanner integration
     """
-    # Try to find RFID tag
-    rfid_tag = db.query(RFIDTag).filter(
-        RFIDTag.tag_id == scan_data.tag_id,
-        RFIDTag.status == TagStatus.ACTIVE
-    ).first()
-    
-    if rfid_tag:
-        # Update last scanned time
-        rfid_tag.last_scanned_at = datetime.utcnow()
-        db.commit()
-        
-        # Get item and location info
-        item = db.query(Item).filter(Item.id == rfid_tag.item_id).first()
-        location = db.query(Location).filter(
-            Location.id == rfid_tag.current_location_id
-        ).first() if rfid_tag.current_location_id else None
-        
-        if not item:
-            raise HTTPException(status_code=404, detail="Item not found")
-        
-        tag_response = RFIDTagResponse(
-            id=rfid_tag.id,
-            tag_id=rfid_tag.tag_id,
-            item_id=rfid_tag.item_id,
-            current_location_id=rfid_tag.current_location_id,
-            status=rfid_tag.status,
-            lot_number=rfid_tag.lot_number,
-            serial_number=rfid_tag.serial_number,
-            expiration_date=rfid_tag.expiration_date,
-            assigned_date=rfid_tag.assigned_date,
-            last_scanned_at=rfid_tag.last_scanned_at,
-            item_name=item.name,
-            item_code=item.item_code,
-            location_name=location.name if location else None,
-            unit_of_measure=item.unit_of_measure
-        )
-        
-        # Get current inventory
-        inventory = db.query(InventoryCurrent).filter(
-            InventoryCurrent.location_id == rfid_tag.current_location_id,
-            InventoryCurrent.item_id == rfid_tag.item_id
-        ).first() if rfid_tag.current_location_id else None
-        
-        item_info = {
-            "name": item.name,
-            "code": item.item_code,
-            "description": item.description,
-            "current_location": location.name if location else "Unknown",
-            "quantity_on_hand": inventory.quantity_on_hand if inventory else 0,
-            "is_controlled_substance": item.is_controlled_substance,
-            "expiration_date": rfid_tag.expiration_date.isoformat() if rfid_tag.expiration_date else None,
-            "lot_number": rfid_tag.lot_number
-        }
-        
-        # Determine suggested action
-        suggested_action = "transfer"  # Default action for scanned items
-        if rfid_tag.expiration_date and rfid_tag.expiration_date < datetime.utcnow():
-            suggested_action = "expired_remove"
-        
-        return ScanResponse(
-            success=True,
-            tag_info=tag_response,
-            item_info=item_info,
-            message=f"Item scanned: {item.name}",
-            suggested_action=suggested_action
-        )
+    results = ingest_scans(db, [scan_data])
+    if not results:
+        # The ingestor skips blank reads
+        return not_found_result(scan_data.tag_id)
+    return results[0]
+
+
+@router.post("/scan/batch", response_model=List[ScanResponse])
+async def scan_tags_batch(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Ingest a burst of scanner reads (RFID sweeps)
+    Body is a JSON array of scan requests, or one scan request per line
+    with Content-Type application/x-ndjson. NDJSON bodies are resolved in
+    chunks while they stream in. Returns one result per distinct tag.
+    The body is read on the event loop; resolving and writing run in the
+    threadpool so a large sweep does not hold up other requests.
+    """
+    ingestor = ScanIngestor(db)
+
+    if "ndjson" in request.headers.get("content-type", ""):
+        line_number = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            if lines:
+                await run_in_threadpool(_add_scan_lines, ingestor, lines, line_number)
+                line_number += len(lines)
+        await run_in_threadpool(_add_scan_lines, ingestor, [buffer], line_number)
     else:
-        # Tag not found - might be a barcode for an item without individual tracking
-        # Try to find item by barcode
-        item = db.query(Item).filter(Item.barcode == scan_data.tag_id).first()
-        
-        if item:
-            # Found item by barcode but no individual tag
-            return ScanResponse(
-                success=True,
-                tag_info=None,
-                item_info={
-                    "name": item.name,
-                    "code": item.item_code,
-                    "description": item.description
-                },
-                message=f"Item found: {item.name}. No individual tag assigned.",
-                suggested_action="link_tag"
-            )
-        else:
-            # Not found at all
-            return ScanResponse(
-                success=False,
-                tag_info=None,
-                item_info=None,
-                message=f"Tag/barcode not found: {scan_data.tag_id}",
-                suggested_action="create_tag"
-            )
+        try:
+            scans = TypeAdapter(List[ScanRequest]).validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+        await run_in_threadpool(ingestor.extend, scans)
+
+    return await run_in_threadpool(ingestor.finish)
+
+
+def _add_scan_lines(ingestor: ScanIngestor, lines: List[bytes], first_line: int):
+    """Buffer a run of NDJSON lines; lines are numbered from first_line + 1"""
+    for offset, line in enumerate(lines, start=1):
+        _add_scan_line(ingestor, line, first_line + offset)
+
+
+def _add_scan_line(ingestor: ScanIngestor, line: bytes, line_number: int):
+    """Validate one NDJSON line and buffer it; blank lines are skipped"""
+    if not line.strip():
+        return
+    try:
+        ingestor.add(ScanRequest.model_validate_json(line))
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid scan on line {line_number}: {e.errors(include_url=False)}"
+        )
 
 
 @router.post("/link", response_model=RFIDTagResponse)
-async def link_tag_to_item(
+def link_tag_to_item(
     link_data: LinkTagRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -342,7 +277,7 @@ async def link_tag_to_item(
 
 
 @router.post("/move")
-async def move_item_by_scan(
+def move_item_by_scan(
     move_data: MoveItemRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -351,22 +286,23 @@ async def move_item_by_scan(
     Move item to new location via RFID scan
     Typical workflow: Scan item → Scan destination location QR code → Move
     """
-    # Find RFID tag
-    rfid_tag = db.query(RFIDTag).filter(
-        RFIDTag.tag_id == move_data.tag_id,
-        RFIDTag.status == TagStatus.ACTIVE
-    ).first()
+    index = get_code_index(db)
     
-    if not rfid_tag:
+    # Find RFID tag
+    match = index.resolve_many([move_data.tag_id], db)[move_data.tag_id]
+    if not match or match.kind != RFID_TAG:
         raise HTTPException(status_code=404, detail="RFID tag not found")
     
     # Verify destination location
-    to_location = db.query(Location).filter(
-        Location.id == move_data.to_location_id
-    ).first()
-    if not to_location:
+    to_location_name = index.location_name(move_data.to_location_id, db)
+    if not to_location_name:
         raise HTTPException(status_code=404, detail="Destination location not found")
     
+    # The indexed status may predate a retirement in another worker
+    rfid_tag = db.get(RFIDTag, match.record_id)
+    if not rfid_tag or rfid_tag.status in RETIRED_STATUSES:
+        raise HTTPException(status_code=404, detail="RFID tag not found")
+    
     from_location_id = rfid_tag.current_location_id
     
     if from_location_id == move_data.to_location_id:
@@ -416,22 +352,22 @@ async def move_item_by_scan(
     )
     db.add(movement)
     
+    # Stock alerts for this write follow the check_on_scan setting
+    par_breach.mark_source(db, par_breach.SCAN)
     db.commit()
     
-    from_location = db.query(Location).filter(Location.id == from_location_id).first() if from_location_id else None
-    
     return {
         "success": True,
-        "message": f"Item moved to {to_location.name}",
-        "from_location": from_location.name if from_location else "Unknown",
-        "to_location": to_location.name,
+        "message": f"Item moved to {to_location_name}",
+        "from_location": index.location_name(from_location_id) or "Unknown",
+        "to_location": to_location_name,
         "tag_id": move_data.tag_id,
         "movement_id": movement.id
     }
 
 
 @router.get("/{tag_id}", response_model=RFIDTagResponse)
-async def get_tag_info(
+def get_tag_info(
     tag_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -468,7 +404,7 @@ async def get_tag_info(
 
 
 @router.get("/item/{item_id}/tags", response_model=List[RFIDTagResponse])
-async def get_item_tags(
+def get_item_tags(
     item_id: UUID,
     status: Optional[TagStatus] = None,
     current_user: User = Depends(get_current_user),
@@ -515,7 +451,7 @@ async def get_item_tags(
 
 
 @router.post("/receive-stock")
-async def receive_stock_by_scan(
+def receive_stock_by_scan(
     receive_data: ReceiveStockRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -531,20 +467,11 @@ async def receive_stock_by_scan(
     4. Creates receipt movement record
     5. Optionally links to Purchase Order
     """
-    # Find item by barcode, SKU, or RFID tag
-    item = db.query(Item).filter(
-        (Item.barcode == receive_data.barcode) |
-        (Item.sku == receive_data.barcode) |
-        (Item.rfid_tag == receive_data.barcode)
-    ).first()
+    index = get_code_index(db)
     
-    if not item:
-        # Try to find by RFID tag record
-        rfid_tag = db.query(RFIDTag).filter(
-            RFIDTag.tag_id == receive_data.barcode
-        ).first()
-        if rfid_tag:
-            item = db.query(Item).filter(Item.id == rfid_tag.item_id).first()
+    # Find item by item code, part number, or RFID tag
+    match = index.resolve_many([receive_data.barcode], db)[receive_data.barcode]
+    item = index.item(match.item_id) if match else None
     
     if not item:
         return {
@@ -555,18 +482,16 @@ async def receive_stock_by_scan(
         }
     
     # Default to Supply Station if no location provided
-    if receive_data.location_id:
-        location = db.query(Location).filter(Location.id == receive_data.location_id).first()
-    else:
-        location = db.query(Location).filter(Location.name == "Supply Station").first()
+    location_id = receive_data.location_id or index.location_id("Supply Station", db)
+    location_name = index.location_name(location_id, db)
     
-    if not location:
+    if not location_name:
         raise HTTPException(status_code=404, detail="Location not found")
     
     # Update or create inventory record
     inventory = db.query(InventoryCurrent).filter(
         InventoryCurrent.item_id == item.id,
-        InventoryCurrent.location_id == location.id
+        InventoryCurrent.location_id == location_id
     ).first()
     
     if inventory:
@@ -574,7 +499,7 @@ async def receive_stock_by_scan(
     else:
         inventory = InventoryCurrent(
             item_id=item.id,
-            location_id=location.id,
+            location_id=location_id,
             quantity_on_hand=receive_data.quantity,
             quantity_allocated=0
         )
@@ -583,9 +508,9 @@ async def receive_stock_by_scan(
     # Create receipt movement record
     movement = InventoryMovement(
         item_id=item.id,
-        to_location_id=location.id,
+        to_location_id=location_id,
         quantity=receive_data.quantity,
-        movement_type=MovementType.RECEIPT,
+        movement_type=MovementType.RECEIVE,
         reference_number=receive_data.barcode,
         notes=f"Received via scan. Lot: {receive_data.lot_number or 'N/A'}",
         user_id=current_user.id
@@ -608,7 +533,7 @@ async def receive_stock_by_scan(
         action=AuditAction.CREATE,
         entity_type="inventory_receipt",
         entity_id=item.id,
-        description=f"Received {receive_data.quantity} x {item.name} into {location.name}",
+        changes={"description": f"Received {receive_data.quantity} x {item.name} into {location_name}"},
         ip_address="127.0.0.1"
     )
     db.add(audit_log)
@@ -626,13 +551,13 @@ async def receive_stock_by_scan(
             "quantity_received": receive_data.quantity,
             "new_quantity_on_hand": inventory.quantity_on_hand
         },
-        "location": location.name,
+        "location": location_name,
         "movement_id": str(movement.id)
     }
 
 
 @router.post("/batch-receive")
-async def batch_receive_stock(
+def batch_receive_stock(
     batch_data: BatchScanRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -641,21 +566,30 @@ async def batch_receive_stock(
     Batch receive multiple items via scanning.
     Useful for receiving shipments where multiple items are scanned sequentially.
     """
-    location = db.query(Location).filter(Location.id == batch_data.location_id).first()
-    if not location:
+    index = get_code_index(db)
+    location_name = index.location_name(batch_data.location_id, db)
+    if not location_name:
         raise HTTPException(status_code=404, detail="Location not found")
     
     results = []
     success_count = 0
     error_count = 0
     
+    # Resolve every scanned code, then load the stock rows they touch at once
+    matches = index.resolve_many([scan_item.barcode for scan_item in batch_data.items], db)
+    item_ids = {match.item_id for match in matches.values() if match}
+    inventory_by_item = {
+        inventory.item_id: inventory
+        for inventory in db.query(InventoryCurrent).filter(
+            InventoryCurrent.location_id == batch_data.location_id,
+            InventoryCurrent.item_id.in_(list(item_ids))
+        ).all()
+    } if item_ids else {}
+    
     for scan_item in batch_data.items:
         # Find item
-        item = db.query(Item).filter(
-            (Item.barcode == scan_item.barcode) |
-            (Item.sku == scan_item.barcode) |
-            (Item.rfid_tag == scan_item.barcode)
-        ).first()
+        match = matches.get(scan_item.barcode)
+        item = index.item(match.item_id) if match else None
         
         if not item:
             results.append({
@@ -667,10 +601,7 @@ async def batch_receive_stock(
             continue
         
         # Update inventory
-        inventory = db.query(InventoryCurrent).filter(
-            InventoryCurrent.item_id == item.id,
-            InventoryCurrent.location_id == batch_data.location_id
-        ).first()
+        inventory = inventory_by_item.get(item.id)
         
         if inventory:
             inventory.quantity_on_hand += scan_item.quantity
@@ -682,13 +613,14 @@ async def batch_receive_stock(
                 quantity_allocated=0
             )
             db.add(inventory)
+            inventory_by_item[item.id] = inventory
         
         # Create movement
         movement = InventoryMovement(
             item_id=item.id,
             to_location_id=batch_data.location_id,
             quantity=scan_item.quantity,
-            movement_type=MovementType.RECEIPT,
+            movement_type=MovementType.RECEIVE,
             reference_number=scan_item.barcode,
             notes=f"Batch receive",
             user_id=current_user.id
@@ -710,12 +642,12 @@ async def batch_receive_stock(
         "success": error_count == 0,
         "message": f"Processed {len(batch_data.items)} items: {success_count} success, {error_count} errors",
         "results": results,
-        "location": location.name
+        "location": location_name
     }
 
 
 @router.post("/inventory-count")
-async def scan_for_inventory_count(
+def scan_for_inventory_count(
     location_id: UUID,
     scanned_items: dict,  # {barcode: quantity}
     current_user: User = Depends(get_current_user),
@@ -727,34 +659,29 @@ async def scan_for_inventory_count(
     
     scanned_items format: {"barcode1": 5, "barcode2": 10, ...}
     """
-    location = db.query(Location).filter(Location.id == location_id).first()
-    if not location:
+    index = get_code_index(db)
+    location_name = index.location_name(location_id, db)
+    if not location_name:
         raise HTTPException(status_code=404, detail="Location not found")
     
     results = []
     
-    # Get all inventory at this location
+    # Get all inventory and par levels at this location
     location_inventory = db.query(InventoryCurrent).filter(
         InventoryCurrent.location_id == location_id
     ).all()
-    
-    # Build lookup of items
-    item_ids = [inv.item_id for inv in location_inventory]
-    items = db.query(Item).filter(Item.id.in_(item_ids)).all()
-    item_map = {str(item.id): item for item in items}
-    barcode_to_item = {}
-    for item in items:
-        if item.barcode:
-            barcode_to_item[item.barcode] = item
-        if item.sku:
-            barcode_to_item[item.sku] = item
-        if item.rfid_tag:
-            barcode_to_item[item.rfid_tag] = item
+    inventory_by_item = {inv.item_id: inv for inv in location_inventory}
+    par_by_item = {
+        par.item_id: par
+        for par in db.query(ParLevel).filter(ParLevel.location_id == location_id).all()
+    }
     
     # Process scanned items
+    matches = index.resolve_many(scanned_items.keys(), db)
     scanned_item_ids = set()
     for barcode, scanned_qty in scanned_items.items():
-        item = barcode_to_item.get(barcode)
+        match = matches.get(barcode)
+        item = index.item(match.item_id) if match else None
         if not item:
             results.append({
                 "barcode": barcode,
@@ -766,28 +693,23 @@ async def scan_for_inventory_count(
             })
             continue
         
-        scanned_item_ids.add(str(item.id))
+        scanned_item_ids.add(item.id)
         
         # Find system quantity
-        inv = next((i for i in location_inventory if i.item_id == item.id), None)
+        inv = inventory_by_item.get(item.id)
         system_qty = inv.quantity_on_hand if inv else 0
         
-        # Get par levels
-        from app.models.inventory import ParLevel
-        par = db.query(ParLevel).filter(
-            ParLevel.item_id == item.id,
-            ParLevel.location_id == location_id
-        ).first()
+        par = par_by_item.get(item.id)
         
         variance = scanned_qty - system_qty
         
         # Determine status
-        if par and par.par_level:
-            if scanned_qty <= (par.reorder_level or 0):
+        if par and par.par_quantity:
+            if scanned_qty <= (par.reorder_quantity or 0):
                 status = "critical"
-            elif scanned_qty < par.par_level:
+            elif scanned_qty < par.par_quantity:
                 status = "low"
-            elif scanned_qty > par.par_level * 1.5:
+            elif scanned_qty > par.par_quantity * 1.5:
                 status = "over"
             else:
                 status = "ok"
@@ -801,22 +723,22 @@ async def scan_for_inventory_count(
             "barcode": barcode,
             "scanned_quantity": scanned_qty,
             "system_quantity": system_qty,
-            "par_level": par.par_level if par else None,
-            "reorder_level": par.reorder_level if par else None,
+            "par_level": par.par_quantity if par else None,
+            "reorder_level": par.reorder_quantity if par else None,
             "variance": variance,
             "status": status
         })
     
     # Find items in system but not scanned
     for inv in location_inventory:
-        if str(inv.item_id) not in scanned_item_ids and inv.quantity_on_hand > 0:
-            item = item_map.get(str(inv.item_id))
+        if inv.item_id not in scanned_item_ids and inv.quantity_on_hand > 0:
+            item = index.item(inv.item_id)
             if item:
                 results.append({
                     "item_id": str(inv.item_id),
                     "item_name": item.name if item else "Unknown",
                     "item_code": item.item_code if item else "N/A",
-                    "barcode": item.barcode or item.sku,
+                    "barcode": item.item_code,
                     "scanned_quantity": 0,
                     "system_quantity": inv.quantity_on_hand,
                     "variance": -inv.quantity_on_hand,
@@ -828,7 +750,7 @@ async def scan_for_inventory_count(
     results.sort(key=lambda x: status_order.get(x["status"], 99))
     
     return {
-        "location": location.name,
+        "location": location_name,
         "total_items_scanned": len(scanned_items),
         "total_items_in_system": len(location_inventory),
         "items_with_variance": len([r for r in results if r["variance"] != 0]),
@@ -837,7 +759,7 @@ async def scan_for_inventory_count(
 
 
 @router.post("/adjust-inventory")
-async def adjust_inventory_after_count(
+def adjust_inventory_after_count(
     location_id: UUID,
     adjustments: List[dict],  # [{item_id, new_quantity}]
     reason: str = "Inventory count adjustment",
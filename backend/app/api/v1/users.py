@@ -9,7 +9,8 @@ from datetime import datetime
 
 from app.core.database import get_db
 from app.models.user import User, UserRole
-from app.core.security import get_password_hash, verify_password
+from app.core.auth_cache import principal_cache, revoke_tokens
+from app.core.security import get_password_hash_async, verify_password_async
 from app.api.v1.auth import get_current_user
 from pydantic import BaseModel, EmailStr, Field
 
@@ -167,7 +168,7 @@ async def create_user(
     new_user = User(
         username=user_data.username,
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await get_password_hash_async(user_data.password),
         first_name=user_data.first_name,
         last_name=user_data.last_name,
         role=user_data.role,
@@ -253,11 +254,15 @@ async def update_user(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Cannot deactivate the last active admin user"
                 )
+        if user.is_active and not user_data.is_active:
+            # Deactivation signs the user out of every session
+            revoke_tokens(user)
         user.is_active = user_data.is_active
     
     user.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(user.id)
     
     return UserResponse(
         id=user.id,
@@ -309,6 +314,7 @@ async def delete_user(
     
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_id)
     
     return None
 
@@ -331,8 +337,9 @@ async def reset_user_password(
             detail="User not found"
         )
     
-    user.password_hash = get_password_hash(password_data.new_password)
+    user.password_hash = await get_password_hash_async(password_data.new_password)
     user.updated_at = datetime.utcnow()
+    revoke_tokens(user)
     db.commit()
     
     return {"message": "Password reset successfully"}
@@ -347,17 +354,20 @@ async def change_own_password(
     """
     Change own password (Any authenticated user)
     """
+    user = db.query(User).filter(User.id == current_user.id).first()
+    
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not user or not await verify_password_async(password_data.current_password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Update password
-    current_user.password_hash = get_password_hash(password_data.new_password)
-    current_user.updated_at = datetime.utcnow()
+    user.password_hash = await get_password_hash_async(password_data.new_password)
+    user.updated_at = datetime.utcnow()
     db.commit()
+    principal_cache.invalidate(user.id)
     
     return {"message": "Password changed successfully"}
 
@@ -393,41 +403,49 @@ async def update_own_profile(
     Update own profile (Any authenticated user)
     Note: Cannot change role or active status
     """
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
     # Check if email is being changed and already exists
-    if profile_data.email and profile_data.email != current_user.email:
+    if profile_data.email and profile_data.email != user.email:
         existing_email = db.query(User).filter(
             User.email == profile_data.email,
-            User.id != current_user.id
+            User.id != user.id
         ).first()
         if existing_email:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already exists"
             )
-        current_user.email = profile_data.email
+        user.email = profile_data.email
     
     # Update allowed fields
     if profile_data.first_name is not None:
-        current_user.first_name = profile_data.first_name
+        user.first_name = profile_data.first_name
     
     if profile_data.last_name is not None:
-        current_user.last_name = profile_data.last_name
+        user.last_name = profile_data.last_name
     
     # Ignore role and is_active changes for non-admins
     
-    current_user.updated_at = datetime.utcnow()
+    user.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
+    principal_cache.invalidate(user.id)
     
     return UserResponse(
-        id=current_user.id,
-        username=current_user.username,
-        email=current_user.email,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        role=current_user.role,
-        is_active=current_user.is_active,
-        last_login=current_user.last_login,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        role=user.role,
+        is_active=user.is_active,
+        last_login=user.last_login,
+        created_at=user.created_at,
+        updated_at=user.updated_at
     )
@@ -0,0 +1,84 @@
+"""
+Cache of verified principals for get_current_user
+
+Tokens carry the user's token_version in their "ver" claim. Once a token's
+subject has been loaded and checked against the database, a detached
+snapshot of the user is kept in a bounded in-process LRU keyed by subject
+and version, so later requests with that token skip the users query.
+Logging out everywhere, password reset and deactivation bump
+token_version, which revokes every outstanding token; user writes also evict the cached snapshot in this
+worker. Other workers notice within AUTH_CACHE_TTL_SECONDS.
+"""
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from app.core.cache import LRUBackend
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+
+class AuthenticatedUser:
+    """Detached snapshot of a User for request handlers (no password hash, no session)"""
+
+    __slots__ = (
+        "id", "username", "email", "first_name", "last_name", "role",
+        "is_active", "last_login", "created_at", "updated_at", "token_version",
+    )
+
+    def __init__(self, user: User):
+        self.id: UUID = user.id
+        self.username: str = user.username
+        self.email: str = user.email
+        self.first_name: str = user.first_name
+        self.last_name: str = user.last_name
+        self.role: UserRole = user.role
+        self.is_active: bool = user.is_active
+        self.last_login: Optional[datetime] = user.last_login
+        self.created_at: datetime = user.created_at
+        self.updated_at: datetime = user.updated_at
+        self.token_version: int = user.token_version or 0
+
+    def __repr__(self):
+        return f"<AuthenticatedUser {self.username}>"
+
+
+class PrincipalCache:
+    """Bounded LRU of AuthenticatedUser keyed by token subject and version"""
+
+    def __init__(self, max_entries: int):
+        self.backend = LRUBackend(max_entries)
+
+    @staticmethod
+    def _key(subject: str, token_version: int) -> str:
+        return f"{subject}:{token_version}"
+
+    def get(self, subject: str, token_version: int) -> Optional[AuthenticatedUser]:
+        if not settings.AUTH_CACHE_ENABLED:
+            return None
+        return self.backend.get(self._key(subject, token_version))
+
+    def set(self, subject: str, principal: AuthenticatedUser):
+        if settings.AUTH_CACHE_ENABLED:
+            self.backend.set(
+                self._key(subject, principal.token_version),
+                principal,
+                settings.AUTH_CACHE_TTL_SECONDS,
+                [f"user:{principal.id}"]
+            )
+
+    def invalidate(self, user_id: Any) -> int:
+        """Drop every cached snapshot of a user"""
+        return self.backend.invalidate([f"user:{user_id}"])
+
+    def clear(self):
+        self.backend.clear()
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+def revoke_tokens(user: User):
+    """Invalidate every token issued to user so far; the caller commits"""
+    user.token_version = (user.token_version or 0) + 1
+    principal_cache.invalidate(user.id)
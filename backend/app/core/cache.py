@@ -0,0 +1,405 @@
+"""
+Report response cache with tag-based invalidation
+
+Entries are keyed by endpoint name plus normalized query parameters and
+stored in Redis when it is reachable, otherwise in an in-process LRU.
+Every entry is tagged with the item/location/category it is filtered on,
+or with the global scope when unfiltered; inventory writes publish the
+tags they touched and matching entries are evicted immediately.
+
+Invalidation also bumps a generation per tag. A report is stored only if
+none of its tags were invalidated while it was being computed, so a result
+read before a write cannot be cached after it. The in-process LRU only sees
+its own worker's invalidations, so its entries live at most
+REPORT_CACHE_MEMORY_TTL_SECONDS; deployments with several API workers set
+REPORT_CACHE_REQUIRE_REDIS so reports are not cached per worker at all.
+"""
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_TAG = "scope:global"
+KEY_PREFIX = "report-cache:"
+TAG_PREFIX = "report-cache-tag:"
+GENERATION_PREFIX = "report-cache-gen:"
+
+# Per-tag generations remembered by the LRU; older ones collapse into a floor
+GENERATION_ENTRIES = 10_000
+# Redis generation counters outlive any report computation by far
+GENERATION_TTL_SECONDS = 3600
+
+# Query parameters that scope an entry to a single entity
+TAG_PARAMS = {
+    "item_id": "item",
+    "location_id": "location",
+    "category_id": "category",
+}
+
+# Seconds to wait before retrying Redis after a connection failure
+REDIS_RETRY_SECONDS = 30
+
+
+class LRUBackend:
+    """Thread-safe in-process LRU with per-entry expiry"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        # Invalidation sequence number of the last invalidation per tag
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._sequence = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, key: str) -> bool:
+        # Caller holds the lock; also drops the key from its tags so the tag
+        # index does not outgrow the entries
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def generation(self, tags: Iterable[str]) -> int:
+        """Token for set(): the invalidation sequence number right now"""
+        with self._lock:
+            return self._sequence
+
+    def set(self, key: str, value: str, ttl: int, tags: Iterable[str], since: Optional[int] = None):
+        tags = tuple(tags)
+        with self._lock:
+            if since is not None and any(self._generations.get(tag, self._floor) > since for tag in tags):
+                # Invalidated while the value was computed
+                return
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        evicted = 0
+        with self._lock:
+            self._sequence += 1
+            for tag in tags:
+                self._generations[tag] = self._sequence
+                self._generations.move_to_end(tag)
+                for key in list(self._tags.get(tag, ())):
+                    if self._remove(key):
+                        evicted += 1
+            while len(self._generations) > GENERATION_ENTRIES:
+                _, sequence = self._generations.popitem(last=False)
+                self._floor = max(self._floor, sequence)
+        return evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class RedisBackend:
+    """Redis storage: one string per entry plus one set of keys per tag"""
+
+    name = "redis"
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(KEY_PREFIX + key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def generation(self, tags: Iterable[str]) -> list:
+        """Token for set(): the generation counters of the tags right now"""
+        return self.client.mget([GENERATION_PREFIX + tag for tag in sorted(tags)])
+
+    def set(self, key: str, value: str, ttl: int, tags: Iterable[str], since: Optional[list] = None):
+        from redis.exceptions import WatchError
+
+        tags = sorted(tags)
+        generation_keys = [GENERATION_PREFIX + tag for tag in tags]
+        with self.client.pipeline() as pipe:
+            try:
+                if since is not None:
+                    # Store only if no tag is invalidated before EXEC
+                    pipe.watch(*generation_keys)
+                    if pipe.mget(generation_keys) != since:
+                        pipe.unwatch()
+                        return
+                    pipe.multi()
+                pipe.set(KEY_PREFIX + key, value, ex=ttl)
+                for tag in tags:
+                    pipe.sadd(TAG_PREFIX + tag, KEY_PREFIX + key)
+                    pipe.expire(TAG_PREFIX + tag, ttl)
+                pipe.execute()
+            except WatchError:
+                return
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        tag_keys = [TAG_PREFIX + tag for tag in tags]
+        if not tag_keys:
+            return 0
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.incr(GENERATION_PREFIX + tag)
+            pipe.expire(GENERATION_PREFIX + tag, GENERATION_TTL_SECONDS)
+        pipe.execute()
+        keys = self.client.sunion(tag_keys)
+        pipe = self.client.pipeline()
+        if keys:
+            pipe.delete(*keys)
+        pipe.delete(*tag_keys)
+        pipe.execute()
+        return len(keys)
+
+    def clear(self):
+        for pattern in (KEY_PREFIX + "*", TAG_PREFIX + "*", GENERATION_PREFIX + "*"):
+            keys = list(self.client.scan_iter(pattern))
+            if keys:
+                self.client.delete(*keys)
+
+
+class ReportCache:
+    """Report cache front end with Redis/LRU selection and hit/miss counters"""
+
+    def __init__(self):
+        self.memory = LRUBackend(settings.REPORT_CACHE_MAX_ENTRIES)
+        self._redis: Optional[RedisBackend] = None
+        self._redis_retry_at = 0.0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.invalidations = 0
+
+    # ------------------------------------------------------------------
+    # Backend selection
+    # ------------------------------------------------------------------
+
+    def _backend(self):
+        if self._redis is not None:
+            return self._redis
+        if not settings.REDIS_URL or time.monotonic() < self._redis_retry_at:
+            return self.memory
+        try:
+            import redis
+
+            client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5
+            )
+            client.ping()
+            self._redis = RedisBackend(client)
+            logger.info("Report cache using Redis at %s", settings.REDIS_URL)
+            return self._redis
+        except Exception as e:
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            logger.info("Report cache falling back to in-process LRU: %s", e)
+            return self.memory
+
+    def _redis_failed(self, e: Exception):
+        logger.warning("Report cache Redis error, using in-process LRU: %s", e)
+        self._redis = None
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend().name
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def _count(self, endpoint: str, field: str, amount: int = 1):
+        with self._lock:
+            counters = self.stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+            counters[field] += amount
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_endpoint = {name: dict(counters) for name, counters in self.stats.items()}
+        hits = sum(c["hits"] for c in per_endpoint.values())
+        misses = sum(c["misses"] for c in per_endpoint.values())
+        return {
+            "backend": self.backend_name,
+            "enabled": settings.REPORT_CACHE_ENABLED,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "invalidated_entries": self.invalidations,
+            "endpoints": per_endpoint,
+        }
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def _memory_allowed(self) -> bool:
+        return not settings.REPORT_CACHE_REQUIRE_REDIS
+
+    def get(self, endpoint: str, key: str) -> Optional[Any]:
+        backend = self._backend()
+        raw = None
+        try:
+            if backend is not self.memory or self._memory_allowed():
+                raw = backend.get(key)
+        except Exception as e:
+            self._redis_failed(e)
+            raw = self.memory.get(key) if self._memory_allowed() else None
+        if raw is None:
+            self._count(endpoint, "misses")
+            return None
+        self._count(endpoint, "hits")
+        return json.loads(raw)
+
+    def generation(self, tags: Iterable[str]) -> Tuple[str, Any]:
+        """Snapshot to pass to set() so results computed across an invalidation are dropped"""
+        backend = self._backend()
+        try:
+            return backend.name, backend.generation(tags)
+        except Exception as e:
+            self._redis_failed(e)
+            return self.memory.name, self.memory.generation(tags)
+
+    def set(self, key: str, value: Any, ttl: int, tags: Iterable[str], generation: Optional[Tuple[str, Any]] = None):
+        raw = json.dumps(value)
+        backend = self._backend()
+        if generation is not None and generation[0] != backend.name:
+            # The backend changed while the value was computed
+            return
+        since = generation[1] if generation is not None else None
+        memory_ttl = min(ttl, settings.REPORT_CACHE_MEMORY_TTL_SECONDS)
+        try:
+            if backend is not self.memory:
+                backend.set(key, raw, ttl, tags, since)
+            elif self._memory_allowed():
+                self.memory.set(key, raw, memory_ttl, tags, since)
+        except Exception as e:
+            self._redis_failed(e)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Evict every entry carrying one of the tags, plus all unscoped entries"""
+        tags = set(tags) | {GLOBAL_TAG}
+        evicted = self.memory.invalidate(tags)
+        backend = self._backend()
+        if backend is not self.memory:
+            try:
+                evicted += backend.invalidate(tags)
+            except Exception as e:
+                self._redis_failed(e)
+        if evicted:
+            with self._lock:
+                self.invalidations += evicted
+        return evicted
+
+    def clear(self):
+        self.memory.clear()
+        backend = self._backend()
+        if backend is not self.memory:
+            try:
+                backend.clear()
+            except Exception as e:
+                self._redis_failed(e)
+
+
+report_cache = ReportCache()
+
+# Threadpool workers blocked here hold no GIL, leaving it to cheap requests
+report_slots = threading.BoundedSemaphore(settings.REPORT_MAX_CONCURRENCY)
+
+
+def make_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """Endpoint name plus a digest of the sorted, stringified query parameters"""
+    normalized = sorted(
+        (name, str(value)) for name, value in params.items() if value is not None
+    )
+    digest = hashlib.sha1(json.dumps(normalized).encode()).hexdigest()
+    return f"{endpoint}:{digest}"
+
+
+def tags_for_params(params: Dict[str, Any]) -> Set[str]:
+    """Entity tags for the filters in params, or the global tag when unfiltered"""
+    tags = {
+        f"{prefix}:{params[name]}"
+        for name, prefix in TAG_PARAMS.items()
+        if params.get(name) is not None
+    }
+    return tags or {GLOBAL_TAG}
+
+
+def cached_report(endpoint: str, ttl: Optional[int] = None, exclude: Iterable[str] = ("db", "current_user")):
+    """
+    Cache a sync endpoint's JSON-encoded result
+
+    Keyword arguments other than the excluded dependencies form the cache
+    key. The wrapped function keeps its signature for FastAPI. Misses are
+    computed under report_slots so at most REPORT_MAX_CONCURRENCY heavy
+    reports share the interpreter with scanner traffic at any time.
+    """
+    excluded = set(exclude)
+
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.REPORT_CACHE_ENABLED:
+                with report_slots:
+                    return func(*args, **kwargs)
+
+            params = {name: value for name, value in kwargs.items() if name not in excluded}
+            key = make_cache_key(endpoint, params)
+            cached = report_cache.get(endpoint, key)
+            if cached is not None:
+                return cached
+
+            tags = tags_for_params(params)
+            generation = report_cache.generation(tags)
+            with report_slots:
+                result = jsonable_encoder(func(*args, **kwargs))
+            report_cache.set(key, result, ttl or settings.REPORT_CACHE_TTL_SECONDS, tags, generation)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_report_cache(item_ids: Iterable[Any] = (), location_ids: Iterable[Any] = (),
+                            category_ids: Iterable[Any] = ()) -> int:
+    """Publish invalidation tags for changed items, locations and categories"""
+    tags = {f"item:{value}" for value in item_ids if value}
+    tags |= {f"location:{value}" for value in location_ids if value}
+    tags |= {f"category:{value}" for value in category_ids if value}
+    return report_cache.invalidate(tags)
@@ -18,6 +18,12 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./ems_supply.db"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    
+    # Sync route handlers run in a bounded threadpool; defaults to the DB pool
+    # size plus overflow so no worker thread waits on a connection
+    THREADPOOL_MAX_WORKERS: Optional[int] = None
     
     # Security & Authentication
     SECRET_KEY: str = "your-secret-key-change-in-production-use-openssl-rand-hex-32"
@@ -25,6 +31,17 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing (bcrypt cost factor; existing hashes are upgraded at login
+    # when it changes). Hashes run on their own thread pool, one per CPU by default
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    
+    # Verified-user cache for authenticated requests (other workers see
+    # deactivations and revoked tokens within the TTL)
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: int = 10
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+    
     # CORS
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000"]
     
@@ -37,6 +54,51 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Report cache (Redis when reachable, in-process LRU otherwise)
+    REPORT_CACHE_ENABLED: bool = True
+    REPORT_CACHE_TTL_SECONDS: int = 300
+    REPORT_CACHE_MAX_ENTRIES: int = 512
+    # The in-process LRU misses other workers' invalidations; keep its entries short-lived
+    REPORT_CACHE_MEMORY_TTL_SECONDS: int = 30
+    # Set when running several API workers: without Redis, reports are not cached
+    REPORT_CACHE_REQUIRE_REDIS: bool = False
+    REPORT_MAX_CONCURRENCY: int = 2  # heavy reports computed at once per worker
+    
+    # Scanner ingest (repeat reads of a tag inside the window skip the last_scanned_at write)
+    SCAN_DEDUP_WINDOW_SECONDS: float = 2.0
+    SCAN_INGEST_BATCH_SIZE: int = 500
+    
+    # Scanned-code resolution index (full reload interval; commits patch it in between)
+    CODE_INDEX_REFRESH_SECONDS: int = 300
+    
+    # CSV import staging (uploads kept on disk between preview and execute; share the
+    # directory between workers; defaults to a folder in the system temp dir)
+    CSV_STAGING_DIR: Optional[str] = None
+    CSV_STAGING_TTL_SECONDS: int = 3600
+    
+    # System configuration (workers poll the stored version and reload on change)
+    SYSTEM_CONFIG_POLL_SECONDS: float = 5.0
+    
+    # Background jobs (run_jobs.py runs them as one separate process; JOBS_ENABLED
+    # runs them inside the API process instead, for single-worker setups).
+    # Expiration notifications are raised once per item, location and expiration
+    # day as a warning, then as critical
+    JOBS_ENABLED: bool = False
+    EXPIRATION_SWEEP_SECONDS: float = 900.0
+    MOVEMENT_ROLLUP_SECONDS: float = 300.0
+    EXPIRATION_WARNING_DAYS: int = 30
+    EXPIRATION_CRITICAL_DAYS: int = 7
+    
+    # Streaming exports (rows fetched per server-cursor batch and written per chunk)
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Request metrics (Server-Timing/X-Query-Count headers, slow request log, /metrics)
+    QUERY_METRICS_ENABLED: bool = True
+    QUERY_COUNT_THRESHOLD: int = 50  # requests above this many statements are flagged
+    SLOW_REQUEST_MS: int = 1000
+    SLOW_REQUEST_TOP_STATEMENTS: int = 5  # slowest statements logged per slow request
+    METRICS_WINDOW: int = 1000  # recent requests per route kept for quantiles
+    
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
     
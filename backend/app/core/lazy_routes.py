@@ -0,0 +1,87 @@
+"""
+Routers imported on first use
+
+A placeholder route claims a router's path prefix. The first request under
+that prefix imports the module, includes its router in the app and is then
+routed again as usual, so rarely used routers (reports, CSV import) add
+nothing to cold starts and --reload cycles. The OpenAPI schema loads every
+pending router before it is built so /docs stays complete.
+"""
+import importlib
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRouterRoute(BaseRoute):
+    """Placeholder for a router that is imported on the first matching request"""
+
+    def __init__(self, app: FastAPI, module: str, prefix: str, tags: Optional[List[str]] = None):
+        self.app = app
+        self.module = module
+        self.prefix = prefix.rstrip("/")
+        self.tags = tags
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def matches(self, scope: Scope):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path == self.prefix or path.startswith(self.prefix + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+    def load(self):
+        with self._lock:
+            if self.loaded:
+                return
+            start = time.perf_counter()
+            module = importlib.import_module(self.module)
+            self.app.include_router(module.router, prefix=self.prefix, tags=self.tags)
+            self.app.router.routes.remove(self)
+            self.app.openapi_schema = None
+            self.loaded = True
+            logger.info(
+                "Loaded %s on first use in %.0f ms",
+                self.module, (time.perf_counter() - start) * 1000
+            )
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send):
+        self.load()
+        # Route again now that the real endpoints are registered
+        await self.app.router(scope, receive, send)
+
+
+def pending_lazy_routes(app: FastAPI) -> List[LazyRouterRoute]:
+    return [route for route in app.router.routes if isinstance(route, LazyRouterRoute)]
+
+
+def load_lazy_routers(app: FastAPI):
+    """Import every router still waiting for its first request"""
+    for route in pending_lazy_routes(app):
+        route.load()
+
+
+def include_lazy_router(app: FastAPI, module: str, prefix: str, tags: Optional[List[str]] = None):
+    """Register module.router under prefix without importing module yet"""
+    app.router.routes.append(LazyRouterRoute(app, module, prefix, tags))
+
+    if not getattr(app, "_lazy_openapi", False):
+        build_openapi = app.openapi
+
+        def openapi():
+            load_lazy_routers(app)
+            return build_openapi()
+
+        app.openapi = openapi
+        app._lazy_openapi = True
@@ -0,0 +1,230 @@
+"""
+Per-request SQL instrumentation and route metrics
+
+Cursor events on the engine count statements and sum their duration into
+the stats of the request being served. The stats live in a context
+variable, which is copied into the threadpool workers that run sync route
+handlers and streaming bodies, so each statement is charged to the right
+request. The ASGI middleware reports the totals in Server-Timing and
+X-Query-Count headers, logs slow requests with their slowest statements
+and feeds per-route summaries that /metrics renders in Prometheus text
+format.
+"""
+import heapq
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Label for requests that matched no route, so unknown paths cannot grow the registry
+UNMATCHED_ROUTE = "unmatched"
+
+# Paths served without recording metrics
+EXCLUDED_PATHS = {"/metrics"}
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# (metric name, help text, RouteSeries sample window, RouteSeries running total)
+SUMMARIES = (
+    ("ems_request_duration_seconds", "Request latency to the last body chunk", "durations", "duration_sum"),
+    ("ems_request_db_seconds", "Time spent executing SQL per request", "db_durations", "db_sum"),
+    ("ems_request_queries", "SQL statements executed per request", "query_counts", "query_sum"),
+)
+
+
+class RequestQueryStats:
+    """Statements issued while serving one request"""
+
+    def __init__(self, top_n: int):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.top_n = top_n
+        self._slowest: List[Tuple[float, int, str]] = []  # min-heap of (seconds, seq, statement)
+
+    def record(self, statement: str, seconds: float):
+        self.query_count += 1
+        self.db_seconds += seconds
+        entry = (seconds, self.query_count, statement)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        return [(seconds, statement) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if stats is not None and started_at is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+def register_engine_hooks(engine: Engine):
+    """Time every statement executed on engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    """Nearest-rank quantile of a sorted, non-empty list"""
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+class RouteSeries:
+    """Totals and a window of recent samples for one method + route"""
+
+    def __init__(self, window: int):
+        self.requests = 0
+        self.duration_sum = 0.0
+        self.db_sum = 0.0
+        self.query_sum = 0
+        self.over_threshold = 0
+        self.durations: Deque[float] = deque(maxlen=window)
+        self.db_durations: Deque[float] = deque(maxlen=window)
+        self.query_counts: Deque[int] = deque(maxlen=window)
+
+    def observe(self, seconds: float, stats: RequestQueryStats, over_threshold: bool):
+        self.requests += 1
+        self.duration_sum += seconds
+        self.db_sum += stats.db_seconds
+        self.query_sum += stats.query_count
+        self.over_threshold += int(over_threshold)
+        self.durations.append(seconds)
+        self.db_durations.append(stats.db_seconds)
+        self.query_counts.append(stats.query_count)
+
+
+class RouteMetrics:
+    """Per-route request summaries rendered for Prometheus"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._series: Dict[Tuple[str, str], RouteSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, seconds: float, stats: RequestQueryStats, over_threshold: bool):
+        with self._lock:
+            series = self._series.get((method, route))
+            if series is None:
+                series = self._series[(method, route)] = RouteSeries(self.window)
+            series.observe(seconds, stats, over_threshold)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            series = sorted(self._series.items())
+            for name, help_text, samples_attr, sum_attr in SUMMARIES:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} summary")
+                for (method, route), entry in series:
+                    labels = f'method="{method}",route="{_escape(route)}"'
+                    samples = sorted(getattr(entry, samples_attr))
+                    for q in QUANTILES:
+                        if samples:
+                            lines.append(f'{name}{{{labels},quantile="{q}"}} {_quantile(samples, q):.6g}')
+                    lines.append(f"{name}_sum{{{labels}}} {getattr(entry, sum_attr):.6g}")
+                    lines.append(f"{name}_count{{{labels}}} {entry.requests}")
+
+            name = "ems_requests_over_query_threshold_total"
+            lines.append(f"# HELP {name} Requests that executed more than QUERY_COUNT_THRESHOLD statements")
+            lines.append(f"# TYPE {name} counter")
+            for (method, route), entry in series:
+                lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {entry.over_threshold}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+route_metrics = RouteMetrics(settings.METRICS_WINDOW)
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class QueryMetricsMiddleware:
+    """Attach query counts and DB time to responses and record route metrics"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(settings.SLOW_REQUEST_TOP_STATEMENTS)
+        token = _current_stats.set(stats)
+        started_at = time.perf_counter()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                # Statements issued after the headers (streamed bodies) still count in /metrics
+                elapsed_ms = (time.perf_counter() - started_at) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(QUERY_COUNT_HEADER, str(stats.query_count))
+                headers.append(
+                    SERVER_TIMING_HEADER,
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.query_count} queries", '
+                    f"app;dur={elapsed_ms:.1f}"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._finish(scope, stats, time.perf_counter() - started_at)
+
+    def _finish(self, scope: Scope, stats: RequestQueryStats, seconds: float):
+        method, route = scope["method"], _route_label(scope)
+        over_threshold = stats.query_count > settings.QUERY_COUNT_THRESHOLD
+        route_metrics.observe(method, route, seconds, stats, over_threshold)
+
+        if over_threshold:
+            logger.warning(
+                "%s %s executed %d queries (threshold %d), possible N+1",
+                method, route, stats.query_count, settings.QUERY_COUNT_THRESHOLD
+            )
+        if seconds * 1000 >= settings.SLOW_REQUEST_MS:
+            slowest = "\n".join(
+                f"  {statement_seconds * 1000:8.1f} ms  {' '.join(statement.split())[:300]}"
+                for statement_seconds, statement in stats.slowest()
+            )
+            logger.warning(
+                "Slow request %s %s: %.0f ms, %d queries, %.0f ms in DB\n%s",
+                method, scope["path"], seconds * 1000, stats.query_count,
+                stats.db_seconds * 1000, slowest
+            )
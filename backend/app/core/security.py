@@ -1,12 +1,22 @@
 """
 Security utilities for password hashing and JWT token management
 """
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
 import bcrypt
 from .config import settings
 
+# bcrypt releases the GIL, so hashes run in parallel on these threads while
+# the event loop keeps serving requests
+_hash_pool = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash"
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
@@ -17,15 +27,37 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Generate password hash"""
-    salt = bcrypt.gensalt()
+    """Generate password hash with the configured cost factor"""
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a hash was made with a cost factor other than BCRYPT_ROUNDS"""
+    try:
+        rounds = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool, for async handlers"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the hashing pool, for async handlers"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, get_password_hash, password)
+
+
 def create_access_token(
     subject: Union[str, int],
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    token_version: int = 0
 ) -> str:
     """Create JWT access token"""
     if expires_delta:
@@ -38,7 +70,8 @@ def create_access_token(
     to_encode = {
         "exp": expire,
         "sub": str(subject),
-        "type": "access"
+        "type": "access",
+        "ver": token_version
     }
     encoded_jwt = jwt.encode(
         to_encode,
@@ -50,7 +83,8 @@ def create_access_token(
 
 def create_refresh_token(
     subject: Union[str, int],
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    token_version: int = 0
 ) -> str:
     """Create JWT refresh token"""
     if expires_delta:
@@ -63,7 +97,8 @@ def create_refresh_token(
     to_encode = {
         "exp": expire,
         "sub": str(subject),
-        "type": "refresh"
+        "type": "refresh",
+        "ver": token_version
     }
     encoded_jwt = jwt.encode(
         to_encode,
@@ -1,19 +1,88 @@
 """
 Main FastAPI application
 """
+import asyncio
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import SessionLocal, engine
+from app.core.lazy_routes import include_lazy_router
+from app.core.request_metrics import (
+    QUERY_COUNT_HEADER, SERVER_TIMING_HEADER, QueryMetricsMiddleware, register_engine_hooks, route_metrics
+)
+from app.utils.etag import ETAG_HEADER
+from app.utils.pagination import PAGE_HEADERS
 
 # Import all models to register them with SQLAlchemy
 from app.models import *
 
-# Import API routers
-from app.api.v1 import auth, items, locations, inventory, rfid, orders, reports, users, config, inventory_items, categories, employees, assets, forms, csv_import, internal_orders
+# Import API routers (reports and csv_import are imported on first use below)
+from app.api.v1 import auth, items, locations, inventory, rfid, orders, users, config, inventory_items, categories, employees, assets, forms, internal_orders, exports, notifications, jobs
+
+from app.services import stock_rollup, cache_invalidation, code_index, system_config, location_tree, scheduler, par_breach, movement_rollup
+
+# Schema creation and migrations run once before the workers start
+# (python init_db.py), not on import
+
+# Keep the per-item stock rollup in step with inventory writes
+stock_rollup.register_session_hooks(SessionLocal)
+
+# Track (item, location) pairs below par and raise stock alerts
+par_breach.register_session_hooks(SessionLocal)
+
+# Keep the location closure table in step with the hierarchy
+location_tree.register_session_hooks(SessionLocal)
+
+# Re-aggregate movement_daily buckets of deleted movements
+movement_rollup.register_session_hooks(SessionLocal)
+
+# Evict cached reports touched by inventory writes
+cache_invalidation.register_session_hooks(SessionLocal)
+
+# Keep the scanned-code resolution index in step with item and tag writes
+code_index.register_session_hooks(SessionLocal)
+
+# Count and time SQL statements per request
+if settings.QUERY_METRICS_ENABLED:
+    register_engine_hooks(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Bound the threadpool that runs sync route handlers to the DB pool
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.THREADPOOL_MAX_WORKERS or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    # Populate the stock rollup on first start against an existing database
+    db = SessionLocal()
+    try:
+        if stock_rollup.rollup_is_empty(db):
+            stock_rollup.refresh_item_rollups(db)
+            db.commit()
+        # Likewise the location closure for databases created before it existed
+        if location_tree.closure_is_empty(db):
+            location_tree.refresh_location_closure(db)
+            db.commit()
+        # Load the scanned-code index before the first scan arrives
+        code_index.code_index.load(db)
+        # Serve the stored system configuration from memory
+        system_config.system_config.load(db)
+    finally:
+        db.close()
+    config_poller = asyncio.create_task(system_config.poll_forever(SessionLocal))
+    # Expiration sweeps and other periodic jobs (or run_jobs.py as its own process)
+    job_runner = asyncio.create_task(scheduler.run_forever(SessionLocal)) if settings.JOBS_ENABLED else None
+    try:
+        yield
+    finally:
+        config_poller.cancel()
+        if job_runner:
+            job_runner.cancel()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
@@ -21,7 +90,8 @@ app = FastAPI(
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -31,8 +101,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGE_HEADERS + [ETAG_HEADER, QUERY_COUNT_HEADER, SERVER_TIMING_HEADER],
 )
 
+if settings.QUERY_METRICS_ENABLED:
+    # Added after CORS so it wraps the whole stack and times preflight responses too
+    app.add_middleware(QueryMetricsMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -50,6 +125,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Per-route latency and query count summaries in Prometheus text format"""
+    return PlainTextResponse(route_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 # Include API routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(items.router, prefix="/api/v1/items", tags=["Items"])
@@ -60,13 +141,16 @@ app.include_router(inventory.router, prefix="/api/v1/inventory", tags=["Inventor
 app.include_router(rfid.router, prefix="/api/v1/rfid", tags=["RFID/Scanning"])
 app.include_router(orders.router, prefix="/api/v1/orders", tags=["Purchase Orders"])
 app.include_router(internal_orders.router, prefix="/api/v1/internal-orders", tags=["Internal Orders"])
-app.include_router(reports.router, prefix="/api/v1/reports", tags=["Reports"])
+include_lazy_router(app, "app.api.v1.reports", prefix="/api/v1/reports", tags=["Reports"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
 app.include_router(config.router, prefix="/api/v1/config", tags=["System Configuration"])
+app.include_router(notifications.router, prefix="/api/v1/notifications", tags=["Notifications"])
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["Background Jobs"])
 app.include_router(employees.router, prefix="/api/v1/employees", tags=["Employees"])
 app.include_router(assets.router, prefix="/api/v1/assets", tags=["Assets"])
 app.include_router(forms.router, prefix="/api/v1/forms", tags=["Forms"])
-app.include_router(csv_import.router, prefix="/api/v1/csv-import", tags=["CSV Import"])
+include_lazy_router(app, "app.api.v1.csv_import", prefix="/api/v1/csv-import", tags=["CSV Import"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["Exports"])
 # from app.api import auth, users, items, locations, rfid, orders, reports
 # app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["auth"])
 # app.include_router(users.router, prefix=f"{settings.API_V1_PREFIX}/users", tags=["users"])
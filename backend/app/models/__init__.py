@@ -3,7 +3,7 @@ Import all models for Alembic migrations
 """
 from app.models.base import BaseModel
 from app.models.user import User, UserRole
-from app.models.location import Location, LocationType
+from app.models.location import Location, LocationType, LocationClosure
 from app.models.item import Item, Category
 from app.models.par_level import ParLevel
 from app.models.rfid import RFIDTag, InventoryMovement, TagStatus, MovementType
@@ -21,6 +21,11 @@ from app.models.notification import Notification, NotificationType, Notification
 from app.models.employee import Employee
 from app.models.asset import Asset
 from app.models.form import FormTemplate, FormSubmission
+from app.models.stock_rollup import ItemStockRollup
+from app.models.movement_daily import MovementDaily, RollupWatermark
+from app.models.system_config import SystemConfigRecord
+from app.models.job_run import JobRun, JobStatus
+from app.models.par_breach import ParBreach
 
 __all__ = [
     "BaseModel",
@@ -28,6 +33,7 @@ __all__ = [
     "UserRole",
     "Location",
     "LocationType",
+    "LocationClosure",
     "Item",
     "Category",
     "ParLevel",
@@ -53,4 +59,11 @@ __all__ = [
     "Asset",
     "FormTemplate",
     "FormSubmission",
+    "ItemStockRollup",
+    "MovementDaily",
+    "RollupWatermark",
+    "SystemConfigRecord",
+    "JobRun",
+    "JobStatus",
+    "ParBreach",
 ]
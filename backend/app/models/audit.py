@@ -1,7 +1,7 @@
 """
 Compliance and Audit models for HIPAA, CAAS, and pharmacy board compliance
 """
-from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Enum as SQLEnum, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Index, Enum as SQLEnum, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import enum
@@ -23,6 +23,12 @@ class AuditAction(str, enum.Enum):
 class AuditLog(BaseModel):
     """Audit Log model for comprehensive activity tracking"""
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Keyset pagination of the audit log
+        Index('ix_audit_logs_timestamp_id', 'timestamp', 'id'),
+        # Activity of a single user
+        Index('ix_audit_logs_user_id_timestamp', 'user_id', 'timestamp'),
+    )
     
     user_id = Column(
         UUID(as_uuid=True),
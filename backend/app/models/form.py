@@ -1,7 +1,7 @@
 """
 Form Models
 """
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, ForeignKey, JSON
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -32,6 +32,10 @@ class FormTemplate(Base):
 
 class FormSubmission(Base):
     __tablename__ = "form_submissions"
+    __table_args__ = (
+        # Submissions of a template, newest first
+        Index('ix_form_submissions_template_id_created_at', 'template_id', 'created_at'),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     template_id = Column(String, ForeignKey("form_templates.id"), nullable=False)
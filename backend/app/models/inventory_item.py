@@ -2,7 +2,7 @@
 Individual inventory item tracking model
 Each record represents a single physical item with its own RFID tag and expiration date
 """
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, TIMESTAMP
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, TIMESTAMP
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -13,6 +13,12 @@ class InventoryItem(Base):
     """Individual inventory item (e.g., one bandage in a bag of 5)"""
     
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        # Expiration lookups per item and location
+        Index('ix_inventory_items_item_id_location_id_expiration_date', 'item_id', 'location_id', 'expiration_date'),
+        # Expiring / expired windows across all items, optionally per location
+        Index('ix_inventory_items_expiration_date_location_id', 'expiration_date', 'location_id'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     item_id = Column(UUID(as_uuid=True), ForeignKey("items.id"), nullable=False, index=True)
@@ -0,0 +1,40 @@
+"""
+Run history of scheduled background jobs
+"""
+import enum
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, String, Text, JSON, Index, Enum as SQLEnum
+from app.models.base import Base
+
+
+class JobStatus(str, enum.Enum):
+    """Outcome of a job run"""
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobRun(Base):
+    """
+    One execution of a scheduled job
+
+    stats holds the counters the job reports (rows updated, notifications
+    created, ...); duration_ms is wall-clock time from start to finish.
+    """
+    __tablename__ = "job_runs"
+    __table_args__ = (
+        # Latest runs per job
+        Index('ix_job_runs_job_name_started_at', 'job_name', 'started_at'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(100), nullable=False)
+    status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.RUNNING)
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    stats = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<JobRun {self.job_name} {self.status}>"
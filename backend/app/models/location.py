@@ -1,11 +1,11 @@
 """
 Location models for multi-level inventory tracking
 """
-from sqlalchemy import Column, String, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import enum
-from app.models.base import BaseModel
+from app.models.base import Base, BaseModel
 
 
 class LocationType(str, enum.Enum):
@@ -57,3 +57,32 @@ class Location(BaseModel):
     
     def __repr__(self):
         return f"<Location {self.name} ({self.type})>"
+
+
+class LocationClosure(Base):
+    """
+    Ancestor/descendant pairs of the location hierarchy
+
+    One row per location and each of its ancestors, plus a depth-0 row
+    linking every location to itself, so "everything under X" is a single
+    indexed lookup on ancestor_id. Maintained by app.services.location_tree.
+    """
+    __tablename__ = "location_closure"
+    __table_args__ = (
+        Index("ix_location_closure_descendant_id_depth", "descendant_id", "depth"),
+    )
+
+    ancestor_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("locations.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    descendant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("locations.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    depth = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<LocationClosure {self.ancestor_id} -> {self.descendant_id} ({self.depth})>"
@@ -0,0 +1,55 @@
+"""
+Daily movement fact table and rollup watermarks for usage analytics
+"""
+from datetime import datetime
+from sqlalchemy import Column, Date, DateTime, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base
+
+
+class MovementDaily(Base):
+    """
+    Per-day, per-item, per-location movement totals
+
+    Built from inventory_movements by the movement rollup job:
+    used = from-only movements, received = to-only movements,
+    adjusted = ADJUSTMENT movements, movement_count = all movements.
+    Days are bucketed on the movement created_at.
+    """
+    __tablename__ = "movement_daily"
+    __table_args__ = (
+        UniqueConstraint('date', 'item_id', 'location_id', name='unique_movement_daily_bucket'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    date = Column(Date, nullable=False, index=True)
+    item_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("items.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    location_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("locations.id", ondelete="SET NULL"),
+        nullable=True
+    )
+    used = Column(Integer, nullable=False, default=0)
+    received = Column(Integer, nullable=False, default=0)
+    adjusted = Column(Integer, nullable=False, default=0)
+    movement_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<MovementDaily {self.date} {self.item_id}: used={self.used} received={self.received}>"
+
+
+class RollupWatermark(Base):
+    """High-water mark of source rows already folded into a rollup"""
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(100), primary_key=True)
+    last_processed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RollupWatermark {self.name}: {self.last_processed_at}>"
@@ -44,6 +44,8 @@ class Notification(BaseModel):
     related_entity_type = Column(String(100), nullable=True)
     related_entity_id = Column(UUID(as_uuid=True), nullable=True)
     read_at = Column(DateTime, nullable=True)
+    # Set by generated alerts so a condition is reported once, however often it is checked
+    dedup_key = Column(String(255), nullable=True, unique=True, index=True)
     
     def __repr__(self):
         return f"<Notification {self.type} - {self.severity}>"
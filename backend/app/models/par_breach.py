@@ -0,0 +1,48 @@
+"""
+Par breach state for (item, location) pairs currently below par or reorder
+"""
+from datetime import datetime
+from sqlalchemy import Column, Boolean, DateTime, Integer, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base
+
+
+class ParBreach(Base):
+    """
+    One row per (item, location) with a par level whose available quantity is below par or reorder
+
+    Maintained on every inventory and par level write (see
+    app.services.par_breach): a row is inserted when the pair drops below
+    its par or reorder quantity, kept current while it stays there and
+    deleted once stock is back at both. Pairs without a stock row count as
+    0 available. Below par is quantity_available < par_quantity;
+    below_reorder marks pairs under their reorder quantity.
+    """
+    __tablename__ = "par_breaches"
+    __table_args__ = (
+        UniqueConstraint('item_id', 'location_id', name='unique_item_location_par_breach'),
+        # Low stock per location
+        Index('ix_par_breaches_location_id', 'location_id'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("items.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    location_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("locations.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    quantity_available = Column(Integer, nullable=False)
+    par_quantity = Column(Integer, nullable=False)
+    reorder_quantity = Column(Integer, nullable=False)
+    below_reorder = Column(Boolean, nullable=False, default=False)
+    entered_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # When the pair fell below par or reorder
+    below_reorder_since = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ParBreach {self.item_id} @ {self.location_id}: {self.quantity_available}/{self.par_quantity}>"
@@ -1,7 +1,7 @@
 """
 Par Level model for managing stock levels at different locations
 """
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import BaseModel
@@ -12,6 +12,8 @@ class ParLevel(BaseModel):
     __tablename__ = "par_levels"
     __table_args__ = (
         UniqueConstraint('location_id', 'item_id', name='unique_location_item_par'),
+        # The unique constraint leads with location_id; per-item lookups need their own index
+        Index('ix_par_levels_item_id', 'item_id'),
     )
     
     location_id = Column(
@@ -1,7 +1,7 @@
 """
 RFID Tag and Inventory Movement models for tracking individual items
 """
-from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Numeric, Enum as SQLEnum
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Numeric, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import enum
@@ -48,6 +48,7 @@ class RFIDTag(BaseModel):
     lot_number = Column(String(100), nullable=True)
     received_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     cost = Column(Numeric(10, 2), nullable=True)
+    last_scanned_at = Column(DateTime, nullable=True)
     
     # Relationships
     item = relationship("Item", back_populates="rfid_tags")
@@ -65,6 +66,16 @@ class RFIDTag(BaseModel):
 class InventoryMovement(BaseModel):
     """Inventory Movement model for tracking item movements"""
     __tablename__ = "inventory_movements"
+    __table_args__ = (
+        # Keyset pagination of the movement log
+        Index('ix_inventory_movements_created_at_id', 'created_at', 'id'),
+        # Per-item and per-location movement history
+        Index('ix_inventory_movements_item_id_created_at', 'item_id', 'created_at'),
+        Index('ix_inventory_movements_from_location_id_created_at', 'from_location_id', 'created_at'),
+        Index('ix_inventory_movements_to_location_id_created_at', 'to_location_id', 'created_at'),
+        # Changed-since-watermark scans of the movement_daily rollup
+        Index('ix_inventory_movements_updated_at', 'updated_at'),
+    )
     
     # Either rfid_tag_id OR item_id should be set (for non-tagged items)
     rfid_tag_id = Column(
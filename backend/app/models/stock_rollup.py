@@ -0,0 +1,43 @@
+"""
+Item Stock Rollup model holding materialized per-item stock totals
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base
+
+# Scope used for the all-locations total of an item
+ALL_LOCATIONS = "all"
+
+
+class ItemStockRollup(Base):
+    """
+    Per-item stock totals maintained on every inventory write
+
+    One row per item for all locations (station_group == "all") plus one row
+    per station group ("station_1" = Station 1 cabinet + Truck 1).
+    """
+    __tablename__ = "item_stock_rollup"
+    __table_args__ = (
+        UniqueConstraint('item_id', 'station_group', name='unique_item_station_group_rollup'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("items.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    station_group = Column(String(50), nullable=False, default=ALL_LOCATIONS)
+    quantity_on_hand = Column(Integer, nullable=False, default=0)
+    quantity_allocated = Column(Integer, nullable=False, default=0)
+    quantity_available = Column(Integer, nullable=False, default=0)
+    total_par = Column(Integer, nullable=False, default=0)
+    total_reorder = Column(Integer, nullable=False, default=0)
+    par_location_count = Column(Integer, nullable=False, default=0)  # Locations with a par level
+    locations_below_reorder = Column(Integer, nullable=False, default=0)  # Par locations below reorder point
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ItemStockRollup {self.item_id} [{self.station_group}]: {self.quantity_on_hand}>"
@@ -0,0 +1,29 @@
+"""
+System configuration record shared by every worker
+"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base
+
+# Name of the row holding the SystemConfig document
+SYSTEM_CONFIG_NAME = "system"
+
+
+class SystemConfigRecord(Base):
+    """
+    Versioned configuration document
+
+    Every write bumps version; workers poll it to know when to reload their
+    in-memory snapshot.
+    """
+    __tablename__ = "system_config"
+
+    name = Column(String(100), primary_key=True)
+    data = Column(JSON, nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+    updated_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SystemConfigRecord {self.name} v{self.version}>"
@@ -21,6 +21,7 @@ class CSVImportPreviewResponse(BaseModel):
     new_items: int
     conflicts: List[CSVImportConflict]
     errors: List[Dict[str, Any]]  # Validation errors
+    cache_key: Optional[str] = None  # Pass to /execute to import the staged upload
 
 
 class CSVImportRequest(BaseModel):
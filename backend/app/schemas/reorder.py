@@ -0,0 +1,24 @@
+"""
+Reorder Suggestion Schemas
+"""
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+
+
+class ReorderSuggestion(BaseModel):
+    """Suggested reorder for an item below its reorder point"""
+    item_id: UUID
+    item_code: str
+    item_name: str
+    category_name: Optional[str] = None
+    current_total_stock: int
+    total_par_level: int
+    total_reorder_level: int
+    shortage: int
+    suggested_order_qty: int
+    preferred_vendor_id: Optional[UUID] = None
+    preferred_vendor_name: Optional[str] = None
+    estimated_cost: Optional[float] = None
+    locations_below_par: int
+    urgency: str  # "critical", "high", "medium", "low"
@@ -0,0 +1,47 @@
+"""
+Scanner Schemas (Zebra TC22/27 RFID and barcode reads)
+"""
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+
+from app.models.rfid import TagStatus
+
+
+class RFIDTagResponse(BaseModel):
+    id: UUID
+    tag_id: str
+    item_id: UUID
+    current_location_id: Optional[UUID]
+    status: TagStatus
+    lot_number: Optional[str]
+    serial_number: Optional[str]
+    expiration_date: Optional[datetime]
+    assigned_date: datetime
+    last_scanned_at: Optional[datetime]
+
+    # Enriched data
+    item_name: str
+    item_code: str
+    location_name: Optional[str]
+    unit_of_measure: str
+
+    class Config:
+        from_attributes = True
+
+
+class ScanRequest(BaseModel):
+    """Request from scanner device (Zebra TC22/27)"""
+    tag_id: str  # RFID/barcode value scanned
+    scanner_location_id: Optional[UUID] = None  # Current scanner location
+    scan_type: str = "barcode"  # "rfid" or "barcode"
+
+
+class ScanResponse(BaseModel):
+    """Response to scanner with item information"""
+    success: bool
+    tag_info: Optional[RFIDTagResponse] = None
+    item_info: Optional[dict] = None
+    message: str
+    suggested_action: Optional[str] = None
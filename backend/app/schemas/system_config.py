@@ -0,0 +1,46 @@
+"""
+System Configuration Schemas
+"""
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class AutoOrderConfig(BaseModel):
+    enabled: bool = Field(default=True, description="Enable automatic order creation")
+    trigger_on_scan: bool = Field(default=True, description="Trigger orders when RFID scan detects low stock")
+    trigger_on_manual_check: bool = Field(default=True, description="Trigger orders on manual inventory checks")
+    min_order_quantity: int = Field(default=1, ge=1, description="Minimum quantity to order")
+    max_order_quantity: int = Field(default=1000, ge=1, description="Maximum quantity per order")
+    order_up_to_par: bool = Field(default=True, description="Order up to par level instead of reorder level")
+    require_approval: bool = Field(default=False, description="Require manual approval before ordering")
+
+
+class StationRequestConfig(BaseModel):
+    enabled: bool = Field(default=True, description="Allow stations to request items")
+    max_request_quantity: int = Field(default=100, ge=1, description="Maximum quantity per station request")
+    require_approval: bool = Field(default=False, description="Require approval for station requests")
+    auto_create_transfer: bool = Field(default=True, description="Automatically create transfer when approved")
+    notification_emails: list[str] = Field(default_factory=list, description="Email addresses for notifications")
+
+
+class StockAlertConfig(BaseModel):
+    enabled: bool = Field(default=True, description="Enable stock level alerts")
+    check_on_scan: bool = Field(default=True, description="Check stock levels on RFID scan")
+    check_on_transfer: bool = Field(default=True, description="Check stock levels on transfer")
+    alert_below_par: bool = Field(default=True, description="Alert when below par level")
+    alert_below_reorder: bool = Field(default=True, description="Alert when below reorder level")
+    alert_critical_percent: int = Field(default=25, ge=0, le=100, description="Alert when stock is below this % of par")
+
+
+class TransferRestrictionsConfig(BaseModel):
+    require_rfid_scan: bool = Field(default=False, description="Require RFID scan for transfers")
+    max_transfer_quantity: int = Field(default=1000, ge=1, description="Maximum quantity per transfer")
+    allow_negative_stock: bool = Field(default=False, description="Allow transfers that result in negative stock")
+    require_notes_above_quantity: Optional[int] = Field(default=50, description="Require notes for large transfers")
+
+
+class SystemConfig(BaseModel):
+    auto_order: AutoOrderConfig = Field(default_factory=AutoOrderConfig)
+    station_requests: StationRequestConfig = Field(default_factory=StationRequestConfig)
+    stock_alerts: StockAlertConfig = Field(default_factory=StockAlertConfig)
+    transfer_restrictions: TransferRestrictionsConfig = Field(default_factory=TransferRestrictionsConfig)
@@ -0,0 +1,118 @@
+"""
+Publish report cache invalidation tags from inventory writes
+
+Session hooks record the items, locations and categories touched by each
+flush (stock, par levels, movements, tagged units, RFID tags, purchase
+order lines, items and locations) and evict matching report cache entries
+once the transaction commits. Tag writes that only stamp last_scanned_at
+are ignored, since no report reads it. Writes from the inventory, rfid, orders and
+csv_import endpoints all go through these models.
+"""
+from typing import Any, Iterable, Set
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.cache import invalidate_report_cache
+from app.models.item import Item, Category
+from app.models.location import Location
+from app.models.inventory import InventoryCurrent
+from app.models.inventory_item import InventoryItem
+from app.models.par_level import ParLevel
+from app.models.rfid import RFIDTag, InventoryMovement
+from app.models.order import PurchaseOrderItem
+
+_PENDING_KEY = "report_cache_pending_tags"
+
+TRACKED_MODELS = (
+    Item,
+    Category,
+    Location,
+    InventoryCurrent,
+    InventoryItem,
+    ParLevel,
+    RFIDTag,
+    InventoryMovement,
+    PurchaseOrderItem,
+)
+
+LOCATION_ATTRIBUTES = ("location_id", "from_location_id", "to_location_id", "current_location_id")
+
+# RFIDTag columns written by every scan; no report reads them
+SCAN_STAMP_ATTRIBUTES = {"last_scanned_at", "updated_at"}
+
+
+def _pending(session: Session) -> dict:
+    return session.info.setdefault(_PENDING_KEY, {"items": set(), "locations": set(), "categories": set()})
+
+
+def mark_changed(session: Session, item_ids: Iterable[Any] = (), location_ids: Iterable[Any] = ()):
+    """Flag items and locations written through bulk statements the ORM cannot see"""
+    pending = _pending(session)
+    pending["items"].update(item_ids)
+    pending["locations"].update(location_ids)
+
+
+def _only_scan_stamp(tag: RFIDTag) -> bool:
+    changed = {attr.key for attr in inspect(tag).attrs if attr.history.has_changes()}
+    return changed <= SCAN_STAMP_ATTRIBUTES
+
+
+def _after_flush(session: Session, flush_context):
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, TRACKED_MODELS):
+            continue
+        if isinstance(obj, RFIDTag) and obj in session.dirty and _only_scan_stamp(obj):
+            continue
+        if pending is None:
+            pending = _pending(session)
+
+        if isinstance(obj, Item):
+            pending["items"].add(obj.id)
+            pending["categories"].add(obj.category_id)
+        elif isinstance(obj, Category):
+            pending["categories"].add(obj.id)
+        elif isinstance(obj, Location):
+            pending["locations"].add(obj.id)
+        else:
+            pending["items"].add(getattr(obj, "item_id", None))
+            for attribute in LOCATION_ATTRIBUTES:
+                pending["locations"].add(getattr(obj, attribute, None))
+
+
+def _before_commit(session: Session):
+    session.flush()
+    pending = session.info.get(_PENDING_KEY)
+    if not pending or not pending["items"]:
+        return
+
+    # Category-filtered reports change when any of their items' stock does
+    item_ids: Set[UUID] = {
+        item_id if isinstance(item_id, UUID) else UUID(str(item_id))
+        for item_id in pending["items"] if item_id
+    }
+    if item_ids:
+        rows = session.query(Item.category_id).filter(Item.id.in_(list(item_ids))).distinct().all()
+        pending["categories"].update(category_id for (category_id,) in rows)
+
+
+def _after_commit(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        invalidate_report_cache(pending["items"], pending["locations"], pending["categories"])
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_session_hooks(session_factory: sessionmaker):
+    """Publish report cache invalidations for every session created by session_factory"""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "before_commit", _before_commit)
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
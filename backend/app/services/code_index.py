@@ -0,0 +1,377 @@
+"""
+In-memory resolution index for scanned codes
+
+Maps every code a scanner can read (RFID tag ids, individually tracked
+unit tags, item codes and manufacturer part numbers) to its item and
+location, and keeps item and location summaries alongside, so scanner
+endpoints resolve codes without a query. The index is loaded at startup,
+patched from session hooks after each commit (bumping a version counter)
+and reloaded periodically to pick up writes made by other workers or by
+bulk statements. A miss falls back to one batched lookup of the missing
+codes. Callers that act on a location pass their session so its existence
+is checked against the database rather than trusted from the index.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.item import Item
+from app.models.location import Location
+from app.models.rfid import RFIDTag, TagStatus
+from app.models.inventory_item import InventoryItem
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "code_index_pending"
+
+# Resolution order when the same value is registered under several kinds
+RFID_TAG = "rfid_tag"
+UNIT_TAG = "inventory_item"
+ITEM_CODE = "item_code"
+PART_NUMBER = "part_number"
+CODE_KINDS = (RFID_TAG, UNIT_TAG, ITEM_CODE, PART_NUMBER)
+
+RETIRED_STATUSES = (TagStatus.DEPLETED, TagStatus.DISPOSED)
+
+
+class ItemSummary(NamedTuple):
+    id: UUID
+    item_code: str
+    name: str
+    description: Optional[str]
+    unit_of_measure: str
+    is_controlled_substance: bool
+
+
+class CodeMatch(NamedTuple):
+    kind: str
+    code: str
+    item_id: UUID
+    location_id: Optional[UUID] = None
+    record_id: Any = None  # RFIDTag.id or InventoryItem.id
+    status: Optional[TagStatus] = None
+
+
+def _owner(match: CodeMatch):
+    """Tag codes belong to their tag row, item codes to the item"""
+    return match.record_id if match.record_id is not None else match.item_id
+
+
+def _item_summary(item: Item) -> ItemSummary:
+    return ItemSummary(
+        item.id, item.item_code, item.name, item.description,
+        item.unit_of_measure, bool(item.is_controlled_substance)
+    )
+
+
+def _matches_for(obj) -> List[CodeMatch]:
+    """Codes registered by one ORM object"""
+    if isinstance(obj, RFIDTag):
+        return [CodeMatch(RFID_TAG, obj.tag_id, obj.item_id, obj.current_location_id, obj.id, obj.status)]
+    if isinstance(obj, InventoryItem):
+        return [CodeMatch(UNIT_TAG, obj.rfid_tag, obj.item_id, obj.location_id, obj.id)]
+    if isinstance(obj, Item):
+        matches = [CodeMatch(ITEM_CODE, obj.item_code, obj.id)]
+        if obj.manufacturer_part_number:
+            matches.append(CodeMatch(PART_NUMBER, obj.manufacturer_part_number, obj.id))
+        return matches
+    return []
+
+
+class CodeResolutionIndex:
+    """Code -> item/location lookups plus item and location summaries"""
+
+    def __init__(self):
+        self._codes: Dict[str, Dict[str, CodeMatch]] = {kind: {} for kind in CODE_KINDS}
+        self._keys: Dict[Tuple[str, Any], List[Tuple[str, str]]] = {}  # (kind, owner) -> (kind, code) registered
+        self.items: Dict[UUID, ItemSummary] = {}
+        self.location_names: Dict[UUID, str] = {}
+        self.location_ids_by_name: Dict[str, UUID] = {}
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+        self.stale = False
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self, db: Session):
+        """Rebuild the whole index from the database"""
+        codes: Dict[str, Dict[str, CodeMatch]] = {kind: {} for kind in CODE_KINDS}
+        keys: Dict[Tuple[str, Any], List[Tuple[str, str]]] = {}
+
+        def register(match: CodeMatch, kind: str):
+            codes[match.kind][match.code] = match
+            keys.setdefault((kind, _owner(match)), []).append((match.kind, match.code))
+
+        items = {}
+        for row in db.query(
+            Item.id, Item.item_code, Item.name, Item.description, Item.unit_of_measure,
+            Item.is_controlled_substance, Item.manufacturer_part_number
+        ).all():
+            items[row.id] = ItemSummary(*row[:5], bool(row.is_controlled_substance))
+            register(CodeMatch(ITEM_CODE, row.item_code, row.id), ITEM_CODE)
+            if row.manufacturer_part_number:
+                register(CodeMatch(PART_NUMBER, row.manufacturer_part_number, row.id), ITEM_CODE)
+
+        for row in db.query(
+            RFIDTag.id, RFIDTag.tag_id, RFIDTag.item_id, RFIDTag.current_location_id, RFIDTag.status
+        ).all():
+            register(CodeMatch(RFID_TAG, row.tag_id, row.item_id, row.current_location_id, row.id, row.status), RFID_TAG)
+
+        for row in db.query(
+            InventoryItem.id, InventoryItem.rfid_tag, InventoryItem.item_id, InventoryItem.location_id
+        ).all():
+            register(CodeMatch(UNIT_TAG, row.rfid_tag, row.item_id, row.location_id, row.id), UNIT_TAG)
+
+        locations = db.query(Location.id, Location.name).all()
+
+        with self._lock:
+            self._codes = codes
+            self._keys = keys
+            self.items = items
+            self.location_names = {location.id: location.name for location in locations}
+            self.location_ids_by_name = {location.name: location.id for location in locations}
+            self.version += 1
+            self.loaded_at = time.monotonic()
+            self.stale = False
+
+        logger.info(
+            "Code index loaded: %d items, %d codes",
+            len(items), sum(len(by_code) for by_code in codes.values())
+        )
+
+    def ensure_current(self, db: Session):
+        """Load on first use and reload once the refresh interval has passed"""
+        expired = (
+            self.loaded_at is None
+            or self.stale
+            or time.monotonic() - self.loaded_at > settings.CODE_INDEX_REFRESH_SECONDS
+        )
+        if expired:
+            self.load(db)
+
+    def mark_stale(self):
+        """Reload on next use, after writes that bypass the session hooks"""
+        self.stale = True
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def apply(self, upserts: Iterable[Tuple[str, Any, List[CodeMatch]]] = (),
+              deletes: Iterable[Tuple[str, Any]] = (),
+              items: Iterable[ItemSummary] = (), deleted_items: Iterable[UUID] = (),
+              locations: Iterable[Tuple[UUID, str]] = (), deleted_locations: Iterable[UUID] = ()):
+        """Patch the index with committed changes and bump the version"""
+        with self._lock:
+            for kind, owner in deletes:
+                self._unregister(kind, owner)
+            for kind, owner, matches in upserts:
+                self._unregister(kind, owner)
+                for match in matches:
+                    self._codes[match.kind][match.code] = match
+                    self._keys.setdefault((kind, owner), []).append((match.kind, match.code))
+            for summary in items:
+                self.items[summary.id] = summary
+            for item_id in deleted_items:
+                self.items.pop(item_id, None)
+            for location_id, name in locations:
+                old_name = self.location_names.get(location_id)
+                if old_name is not None and self.location_ids_by_name.get(old_name) == location_id:
+                    del self.location_ids_by_name[old_name]
+                self.location_names[location_id] = name
+                self.location_ids_by_name[name] = location_id
+            for location_id in deleted_locations:
+                name = self.location_names.pop(location_id, None)
+                if name is not None and self.location_ids_by_name.get(name) == location_id:
+                    del self.location_ids_by_name[name]
+            self.version += 1
+
+    def _unregister(self, kind: str, owner):
+        for code_kind, code in self._keys.pop((kind, owner), []):
+            match = self._codes[code_kind].get(code)
+            if match is not None and _owner(match) == owner:
+                del self._codes[code_kind][code]
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def resolve(self, code: str) -> Optional[CodeMatch]:
+        """Best match for a scanned code: RFID tag, unit tag, item code, part number"""
+        for kind in CODE_KINDS:
+            match = self._codes[kind].get(code)
+            if match is not None:
+                return match
+        return None
+
+    def resolve_many(self, codes: Iterable[str], db: Optional[Session] = None) -> Dict[str, Optional[CodeMatch]]:
+        """
+        Resolve several codes at once
+
+        With a session, codes missing from the index are looked up in one
+        batched pass and added, so codes created by another worker since
+        the last reload still resolve.
+        """
+        codes = list(dict.fromkeys(codes))
+        resolved = {code: self.resolve(code) for code in codes}
+        misses = [code for code, match in resolved.items() if match is None]
+        if misses and db is not None:
+            self._load_codes(db, misses)
+            resolved.update({code: self.resolve(code) for code in misses})
+        return resolved
+
+    def _load_codes(self, db: Session, codes: List[str]):
+        upserts = []
+        items = []
+        for item in db.query(Item).filter(
+            (Item.item_code.in_(codes)) | (Item.manufacturer_part_number.in_(codes))
+        ).all():
+            upserts.append((ITEM_CODE, item.id, _matches_for(item)))
+            items.append(_item_summary(item))
+        for model, column in ((RFIDTag, RFIDTag.tag_id), (InventoryItem, InventoryItem.rfid_tag)):
+            rows = db.query(model).filter(column.in_(codes)).all()
+            for obj in rows:
+                matches = _matches_for(obj)
+                upserts.append((matches[0].kind, obj.id, matches))
+        if not upserts:
+            return
+
+        # Summaries for items only referenced by the newly found tags
+        known = {summary.id for summary in items} | set(self.items)
+        missing_items = {match.item_id for _, _, matches in upserts for match in matches} - known
+        if missing_items:
+            items.extend(_item_summary(item) for item in db.query(Item).filter(Item.id.in_(list(missing_items))).all())
+        self.apply(upserts=upserts, items=items)
+
+    def item(self, item_id: UUID) -> Optional[ItemSummary]:
+        return self.items.get(item_id)
+
+    def location_name(self, location_id: Optional[UUID], db: Optional[Session] = None) -> Optional[str]:
+        """
+        Name of a location, or None if it does not exist
+
+        With a session the location is confirmed against the database and
+        the index patched to match, so a location created or deleted by
+        another worker since the last reload is seen at once.
+        """
+        if not location_id:
+            return None
+        if db is None:
+            return self.location_names.get(location_id)
+        row = db.query(Location.id, Location.name).filter(Location.id == location_id).first()
+        self._sync_location(location_id, row)
+        return row.name if row else None
+
+    def location_id(self, name: str, db: Optional[Session] = None) -> Optional[UUID]:
+        """Id of the location with this name; with a session, confirmed against the database"""
+        if db is None:
+            return self.location_ids_by_name.get(name)
+        row = db.query(Location.id, Location.name).filter(Location.name == name).first()
+        cached = self.location_ids_by_name.get(name)
+        if row is None and cached is not None:
+            self.apply(deleted_locations=[cached])
+        elif row is not None:
+            self._sync_location(row.id, row)
+        return row.id if row else None
+
+    def _sync_location(self, location_id: UUID, row):
+        if row is None:
+            if location_id in self.location_names:
+                self.apply(deleted_locations=[location_id])
+        elif self.location_names.get(location_id) != row.name:
+            self.apply(locations=[(location_id, row.name)])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "items": len(self.items),
+            "locations": len(self.location_names),
+            "codes": {kind: len(self._codes[kind]) for kind in CODE_KINDS},
+        }
+
+
+code_index = CodeResolutionIndex()
+
+
+def get_code_index(db: Session) -> CodeResolutionIndex:
+    """Shared index, loaded on first use"""
+    code_index.ensure_current(db)
+    return code_index
+
+
+# ----------------------------------------------------------------------
+# Session hooks
+# ----------------------------------------------------------------------
+
+def _pending(session: Session) -> dict:
+    return session.info.setdefault(_PENDING_KEY, {
+        "upserts": {}, "deletes": set(), "items": {}, "deleted_items": set(),
+        "locations": {}, "deleted_locations": set(),
+    })
+
+
+def _after_flush(session: Session, flush_context):
+    # Snapshot values now; attributes are expired once the commit finishes
+    pending = None
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, (Item, RFIDTag, InventoryItem, Location)):
+            continue
+        if pending is None:
+            pending = _pending(session)
+        if isinstance(obj, Location):
+            pending["locations"][obj.id] = obj.name
+            continue
+        matches = _matches_for(obj)
+        kind = ITEM_CODE if isinstance(obj, Item) else matches[0].kind
+        pending["upserts"][(kind, obj.id)] = matches
+        if isinstance(obj, Item):
+            pending["items"][obj.id] = _item_summary(obj)
+
+    for obj in session.deleted:
+        if not isinstance(obj, (Item, RFIDTag, InventoryItem, Location)):
+            continue
+        if pending is None:
+            pending = _pending(session)
+        if isinstance(obj, Location):
+            pending["deleted_locations"].add(obj.id)
+        elif isinstance(obj, Item):
+            pending["deletes"].add((ITEM_CODE, obj.id))
+            pending["deleted_items"].add(obj.id)
+        else:
+            pending["deletes"].add((RFID_TAG if isinstance(obj, RFIDTag) else UNIT_TAG, obj.id))
+
+
+def _after_commit(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or code_index.loaded_at is None:
+        return
+    code_index.apply(
+        upserts=[(kind, owner, matches) for (kind, owner), matches in pending["upserts"].items()],
+        deletes=pending["deletes"],
+        items=pending["items"].values(),
+        deleted_items=pending["deleted_items"],
+        locations=pending["locations"].items(),
+        deleted_locations=pending["deleted_locations"],
+    )
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_session_hooks(session_factory: sessionmaker):
+    """Patch the code index after every commit of a session from session_factory"""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
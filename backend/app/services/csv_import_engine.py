@@ -0,0 +1,358 @@
+"""
+Set-based execution of CSV item imports
+
+Rows are processed in chunks. For each chunk the existing items, and the
+stock and par rows of the (item, location) pairs it touches, are fetched
+with a few IN queries; creates and updates are then written with bulk
+inserts/updates inside a savepoint. If a chunk fails it is rolled back and
+replayed one row per savepoint, so a bad row is reported on its own and
+never undoes rows already imported.
+"""
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.item import Item
+from app.models.location import Location
+from app.models.inventory import InventoryCurrent
+from app.models.par_level import ParLevel
+from app.schemas.csv_import import CSVImportResult
+from app.services import stock_rollup, cache_invalidation, par_breach
+from app.services.code_index import code_index
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+
+TEXT_FIELDS = (
+    "description", "manufacturer", "manufacturer_part_number", "supplier_name", "supplier_contact",
+    "supplier_email", "supplier_phone", "supplier_website", "supplier_account_number",
+    "order_unit", "preferred_vendor", "alternate_vendor",
+)
+DECIMAL_FIELDS = ("cost_per_unit", "minimum_order_quantity", "lead_time_days")
+
+
+def parse_boolean(value: str) -> bool:
+    """Parse boolean values from CSV"""
+    if not value:
+        return False
+    value = str(value).strip().upper()
+    return value in ['TRUE', '1', 'YES', 'Y']
+
+
+def parse_decimal(value: str) -> float:
+    """Parse decimal values from CSV"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _text(row: Dict[str, str], name: str) -> str:
+    return (row.get(name) or '').strip()
+
+
+def _int(row: Dict[str, str], name: str) -> Optional[int]:
+    """Integer column value; blank and unparsable values are ignored"""
+    value = _text(row, name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def item_values(row: Dict[str, str]) -> Dict[str, Any]:
+    """Item column values for a CSV row"""
+    values = {
+        "name": _text(row, 'name'),
+        "category_id": _text(row, 'category_id') or None,
+        "unit_of_measure": _text(row, 'unit_of_measure'),
+        "requires_expiration_tracking": parse_boolean(row.get('requires_expiration_tracking', '')),
+        "is_controlled_substance": parse_boolean(row.get('is_controlled_substance', '')),
+        "is_active": parse_boolean(row.get('is_active', 'TRUE')),
+    }
+    for name in TEXT_FIELDS:
+        values[name] = _text(row, name) or None
+    for name in DECIMAL_FIELDS:
+        values[name] = parse_decimal(row.get(name, ''))
+    return values
+
+
+def validate_row(row: Dict[str, str]) -> List[Tuple[str, str]]:
+    """(field, error) pairs for missing required values"""
+    errors = []
+    if not _text(row, 'item_code'):
+        errors.append(("item_code", "Item code is required"))
+    if not _text(row, 'name'):
+        errors.append(("name", "Item name is required"))
+    if not _text(row, 'unit_of_measure'):
+        errors.append(("unit_of_measure", "Unit of measure is required"))
+    return errors
+
+
+@dataclass
+class _ChunkPlan:
+    """Bulk writes for one chunk plus the counters they produce"""
+    item_inserts: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # by item_code
+    item_updates: Dict[UUID, Dict[str, Any]] = field(default_factory=dict)
+    inventory_inserts: Dict[Tuple[UUID, UUID], Dict[str, Any]] = field(default_factory=dict)
+    inventory_updates: Dict[Any, Dict[str, Any]] = field(default_factory=dict)
+    par_inserts: Dict[Tuple[UUID, UUID], Dict[str, Any]] = field(default_factory=dict)
+    par_updates: Dict[Any, Dict[str, Any]] = field(default_factory=dict)
+    stock_pairs: Set[Tuple[UUID, UUID]] = field(default_factory=set)  # (item, location) with stock or par written
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class CSVImportEngine:
+    """
+    Import item rows with the skip/replace conflict rules of /csv-import/execute
+
+    Item codes created earlier in the same import count as existing items,
+    so a repeated code follows the conflict rules like any other.
+    """
+
+    def __init__(self, db: Session, conflict_resolution: str,
+                 item_codes_to_replace: Optional[Iterable[str]] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        self.db = db
+        self.conflict_resolution = conflict_resolution
+        self.item_codes_to_replace = set(item_codes_to_replace) if item_codes_to_replace else None
+        self.chunk_size = chunk_size
+        self.location_ids: Dict[str, UUID] = {}
+        self.created_codes: Dict[str, UUID] = {}
+        self.touched_items: Set[UUID] = set()
+        self.touched_pairs: Set[Tuple[UUID, UUID]] = set()
+        self.total_rows = 0
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def _should_replace(self, item_code: str) -> bool:
+        if self.conflict_resolution == "skip":
+            # Skip unless specifically marked for replacement
+            return bool(self.item_codes_to_replace) and item_code in self.item_codes_to_replace
+        if self.conflict_resolution == "replace":
+            # Replace unless specifically excluded
+            return not self.item_codes_to_replace or item_code in self.item_codes_to_replace
+        return False
+
+    def _plan(self, rows: List[Tuple[int, Dict[str, str]]]) -> _ChunkPlan:
+        plan = _ChunkPlan()
+        now = datetime.utcnow()
+
+        codes = {_text(row, 'item_code') for _, row in rows} - {''}
+        existing: Dict[str, UUID] = {
+            code: self.created_codes[code] for code in codes if code in self.created_codes
+        }
+        if codes:
+            existing.update(self.db.query(Item.item_code, Item.id).filter(Item.item_code.in_(list(codes))).all())
+
+        # (row, item_id, location_id) for rows carrying location data
+        location_rows = []
+        for row_number, row in rows:
+            item_code = _text(row, 'item_code')
+            problems = validate_row(row)
+            if problems:
+                plan.errors.extend({"row": row_number, "field": name, "error": error} for name, error in problems)
+                plan.skipped += 1
+                continue
+
+            values = item_values(row)
+            item_id = existing.get(item_code)
+            if item_id is not None:
+                if not self._should_replace(item_code):
+                    plan.skipped += 1
+                    continue
+                if item_code in plan.item_inserts:
+                    plan.item_inserts[item_code].update(values)
+                else:
+                    plan.item_updates[item_id] = {"id": item_id, **values, "updated_at": now}
+                plan.updated += 1
+            else:
+                item_id = uuid.uuid4()
+                plan.item_inserts[item_code] = {
+                    "id": item_id, "item_code": item_code, **values, "created_at": now, "updated_at": now
+                }
+                existing[item_code] = item_id
+                plan.created += 1
+
+            location_id = self.location_ids.get(_text(row, 'location_name'))
+            if location_id is not None:
+                location_rows.append((row, item_id, location_id))
+
+        if location_rows:
+            self._plan_location_data(plan, location_rows, now)
+        return plan
+
+    def _plan_location_data(self, plan: _ChunkPlan, location_rows, now: datetime):
+        """Stock and par level upserts keyed by (item, location)"""
+        item_ids = list({item_id for _, item_id, _ in location_rows})
+        location_ids = list({location_id for _, _, location_id in location_rows})
+
+        # Both tables are unique on (location_id, item_id), so filter on both columns
+        inventory_ids = {
+            (item_id, location_id): row_id
+            for row_id, item_id, location_id in self.db.query(
+                InventoryCurrent.id, InventoryCurrent.item_id, InventoryCurrent.location_id
+            ).filter(
+                InventoryCurrent.location_id.in_(location_ids),
+                InventoryCurrent.item_id.in_(item_ids)
+            ).all()
+        }
+        par_ids = {
+            (item_id, location_id): row_id
+            for row_id, item_id, location_id in self.db.query(
+                ParLevel.id, ParLevel.item_id, ParLevel.location_id
+            ).filter(
+                ParLevel.location_id.in_(location_ids),
+                ParLevel.item_id.in_(item_ids)
+            ).all()
+        }
+
+        for row, item_id, location_id in location_rows:
+            key = (item_id, location_id)
+            plan.stock_pairs.add(key)
+
+            # Update current stock if provided
+            quantity = _int(row, 'current_stock')
+            if quantity is not None:
+                if key in inventory_ids:
+                    plan.inventory_updates[inventory_ids[key]] = {
+                        "id": inventory_ids[key], "quantity_on_hand": quantity, "updated_at": now
+                    }
+                else:
+                    plan.inventory_inserts[key] = {
+                        "id": uuid.uuid4(), "item_id": item_id, "location_id": location_id,
+                        "quantity_on_hand": quantity, "quantity_allocated": 0,
+                        "created_at": now, "updated_at": now,
+                    }
+
+            # Update par levels if provided
+            par_qty = _int(row, 'par_level')
+            reorder_qty = _int(row, 'reorder_level')
+            max_qty = _int(row, 'max_quantity')
+            if par_qty is None and reorder_qty is None:
+                continue
+            if key in par_ids:
+                values = {"id": par_ids[key], "updated_at": now}
+                if par_qty is not None:
+                    values["par_quantity"] = par_qty
+                if reorder_qty is not None:
+                    values["reorder_quantity"] = reorder_qty
+                if max_qty is not None:
+                    values["max_quantity"] = max_qty
+                plan.par_updates.setdefault(par_ids[key], {}).update(values)
+            else:
+                plan.par_inserts[key] = {
+                    "id": uuid.uuid4(), "item_id": item_id, "location_id": location_id,
+                    "par_quantity": par_qty or 0, "reorder_quantity": reorder_qty or 0,
+                    "max_quantity": max_qty, "created_at": now, "updated_at": now,
+                }
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _write(self, plan: _ChunkPlan):
+        db = self.db
+        if plan.item_inserts:
+            db.bulk_insert_mappings(Item, list(plan.item_inserts.values()))
+        if plan.item_updates:
+            db.bulk_update_mappings(Item, list(plan.item_updates.values()))
+        if plan.inventory_inserts:
+            db.bulk_insert_mappings(InventoryCurrent, list(plan.inventory_inserts.values()))
+        if plan.inventory_updates:
+            db.bulk_update_mappings(InventoryCurrent, list(plan.inventory_updates.values()))
+        if plan.par_inserts:
+            db.bulk_insert_mappings(ParLevel, list(plan.par_inserts.values()))
+        if plan.par_updates:
+            db.bulk_update_mappings(ParLevel, list(plan.par_updates.values()))
+
+    def _accept(self, plan: _ChunkPlan):
+        """Fold a written chunk into the totals"""
+        self.created += plan.created
+        self.updated += plan.updated
+        self.skipped += plan.skipped
+        self.errors.extend(plan.errors)
+        self.created_codes.update((code, values["id"]) for code, values in plan.item_inserts.items())
+        self.touched_items.update(plan.item_inserts[code]["id"] for code in plan.item_inserts)
+        self.touched_items.update(plan.item_updates)
+        self.touched_items.update(item_id for item_id, _ in plan.stock_pairs)
+        self.touched_pairs.update(plan.stock_pairs)
+
+    def _run_chunk(self, rows: List[Tuple[int, Dict[str, str]]]):
+        savepoint = self.db.begin_nested()
+        try:
+            plan = self._plan(rows)
+            self._write(plan)
+            savepoint.commit()
+            self._accept(plan)
+            return
+        except SQLAlchemyError as e:
+            savepoint.rollback()
+            if len(rows) == 1:
+                self.errors.append({"row": rows[0][0], "error": str(e.orig if hasattr(e, "orig") else e)})
+                self.skipped += 1
+                return
+            logger.info("CSV import chunk at row %d failed, replaying row by row: %s", rows[0][0], e)
+
+        for row in rows:
+            self._run_chunk([row])
+
+    def run(self, rows: Iterable[Dict[str, str]]) -> CSVImportResult:
+        """Import every row and commit"""
+        self.location_ids = dict(self.db.query(Location.name, Location.id).all())
+
+        chunk: List[Tuple[int, Dict[str, str]]] = []
+        for row_number, row in enumerate(rows, start=2):  # Row 1 is the header
+            self.total_rows += 1
+            chunk.append((row_number, row))
+            if len(chunk) >= self.chunk_size:
+                self._run_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._run_chunk(chunk)
+
+        # Bulk writes bypass the ORM flush hooks
+        if self.touched_items:
+            stock_rollup.mark_items_changed(self.db, self.touched_items)
+            # Every location with stock or par written, inserted or updated
+            touched_locations = {location_id for _, location_id in self.touched_pairs}
+            cache_invalidation.mark_changed(self.db, self.touched_items, touched_locations)
+        if self.touched_pairs:
+            par_breach.mark_stock_changed(self.db, self.touched_pairs)
+        self.db.commit()
+        if self.created or self.updated:
+            code_index.mark_stale()
+
+        return CSVImportResult(
+            total_rows=self.total_rows,
+            created=self.created,
+            updated=self.updated,
+            skipped=self.skipped,
+            errors=self.errors
+        )
+
+
+def execute_import(db: Session, rows: Iterable[Dict[str, str]], conflict_resolution: str,
+                   item_codes_to_replace: Optional[Iterable[str]] = None) -> CSVImportResult:
+    """Import CSV item rows in chunks and commit"""
+    return CSVImportEngine(db, conflict_resolution, item_codes_to_replace).run(rows)
@@ -0,0 +1,110 @@
+"""
+Disk-backed staging of CSV uploads between /csv-import/preview and /execute
+
+Uploads are streamed to a file named after their cache key in the staging
+directory, so memory stays flat for large files, staged uploads survive a
+restart and every worker sharing the directory can execute them. Rows are
+read back lazily. Staged files expire after CSV_STAGING_TTL_SECONDS.
+"""
+import csv
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+ROW_CHUNK_SIZE = 1000
+
+_CACHE_KEY = re.compile(r"^[\w.-]+$")
+
+
+def staging_dir() -> Path:
+    path = Path(settings.CSV_STAGING_DIR or os.path.join(tempfile.gettempdir(), "ems_csv_staging"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def new_cache_key(user_id: Any) -> str:
+    return f"{user_id}_{datetime.utcnow().timestamp()}"
+
+
+def staged_path(cache_key: str) -> Optional[Path]:
+    """Path of a staged upload, or None if the key is malformed, unknown or expired"""
+    if not _CACHE_KEY.match(cache_key):
+        return None
+    path = staging_dir() / f"{cache_key}.csv"
+    try:
+        if time.time() - path.stat().st_mtime > settings.CSV_STAGING_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def stage_upload(upload: UploadFile, cache_key: str) -> Path:
+    """
+    Stream an upload to the staging directory in fixed-size chunks
+
+    Reads the spooled upload file directly, so call it from a sync endpoint
+    running in the threadpool.
+    """
+    directory = staging_dir()
+    path = directory / f"{cache_key}.csv"
+    partial = directory / f"{cache_key}.csv.part"
+    upload.file.seek(0)
+    with open(partial, "wb") as out:
+        shutil.copyfileobj(upload.file, out, UPLOAD_CHUNK_BYTES)
+    os.replace(partial, path)
+    return path
+
+
+def iter_rows(path: Path) -> Iterator[Dict[str, str]]:
+    """Yield CSV rows one at a time"""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        yield from csv.DictReader(handle)
+
+
+def iter_row_chunks(path: Path, size: int = ROW_CHUNK_SIZE) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    """Yield lists of (row number, row); row 1 is the header"""
+    chunk: List[Tuple[int, Dict[str, str]]] = []
+    for row_number, row in enumerate(iter_rows(path), start=2):
+        chunk.append((row_number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def discard(cache_key: str):
+    path = staged_path(cache_key)
+    if path is not None:
+        path.unlink(missing_ok=True)
+
+
+def purge_expired() -> int:
+    """Delete staged uploads older than the TTL; returns the number removed"""
+    cutoff = time.time() - settings.CSV_STAGING_TTL_SECONDS
+    removed = 0
+    for path in staging_dir().glob("*.csv*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    if removed:
+        logger.info("Removed %d expired CSV staging files", removed)
+    return removed
@@ -0,0 +1,201 @@
+"""
+Expiration sweep: tag status transitions and expiration notifications
+
+Run by the job scheduler (see app.services.scheduler) so request handlers
+read stored state instead of working out what has expired on every page
+view. One sweep:
+
+- marks RFID tags past their expiration date EXPIRED with one UPDATE
+- groups tagged units and RFID tags expiring inside the warning window by
+  (item, location, expiration day) and creates one system-wide
+  notification per group and severity, in a single batch insert
+
+Notifications carry a dedup_key built from the group, so a group is
+reported once as a warning and once as critical no matter how often the
+sweep runs, or how many processes run it; the insert skips keys that
+already exist.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.inventory_item import InventoryItem
+from app.models.item import Item
+from app.models.location import Location
+from app.models.notification import Notification, NotificationType, NotificationSeverity
+from app.models.rfid import RFIDTag, TagStatus
+from app.services import cache_invalidation, code_index
+from app.utils.upsert import insert_missing
+
+# Tags that can still expire; depleted and disposed tags are left alone
+ACTIVE_TAG_STATUSES = (TagStatus.IN_STOCK, TagStatus.IN_USE)
+
+# Existing dedup keys are looked up in chunks of this many
+KEY_LOOKUP_CHUNK = 500
+
+GroupKey = Tuple[object, Optional[object], str]  # (item_id, location_id, expiration day)
+
+
+def expire_tags(db: Session, now: datetime) -> int:
+    """Mark active tags past their expiration date EXPIRED; the caller commits"""
+    expired = (
+        RFIDTag.status.in_(ACTIVE_TAG_STATUSES),
+        RFIDTag.expiration_date.isnot(None),
+        RFIDTag.expiration_date < now
+    )
+    touched = db.query(RFIDTag.item_id, RFIDTag.current_location_id).filter(*expired).distinct().all()
+    if not touched:
+        return 0
+
+    count = db.query(RFIDTag).filter(*expired).update(
+        {RFIDTag.status: TagStatus.EXPIRED, RFIDTag.updated_at: now},
+        synchronize_session=False
+    )
+    # The bulk UPDATE bypasses the ORM hooks that keep these current
+    cache_invalidation.mark_changed(
+        db, {row.item_id for row in touched}, {row.current_location_id for row in touched}
+    )
+    code_index.code_index.mark_stale()
+    return count
+
+
+def _expiring_groups(db: Session, until: datetime) -> Dict[GroupKey, dict]:
+    """Units and active tags expiring before until, grouped by item, location and day"""
+    groups: Dict[GroupKey, dict] = {}
+
+    unit_day = func.date(InventoryItem.expiration_date)
+    units = db.query(
+        InventoryItem.item_id,
+        InventoryItem.location_id,
+        unit_day.label("day"),
+        func.min(InventoryItem.expiration_date).label("expiration_date"),
+        func.count(InventoryItem.id).label("count")
+    ).filter(
+        InventoryItem.expiration_date.isnot(None),
+        InventoryItem.expiration_date < until
+    ).group_by(InventoryItem.item_id, InventoryItem.location_id, unit_day)
+
+    tag_day = func.date(RFIDTag.expiration_date)
+    tags = db.query(
+        RFIDTag.item_id,
+        RFIDTag.current_location_id.label("location_id"),
+        tag_day.label("day"),
+        func.min(RFIDTag.expiration_date).label("expiration_date"),
+        func.count(RFIDTag.id).label("count")
+    ).filter(
+        RFIDTag.status.in_(ACTIVE_TAG_STATUSES + (TagStatus.EXPIRED,)),
+        RFIDTag.expiration_date.isnot(None),
+        RFIDTag.expiration_date < until
+    ).group_by(RFIDTag.item_id, RFIDTag.current_location_id, tag_day)
+
+    for query in (units, tags):
+        for row in query.all():
+            # func.date() returns a string on SQLite and a date on PostgreSQL
+            key = (row.item_id, row.location_id, str(row.day)[:10])
+            group = groups.get(key)
+            if group is None:
+                groups[key] = {"expiration_date": row.expiration_date, "count": row.count}
+            else:
+                group["expiration_date"] = min(group["expiration_date"], row.expiration_date)
+                group["count"] += row.count
+    return groups
+
+
+def _existing_keys(db: Session, keys: List[str]) -> set:
+    existing = set()
+    for start in range(0, len(keys), KEY_LOOKUP_CHUNK):
+        chunk = keys[start:start + KEY_LOOKUP_CHUNK]
+        existing.update(
+            key for (key,) in db.query(Notification.dedup_key).filter(Notification.dedup_key.in_(chunk)).all()
+        )
+    return existing
+
+
+def _names(db: Session, model, ids) -> Dict[object, str]:
+    ids = [id_ for id_ in ids if id_ is not None]
+    if not ids:
+        return {}
+    return {row.id: row.name for row in db.query(model.id, model.name).filter(model.id.in_(ids)).all()}
+
+
+def create_expiration_notifications(db: Session, now: datetime) -> Dict[str, int]:
+    """Batch-insert notifications for expiration groups not reported yet; the caller commits"""
+    critical_until = now + timedelta(days=settings.EXPIRATION_CRITICAL_DAYS)
+    groups = _expiring_groups(db, now + timedelta(days=settings.EXPIRATION_WARNING_DAYS))
+
+    candidates = {}
+    for (item_id, location_id, day), group in groups.items():
+        if group["expiration_date"] < critical_until:
+            notification_type = NotificationType.EXPIRATION_CRITICAL
+        else:
+            notification_type = NotificationType.EXPIRATION_WARNING
+        dedup_key = f"{notification_type.value}:{item_id}:{location_id}:{day}"
+        candidates[dedup_key] = (notification_type, item_id, location_id, group)
+
+    existing = _existing_keys(db, list(candidates))
+    new_keys = [key for key in candidates if key not in existing]
+    if not new_keys:
+        return {"warnings": 0, "critical": 0}
+
+    item_names = _names(db, Item, {candidates[key][1] for key in new_keys})
+    location_names = _names(db, Location, {candidates[key][2] for key in new_keys})
+
+    rows = []
+    counts = {"warnings": 0, "critical": 0}
+    for key in new_keys:
+        notification_type, item_id, location_id, group = candidates[key]
+        item_name = item_names.get(item_id, "Unknown item")
+        location_name = location_names.get(location_id, "no location")
+        expiration_date = group["expiration_date"]
+        days_left = (expiration_date - now).days
+        if group["count"] == 1:
+            units, verb = "1 unit", "expires"
+        else:
+            units, verb = f"{group['count']} units", "expire"
+
+        if notification_type == NotificationType.EXPIRATION_CRITICAL:
+            counts["critical"] += 1
+            severity = NotificationSeverity.CRITICAL
+            if expiration_date < now:
+                title = f"Expired: {item_name}"
+                message = f"{units} of {item_name} at {location_name} expired on {expiration_date:%Y-%m-%d}"
+            else:
+                title = f"Expiring in {days_left} days: {item_name}" if days_left else f"Expiring today: {item_name}"
+                message = f"{units} of {item_name} at {location_name} {verb} on {expiration_date:%Y-%m-%d}"
+        else:
+            counts["warnings"] += 1
+            severity = NotificationSeverity.WARNING
+            title = f"Expiring soon: {item_name}"
+            message = f"{units} of {item_name} at {location_name} {verb} on {expiration_date:%Y-%m-%d}"
+
+        rows.append({
+            "type": notification_type,
+            "severity": severity,
+            "title": title[:255],
+            "message": message[:1000],
+            "related_entity_type": "item",
+            "related_entity_id": item_id,
+            "dedup_key": key,
+            "is_read": False,
+            "created_at": now,
+            "updated_at": now,
+        })
+    # Another sweep may have raised the same group since _existing_keys
+    insert_missing(db, Notification, rows, ["dedup_key"])
+    return counts
+
+
+def sweep_expirations(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """Run one sweep and commit; returns the counters recorded in the job run"""
+    now = now or datetime.utcnow()
+    tags_expired = expire_tags(db, now)
+    created = create_expiration_notifications(db, now)
+    db.commit()
+    return {
+        "tags_expired": tags_expired,
+        "warning_notifications": created["warnings"],
+        "critical_notifications": created["critical"],
+    }
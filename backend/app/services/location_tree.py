@@ -0,0 +1,166 @@
+"""
+Maintenance of the location closure table
+
+location_closure holds one row per (ancestor, descendant) pair of the
+location hierarchy, including a depth-0 row for every location, so
+endpoints scope queries to a station, cabinet or district with a single
+indexed lookup instead of walking parent_location_id or matching names.
+Every flush that adds, re-parents or deletes a location records it; right
+before the transaction commits the closure rows of those locations and
+everything below them are recomputed, so the hierarchy commits (or rolls
+back) together with the location write.
+"""
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.location import Location, LocationClosure
+
+_TOUCHED_KEY = "location_tree_touched"
+
+
+def subtree_ids(location_id: UUID):
+    """SELECT of location_id and every location below it, for use in IN filters"""
+    return select(LocationClosure.descendant_id).where(LocationClosure.ancestor_id == location_id)
+
+
+def in_subtree(column, location_id: UUID):
+    """Filter clause: column holds location_id or one of its descendants"""
+    return column.in_(subtree_ids(location_id))
+
+
+def join_subtree(query, column, location_id: UUID):
+    """Join query to the closure so only rows whose column lies in location_id's subtree remain"""
+    return query.join(LocationClosure, LocationClosure.descendant_id == column).filter(
+        LocationClosure.ancestor_id == location_id
+    )
+
+
+def get_subtree_ids(db: Session, location_id: UUID) -> List[UUID]:
+    """location_id and every location below it, root first"""
+    rows = db.query(LocationClosure.descendant_id).filter(
+        LocationClosure.ancestor_id == location_id
+    ).order_by(LocationClosure.depth).all()
+    return [row.descendant_id for row in rows]
+
+
+def is_in_subtree(db: Session, location_id: UUID, root_id: UUID) -> bool:
+    """True when location_id is root_id or lies below it"""
+    return db.query(LocationClosure.depth).filter(
+        LocationClosure.ancestor_id == root_id,
+        LocationClosure.descendant_id == location_id
+    ).first() is not None
+
+
+def _parent_map(db: Session) -> Dict[UUID, Optional[UUID]]:
+    return {row.id: row.parent_location_id for row in db.query(Location.id, Location.parent_location_id).all()}
+
+
+def _closure_rows(parents: Dict[UUID, Optional[UUID]], location_ids: Iterable[UUID]) -> List[dict]:
+    """Closure rows for each location in location_ids; parent cycles are cut where they repeat"""
+    rows = []
+    for location_id in location_ids:
+        seen = set()
+        ancestor_id, depth = location_id, 0
+        while ancestor_id is not None and ancestor_id in parents and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append({"ancestor_id": ancestor_id, "descendant_id": location_id, "depth": depth})
+            ancestor_id, depth = parents[ancestor_id], depth + 1
+    return rows
+
+
+def refresh_location_closure(db: Session, location_ids: Optional[Iterable[UUID]] = None) -> int:
+    """
+    Recompute the closure rows of the given locations and everything below them
+
+    Runs inside the caller's transaction and does not commit. When
+    location_ids is None the whole table is rebuilt. Returns the number of
+    rows written.
+    """
+    db.flush()
+    parents = _parent_map(db)
+
+    if location_ids is None:
+        affected = set(parents)
+        db.query(LocationClosure).delete(synchronize_session=False)
+    else:
+        location_ids = set(location_ids)
+        if not location_ids:
+            return 0
+        children: Dict[UUID, List[UUID]] = {}
+        for child_id, parent_id in parents.items():
+            children.setdefault(parent_id, []).append(child_id)
+        affected: Set[UUID] = set()
+        stack = list(location_ids)
+        while stack:
+            location_id = stack.pop()
+            if location_id in affected:
+                continue
+            affected.add(location_id)
+            stack.extend(children.get(location_id, ()))
+        db.query(LocationClosure).filter(or_(
+            LocationClosure.descendant_id.in_(affected),
+            LocationClosure.ancestor_id.in_(location_ids - set(parents))
+        )).delete(synchronize_session=False)
+
+    rows = _closure_rows(parents, affected)
+    if rows:
+        db.bulk_insert_mappings(LocationClosure, rows)
+    return len(rows)
+
+
+def creates_cycle(db: Session, location_id: UUID, new_parent_id: Optional[UUID]) -> bool:
+    """True when making new_parent_id the parent of location_id would loop the hierarchy"""
+    if new_parent_id is None:
+        return False
+    return new_parent_id == location_id or is_in_subtree(db, new_parent_id, location_id)
+
+
+def closure_is_empty(db: Session) -> bool:
+    """Check whether locations exist but the closure was never populated"""
+    return (
+        db.query(LocationClosure.depth).first() is None
+        and db.query(Location.id).first() is not None
+    )
+
+
+# ============================================================================
+# Session hooks
+# ============================================================================
+
+def _after_flush(session: Session, flush_context):
+    touched = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, Location):
+            continue
+        if obj in session.dirty:
+            state = inspect(obj)
+            if not (state.attrs.parent_location_id.history.has_changes()
+                    or state.attrs.parent_location.history.has_changes()):
+                continue
+        if touched is None:
+            touched = session.info.setdefault(_TOUCHED_KEY, set())
+        touched.add(obj.id)
+
+
+def _before_commit(session: Session):
+    # Flush pending changes first so after_flush sees every touched location
+    session.flush()
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    if touched:
+        refresh_location_closure(session, touched)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def register_session_hooks(session_factory: sessionmaker):
+    """Keep the closure table current for every session created by session_factory"""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "before_commit", _before_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
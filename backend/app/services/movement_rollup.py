@@ -0,0 +1,323 @@
+"""
+Incremental rollup of inventory movements into the movement_daily fact table
+
+The job processes only movements whose updated_at is past the stored
+watermark. Each changed movement marks its (day, item) bucket dirty and the
+whole bucket is re-aggregated from the movement log, so rows synced late or
+edited correct their day instead of being appended to today. Days are
+bucketed on created_at, like the reports did before the fact table existed.
+Deleting a movement, or moving it to another day or item, re-aggregates its
+old bucket when the write commits (see the session hooks below).
+
+Reports only read: movement_totals() serves the fact table once the job
+has built it and aggregates the log live until then.
+"""
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import and_, case, event, func, inspect
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.rfid import InventoryMovement, MovementType
+from app.models.movement_daily import MovementDaily, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "movement_daily"
+
+# Re-read a short window before the watermark so rows committed late by
+# concurrent transactions are not skipped. Re-aggregation is idempotent.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+_DIRTY_KEY = "movement_daily_dirty_buckets"
+
+# Used = from-only movements, received = to-only movements
+_FROM_ONLY = and_(InventoryMovement.from_location_id.isnot(None), InventoryMovement.to_location_id.is_(None))
+_TO_ONLY = and_(InventoryMovement.to_location_id.isnot(None), InventoryMovement.from_location_id.is_(None))
+
+
+def _as_date(value) -> date:
+    """func.date() returns a string on SQLite and a date on PostgreSQL"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+def _get_watermark(db: Session) -> RollupWatermark:
+    watermark = db.query(RollupWatermark).filter(RollupWatermark.name == WATERMARK_NAME).first()
+    if not watermark:
+        watermark = RollupWatermark(name=WATERMARK_NAME, last_processed_at=None)
+        db.add(watermark)
+        db.flush()
+    return watermark
+
+
+def _rebuild_buckets(
+    db: Session,
+    start_day: date,
+    end_day: date,
+    item_ids: Optional[Iterable[UUID]] = None
+) -> int:
+    """Re-aggregate every bucket in [start_day, end_day) for the given items (all when None)"""
+    delete_query = db.query(MovementDaily).filter(
+        MovementDaily.date >= start_day,
+        MovementDaily.date < end_day
+    )
+
+    day = func.date(InventoryMovement.created_at)
+    location = func.coalesce(InventoryMovement.to_location_id, InventoryMovement.from_location_id)
+
+    aggregate_query = db.query(
+        day,
+        InventoryMovement.item_id,
+        location,
+        func.sum(case((_FROM_ONLY, InventoryMovement.quantity), else_=0)),
+        func.sum(case((_TO_ONLY, InventoryMovement.quantity), else_=0)),
+        func.sum(case((InventoryMovement.movement_type == MovementType.ADJUSTMENT, InventoryMovement.quantity), else_=0)),
+        func.count(InventoryMovement.id)
+    ).filter(
+        InventoryMovement.item_id.isnot(None),
+        InventoryMovement.created_at >= _day_start(start_day),
+        InventoryMovement.created_at < _day_start(end_day)
+    )
+
+    if item_ids is not None:
+        item_ids = list(item_ids)
+        delete_query = delete_query.filter(MovementDaily.item_id.in_(item_ids))
+        aggregate_query = aggregate_query.filter(InventoryMovement.item_id.in_(item_ids))
+
+    delete_query.delete(synchronize_session=False)
+
+    rows = [
+        {
+            "date": _as_date(bucket_day),
+            "item_id": item_id,
+            "location_id": location_id,
+            "used": int(used or 0),
+            "received": int(received or 0),
+            "adjusted": int(adjusted or 0),
+            "movement_count": int(count or 0),
+        }
+        for bucket_day, item_id, location_id, used, received, adjusted, count
+        in aggregate_query.group_by(day, InventoryMovement.item_id, location).all()
+    ]
+    db.bulk_insert_mappings(MovementDaily, rows)
+    return len(rows)
+
+
+def rebuild_movement_daily(
+    db: Session,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None
+) -> int:
+    """
+    Backfill the fact table from the movement log and commit
+
+    Without a range the whole history is rebuilt and the watermark moved to
+    the newest movement. Returns the number of buckets written.
+    """
+    bounds = db.query(
+        func.min(InventoryMovement.created_at),
+        func.max(InventoryMovement.created_at),
+        func.max(InventoryMovement.updated_at)
+    ).one()
+    oldest, newest, last_updated = bounds
+
+    full_rebuild = start_day is None and end_day is None
+    if start_day is None:
+        start_day = _as_date(oldest) if oldest else date.today()
+    if end_day is None:
+        end_day = (_as_date(newest) if newest else date.today()) + timedelta(days=1)
+
+    written = _rebuild_buckets(db, start_day, end_day)
+
+    watermark = _get_watermark(db)
+    if full_rebuild or watermark.last_processed_at is None:
+        watermark.last_processed_at = last_updated
+
+    db.commit()
+    logger.info("movement_daily rebuilt for %s..%s: %d buckets", start_day, end_day, written)
+    return written
+
+
+def refresh_movement_daily(db: Session) -> int:
+    """
+    Fold movements changed since the watermark into the fact table and commit
+
+    A table that was never built is backfilled from the whole history.
+    Returns the number of (day, item) buckets re-aggregated, -1 after a
+    backfill.
+    """
+    watermark = _get_watermark(db)
+    if watermark.last_processed_at is None:
+        rebuild_movement_daily(db)
+        return -1
+
+    day = func.date(InventoryMovement.created_at)
+    changed = db.query(
+        day,
+        InventoryMovement.item_id,
+        func.max(InventoryMovement.updated_at)
+    ).filter(
+        InventoryMovement.item_id.isnot(None),
+        InventoryMovement.updated_at > watermark.last_processed_at - WATERMARK_OVERLAP
+    ).group_by(day, InventoryMovement.item_id).all()
+
+    if not changed:
+        db.commit()
+        return 0
+
+    dirty: Dict[date, Set[UUID]] = defaultdict(set)
+    newest = watermark.last_processed_at
+    for bucket_day, item_id, updated_at in changed:
+        dirty[_as_date(bucket_day)].add(item_id)
+        if updated_at and updated_at > newest:
+            newest = updated_at
+
+    buckets = _rebuild_dirty(db, dirty)
+    watermark.last_processed_at = newest
+    db.commit()
+    return buckets
+
+
+def _rebuild_dirty(db: Session, dirty: Dict[date, Set[UUID]]) -> int:
+    buckets = 0
+    for bucket_day, item_ids in dirty.items():
+        _rebuild_buckets(db, bucket_day, bucket_day + timedelta(days=1), item_ids)
+        buckets += len(item_ids)
+    return buckets
+
+
+def rollup_is_built(db: Session) -> bool:
+    """Check whether the job has backfilled the fact table"""
+    return db.query(RollupWatermark.last_processed_at).filter(
+        RollupWatermark.name == WATERMARK_NAME
+    ).scalar() is not None
+
+
+def movement_totals(
+    db: Session,
+    start_date: datetime,
+    by_day: bool = False,
+    item_id: Optional[UUID] = None
+):
+    """
+    Read-only query of used, received and movement_count per item since start_date's day
+
+    Grouped per item, or per (item, date) with by_day. Reads movement_daily
+    once the rollup job has built it and aggregates the movement log live
+    before that. The date column is a date or, on SQLite's live path, an
+    ISO string.
+    """
+    start_day = start_date.date()
+    if rollup_is_built(db):
+        columns = [
+            MovementDaily.item_id.label("item_id"),
+            func.sum(MovementDaily.used).label("used"),
+            func.sum(MovementDaily.received).label("received"),
+            func.sum(MovementDaily.movement_count).label("movement_count"),
+        ]
+        group_by = [MovementDaily.item_id]
+        if by_day:
+            columns.append(MovementDaily.date.label("date"))
+            group_by.append(MovementDaily.date)
+        query = db.query(*columns).filter(MovementDaily.date >= start_day)
+        if item_id:
+            query = query.filter(MovementDaily.item_id == item_id)
+        return query.group_by(*group_by)
+
+    day = func.date(InventoryMovement.created_at)
+    columns = [
+        InventoryMovement.item_id.label("item_id"),
+        func.sum(case((_FROM_ONLY, InventoryMovement.quantity), else_=0)).label("used"),
+        func.sum(case((_TO_ONLY, InventoryMovement.quantity), else_=0)).label("received"),
+        func.count(InventoryMovement.id).label("movement_count"),
+    ]
+    group_by = [InventoryMovement.item_id]
+    if by_day:
+        columns.append(day.label("date"))
+        group_by.append(day)
+    query = db.query(*columns).filter(
+        InventoryMovement.item_id.isnot(None),
+        InventoryMovement.created_at >= _day_start(start_day)
+    )
+    if item_id:
+        query = query.filter(InventoryMovement.item_id == item_id)
+    return query.group_by(*group_by)
+
+
+# ============================================================================
+# Session hooks
+# ============================================================================
+
+def _bucket_of(created_at, item_id):
+    if created_at is None or item_id is None:
+        return None
+    return _as_date(created_at), item_id if isinstance(item_id, UUID) else UUID(str(item_id))
+
+
+def _after_flush(session: Session, flush_context):
+    # The watermark only sees rows that still exist; record the buckets a
+    # deleted movement, or one moved to another day or item, leaves behind
+    dirty = None
+    for obj in list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, InventoryMovement):
+            continue
+        if obj in session.deleted:
+            buckets = [_bucket_of(obj.created_at, obj.item_id)]
+        else:
+            state = inspect(obj)
+            created = state.attrs.created_at.history
+            item = state.attrs.item_id.history
+            if not (created.deleted or item.deleted):
+                continue
+            buckets = [
+                _bucket_of(created_at, item_id)
+                for created_at in (created.deleted or [obj.created_at])
+                for item_id in (item.deleted or [obj.item_id])
+            ]
+        for bucket in buckets:
+            if bucket is None:
+                continue
+            if dirty is None:
+                dirty = session.info.setdefault(_DIRTY_KEY, defaultdict(set))
+            dirty[bucket[0]].add(bucket[1])
+
+
+def _before_commit(session: Session):
+    # Flush pending changes first so after_flush sees every touched movement
+    session.flush()
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if not dirty or not rollup_is_built(session):
+        return
+    savepoint = session.begin_nested()
+    try:
+        _rebuild_dirty(session, dirty)
+        savepoint.commit()
+    except (IntegrityError, OperationalError) as e:
+        # A concurrent rebuild of the same bucket; the job corrects it
+        savepoint.rollback()
+        logger.warning("movement_daily bucket rebuild skipped: %s", e)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def register_session_hooks(session_factory: sessionmaker):
+    """Re-aggregate the buckets of deleted and re-dated movements for every session of session_factory"""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "before_commit", _before_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
@@ -0,0 +1,293 @@
+"""
+Incremental par breach detection on inventory writes
+
+Every flush that writes InventoryCurrent or ParLevel records the
+(item, location) pairs it touched. Right before the transaction commits
+only those pairs are compared against their par level and the par_breaches
+state table is updated. A pair is in breach while its available stock is
+below its par quantity or below its reorder quantity; a par level without
+a stock row counts as nothing available.
+
+- enter: a pair falls below par or reorder, its row is upserted
+- update: the pair stays in breach, its quantities are refreshed
+- exit: the pair is back at par and reorder (or lost its par level), its
+  row is deleted
+
+Falling below par raises a PAR_LEVEL_BREACH notification and falling below
+the reorder quantity a LOW_STOCK notification, as configured in the
+stock_alerts section of the system configuration. The state table is kept
+current regardless of that configuration, so the low-stock endpoints can
+read it instead of scanning inventory and par levels.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, func, or_, tuple_
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.inventory import InventoryCurrent
+from app.models.item import Item
+from app.models.location import Location
+from app.models.notification import Notification, NotificationType, NotificationSeverity
+from app.models.par_breach import ParBreach
+from app.models.par_level import ParLevel
+from app.services.system_config import system_config
+from app.utils.upsert import insert_missing, upsert
+
+_TOUCHED_KEY = "par_breach_touched_pairs"
+_SOURCE_KEY = "par_breach_write_source"
+
+# Write sources with their own switch in StockAlertConfig
+SCAN = "scan"
+TRANSFER = "transfer"
+
+# (item, location) pairs per IN (...) lookup
+PAIR_CHUNK = 500
+
+Pair = Tuple[UUID, UUID]
+
+
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _chunks(pairs: List[Pair]):
+    for start in range(0, len(pairs), PAIR_CHUNK):
+        yield pairs[start:start + PAIR_CHUNK]
+
+
+def compute_breaches(db: Session, pairs: Optional[Iterable[Pair]] = None) -> Dict[Pair, dict]:
+    """
+    Live breach values of the given pairs (every pair with a par level when None)
+
+    A pair is in breach when its available quantity (on hand minus
+    allocated, 0 without a stock row) is below its par or its reorder
+    quantity.
+    """
+    available = (
+        func.coalesce(InventoryCurrent.quantity_on_hand, 0)
+        - func.coalesce(InventoryCurrent.quantity_allocated, 0)
+    )
+    query = db.query(
+        ParLevel.item_id,
+        ParLevel.location_id,
+        available.label("quantity_available"),
+        ParLevel.par_quantity,
+        ParLevel.reorder_quantity
+    ).outerjoin(
+        InventoryCurrent, (InventoryCurrent.item_id == ParLevel.item_id) & (InventoryCurrent.location_id == ParLevel.location_id)
+    ).filter(or_(available < ParLevel.par_quantity, available < ParLevel.reorder_quantity))
+
+    if pairs is None:
+        rows = query.all()
+    else:
+        rows = []
+        for chunk in _chunks(list(pairs)):
+            rows.extend(query.filter(tuple_(ParLevel.item_id, ParLevel.location_id).in_(chunk)).all())
+
+    return {
+        (row.item_id, row.location_id): {
+            "quantity_available": row.quantity_available,
+            "par_quantity": row.par_quantity,
+            "reorder_quantity": row.reorder_quantity,
+            "below_reorder": row.quantity_available < row.reorder_quantity,
+        }
+        for row in rows
+    }
+
+
+def _stored_breaches(db: Session, pairs: Optional[List[Pair]]) -> Dict[Pair, ParBreach]:
+    query = db.query(ParBreach)
+    if pairs is None:
+        rows = query.all()
+    else:
+        rows = []
+        for chunk in _chunks(pairs):
+            rows.extend(query.filter(tuple_(ParBreach.item_id, ParBreach.location_id).in_(chunk)).all())
+    return {(row.item_id, row.location_id): row for row in rows}
+
+
+def _below_par(values) -> bool:
+    return values["quantity_available"] < values["par_quantity"]
+
+
+def refresh_par_breaches(db: Session, pairs: Optional[Iterable[Pair]] = None) -> Dict[str, List[dict]]:
+    """
+    Bring the stored breaches of the given pairs (all when None) in line with live stock
+
+    Runs inside the caller's transaction and does not commit. Returns the
+    rows "inserted", "updated" and "exited" (deleted), plus the transitions
+    "entered" and "reorder_entered": the pairs that fell below par and below
+    the reorder quantity.
+    """
+    if pairs is not None:
+        pairs = list(set(pairs))
+        if not pairs:
+            return {"inserted": [], "updated": [], "exited": [], "entered": [], "reorder_entered": []}
+
+    now = datetime.utcnow()
+    live = compute_breaches(db, pairs)
+    stored = _stored_breaches(db, pairs)
+
+    inserts, updates, exited, entered, reorder_entered = [], [], [], [], []
+    for key, values in live.items():
+        row = stored.get(key)
+        if row is None:
+            inserts.append({
+                "item_id": key[0], "location_id": key[1], **values,
+                "entered_at": now, "below_reorder_since": now if values["below_reorder"] else None,
+                "updated_at": now,
+            })
+            if _below_par(values):
+                entered.append(inserts[-1])
+            if values["below_reorder"]:
+                reorder_entered.append(inserts[-1])
+            continue
+        if all(getattr(row, name) == value for name, value in values.items()):
+            continue
+        # Same keys in every mapping so the UPDATEs go out as one batch
+        update = {"id": row.id, **values, "below_reorder_since": row.below_reorder_since, "updated_at": now}
+        if values["below_reorder"] and not row.below_reorder:
+            update["below_reorder_since"] = now
+        elif not values["below_reorder"]:
+            update["below_reorder_since"] = None
+        updates.append(update)
+        transition = {"item_id": key[0], "location_id": key[1], "entered_at": row.entered_at, **update}
+        if _below_par(values) and row.quantity_available >= row.par_quantity:
+            entered.append(transition)
+        if values["below_reorder"] and not row.below_reorder:
+            reorder_entered.append(transition)
+    for key, row in stored.items():
+        if key not in live:
+            exited.append({"item_id": key[0], "location_id": key[1], "id": row.id})
+
+    # A concurrent transaction may have inserted the same pair since it was read
+    upsert(db, ParBreach, inserts, ("item_id", "location_id"), (
+        "quantity_available", "par_quantity", "reorder_quantity", "below_reorder", "below_reorder_since", "updated_at"
+    ))
+    if updates:
+        db.bulk_update_mappings(ParBreach, updates)
+    if exited:
+        db.query(ParBreach).filter(
+            ParBreach.id.in_([row["id"] for row in exited])
+        ).delete(synchronize_session=False)
+    return {
+        "inserted": inserts, "updated": updates, "exited": exited,
+        "entered": entered, "reorder_entered": reorder_entered,
+    }
+
+
+def _severity(values: dict, critical_percent: int) -> NotificationSeverity:
+    if values["quantity_available"] <= values["par_quantity"] * critical_percent / 100:
+        return NotificationSeverity.CRITICAL
+    return NotificationSeverity.WARNING
+
+
+def create_breach_alerts(db: Session, transitions: Dict[str, List[dict]], source: Optional[str] = None) -> int:
+    """
+    Batch-insert notifications for breaches entered, following the stock_alerts configuration
+
+    source is SCAN or TRANSFER for writes that check_on_scan and
+    check_on_transfer apply to. Returns the number of notifications raised;
+    one whose dedup_key already exists is skipped by the insert.
+    """
+    config = system_config.get().stock_alerts
+    if not config.enabled:
+        return 0
+    if (source == SCAN and not config.check_on_scan) or (source == TRANSFER and not config.check_on_transfer):
+        return 0
+
+    alerts = []
+    if config.alert_below_par:
+        alerts.extend((NotificationType.PAR_LEVEL_BREACH, values) for values in transitions["entered"])
+    if config.alert_below_reorder:
+        alerts.extend((NotificationType.LOW_STOCK, values) for values in transitions["reorder_entered"])
+    if not alerts:
+        return 0
+
+    item_ids = {values["item_id"] for _, values in alerts}
+    location_ids = {values["location_id"] for _, values in alerts}
+    item_names = dict(db.query(Item.id, Item.name).filter(Item.id.in_(item_ids)).all())
+    location_names = dict(db.query(Location.id, Location.name).filter(Location.id.in_(location_ids)).all())
+
+    now = datetime.utcnow()
+    rows = []
+    for notification_type, values in alerts:
+        item_name = item_names.get(values["item_id"], "Unknown item")
+        location_name = location_names.get(values["location_id"], "Unknown location")
+        if notification_type == NotificationType.PAR_LEVEL_BREACH:
+            title = f"Below par: {item_name}"
+            limit = f"par {values['par_quantity']}"
+        else:
+            title = f"Reorder needed: {item_name}"
+            limit = f"reorder point {values['reorder_quantity']}"
+        rows.append({
+            "type": notification_type,
+            "severity": _severity(values, config.alert_critical_percent),
+            "title": title[:255],
+            "message": f"{item_name} at {location_name}: {values['quantity_available']} available, {limit}"[:1000],
+            "related_entity_type": "item",
+            "related_entity_id": values["item_id"],
+            # One alert of each kind per breach, however many writes it spans
+            "dedup_key": f"{notification_type.value}:{values['item_id']}:{values['location_id']}:{values['entered_at'].isoformat()}",
+            "is_read": False,
+            "created_at": now,
+            "updated_at": now,
+        })
+    return insert_missing(db, Notification, rows, ["dedup_key"])
+
+
+# ============================================================================
+# Session hooks
+# ============================================================================
+
+def _touched_pairs(session: Session) -> Set[Pair]:
+    return session.info.setdefault(_TOUCHED_KEY, set())
+
+
+def mark_stock_changed(session: Session, pairs: Iterable[Tuple[UUID, UUID]]):
+    """Flag (item, location) pairs written through bulk statements the ORM cannot see"""
+    _touched_pairs(session).update(
+        (_as_uuid(item_id), _as_uuid(location_id))
+        for item_id, location_id in pairs if item_id and location_id
+    )
+
+
+def mark_source(session: Session, source: str):
+    """Tag the current transaction as a SCAN or TRANSFER write for the alert settings"""
+    session.info[_SOURCE_KEY] = source
+
+
+def _after_flush(session: Session, flush_context):
+    touched = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (InventoryCurrent, ParLevel)) and obj.item_id and obj.location_id:
+            if touched is None:
+                touched = _touched_pairs(session)
+            touched.add((_as_uuid(obj.item_id), _as_uuid(obj.location_id)))
+
+
+def _before_commit(session: Session):
+    # Flush pending changes first so after_flush sees every touched pair
+    session.flush()
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    source = session.info.pop(_SOURCE_KEY, None)
+    if touched:
+        transitions = refresh_par_breaches(session, touched)
+        if transitions["entered"] or transitions["reorder_entered"]:
+            create_breach_alerts(session, transitions, source)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_TOUCHED_KEY, None)
+    session.info.pop(_SOURCE_KEY, None)
+
+
+def register_session_hooks(session_factory: sessionmaker):
+    """Keep par_breaches current for every session created by session_factory"""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "before_commit", _before_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
@@ -0,0 +1,187 @@
+"""
+Batched reorder suggestion engine
+
+Loads items, stock/par totals, auto-order rules, vendors and categories
+with one query each, then evaluates shortages, urgency, the per-station
+cap and vendor resolution column by column over every item at once.
+Used by the reorder suggestions API, PO creation from suggestions and the
+background reorder job.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models.item import Item, Category
+from app.models.order import Vendor, AutoOrderRule
+from app.models.stock_rollup import ItemStockRollup, ALL_LOCATIONS
+from app.schemas.reorder import ReorderSuggestion
+
+logger = logging.getLogger(__name__)
+
+URGENCY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+def _urgency(stock_ratio: float) -> str:
+    if stock_ratio <= 0.25:
+        return "critical"
+    if stock_ratio <= 0.5:
+        return "high"
+    if stock_ratio <= 0.75:
+        return "medium"
+    return "low"
+
+
+def _load_candidates(
+    db: Session,
+    category_id: Optional[str],
+    item_ids: Optional[Sequence[UUID]]
+) -> Dict[str, list]:
+    """
+    Load active items with par levels that are below their reorder total
+
+    Returns parallel columns, one entry per candidate item.
+    """
+    query = db.query(
+        Item.id,
+        Item.item_code,
+        Item.name,
+        Item.category_id,
+        Item.cost_per_unit,
+        Item.max_reorder_quantity_per_station,
+        Item.preferred_vendor,
+        ItemStockRollup.quantity_available,
+        ItemStockRollup.total_par,
+        ItemStockRollup.total_reorder,
+        ItemStockRollup.locations_below_reorder
+    ).join(
+        ItemStockRollup, Item.id == ItemStockRollup.item_id
+    ).filter(
+        Item.is_active == True,
+        ItemStockRollup.station_group == ALL_LOCATIONS,
+        ItemStockRollup.par_location_count > 0,
+        # Skip if stock is at or above the reorder level
+        ItemStockRollup.quantity_available < ItemStockRollup.total_reorder
+    )
+
+    if category_id:
+        query = query.filter(Item.category_id == category_id)
+    if item_ids is not None:
+        query = query.filter(Item.id.in_(list(item_ids)))
+
+    names = (
+        "item_id", "item_code", "item_name", "category_id", "unit_cost", "max_per_station",
+        "preferred_vendor", "stock", "par", "reorder", "locations_below"
+    )
+    rows = query.all()
+    return {name: [row[i] for row in rows] for i, name in enumerate(names)}
+
+
+def compute_reorder_suggestions(
+    db: Session,
+    vendor_id: Optional[UUID] = None,
+    category_id: Optional[str] = None,
+    urgency: Optional[str] = None,
+    item_ids: Optional[Sequence[UUID]] = None
+) -> List[ReorderSuggestion]:
+    """
+    Compute reorder suggestions for every active item below its reorder point
+
+    Suggested quantity brings stock back to par plus a 10% buffer, capped at
+    max_reorder_quantity_per_station per location below reorder. An active
+    auto-order rule can override the vendor and raise the quantity.
+    Results are sorted by urgency (critical first) then by shortage.
+    """
+    cols = _load_candidates(db, category_id, item_ids)
+    if not cols["item_id"]:
+        return []
+
+    # Lookup tables, one query each
+    candidate_ids = cols["item_id"]
+    rules: Dict[UUID, Any] = {}
+    for rule in db.query(
+        AutoOrderRule.item_id,
+        AutoOrderRule.preferred_vendor_id,
+        AutoOrderRule.order_quantity
+    ).filter(
+        AutoOrderRule.is_active == True
+    ).order_by(AutoOrderRule.created_at.asc()).all():
+        rules.setdefault(rule.item_id, rule)
+
+    vendors = db.query(Vendor.id, Vendor.name).filter(Vendor.is_active == True).all()
+    vendors_by_id = {vendor.id: vendor for vendor in vendors}
+    vendors_by_name = {vendor.name: vendor for vendor in vendors}
+
+    category_names = dict(db.query(Category.id, Category.name).all())
+
+    # Column-wise evaluation
+    stock = cols["stock"]
+    par = cols["par"]
+    reorder = cols["reorder"]
+    below = cols["locations_below"]
+
+    shortage = [p - s for p, s in zip(par, stock)]
+    suggested = [max(int(short * 1.1), 1) for short in shortage]
+    suggested = [
+        min(qty, cap * n_below) if cap and n_below > 0 else qty
+        for qty, cap, n_below in zip(suggested, cols["max_per_station"], below)
+    ]
+    urgencies = [_urgency(s / r if r > 0 else 0) for s, r in zip(stock, reorder)]
+
+    # Vendor resolution: item preferred vendor by name, overridden by an auto-order rule
+    vendor = [vendors_by_name.get(name) if name else None for name in cols["preferred_vendor"]]
+    for i, item_id in enumerate(candidate_ids):
+        rule = rules.get(item_id)
+        if rule and rule.preferred_vendor_id:
+            vendor[i] = vendors_by_id.get(rule.preferred_vendor_id)
+            if rule.order_quantity:
+                suggested[i] = max(suggested[i], rule.order_quantity)
+
+    suggestions = []
+    for i, item_id in enumerate(candidate_ids):
+        if urgency and urgencies[i] != urgency:
+            continue
+        if vendor_id and (not vendor[i] or vendor[i].id != vendor_id):
+            continue
+
+        unit_cost = cols["unit_cost"][i]
+        suggestions.append(ReorderSuggestion(
+            item_id=item_id,
+            item_code=cols["item_code"][i],
+            item_name=cols["item_name"][i],
+            category_name=category_names.get(cols["category_id"][i]),
+            current_total_stock=stock[i],
+            total_par_level=par[i],
+            total_reorder_level=reorder[i],
+            shortage=shortage[i],
+            suggested_order_qty=suggested[i],
+            preferred_vendor_id=vendor[i].id if vendor[i] else None,
+            preferred_vendor_name=vendor[i].name if vendor[i] else None,
+            estimated_cost=round(suggested[i] * float(unit_cost), 2) if unit_cost else None,
+            locations_below_par=below[i],
+            urgency=urgencies[i]
+        ))
+
+    suggestions.sort(key=lambda x: (URGENCY_ORDER.get(x.urgency, 4), -x.shortage))
+    return suggestions
+
+
+def run_reorder_job(db: Session) -> Dict[str, Any]:
+    """
+    Background entry point: evaluate the whole catalog and summarize it
+
+    Returns counts per urgency and the total estimated cost.
+    """
+    suggestions = compute_reorder_suggestions(db)
+    by_urgency = {level: 0 for level in URGENCY_ORDER}
+    for suggestion in suggestions:
+        by_urgency[suggestion.urgency] = by_urgency.get(suggestion.urgency, 0) + 1
+
+    summary = {
+        "items_needing_reorder": len(suggestions),
+        "by_urgency": by_urgency,
+        "estimated_cost": round(sum(s.estimated_cost or 0 for s in suggestions), 2),
+    }
+    logger.info("Reorder job: %s", summary)
+    return summary
@@ -0,0 +1,257 @@
+"""
+High-throughput ingest of scanner reads
+
+A handheld sweeping a truck reports the same tags many times a second.
+Reads are buffered and flushed in chunks: each flush resolves every
+distinct code through the shared code index, loads the matched tags and
+their on-hand stock with one query, and stamps last_scanned_at with a
+single bulk UPDATE. Tags already stamped inside the dedup window are not
+written again. One result is produced per distinct tag in the request.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models.rfid import RFIDTag
+from app.models.inventory import InventoryCurrent
+from app.schemas.scan import RFIDTagResponse, ScanRequest, ScanResponse
+from app.services.code_index import (
+    ItemSummary, RETIRED_STATUSES, RFID_TAG, UNIT_TAG, ITEM_CODE, PART_NUMBER, get_code_index
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ScanDeduplicator:
+    """Process-wide record of when each tag was last written"""
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, tag_ids: Iterable[str], window: float) -> List[str]:
+        """Return the tags not written within window seconds and mark them written"""
+        now = time.monotonic()
+        claimed = []
+        with self._lock:
+            for tag_id in tag_ids:
+                last = self._seen.get(tag_id)
+                if last is None or now - last >= window:
+                    self._seen[tag_id] = now
+                    claimed.append(tag_id)
+            if len(self._seen) > self.max_entries:
+                cutoff = now - window
+                self._seen = {tag: seen for tag, seen in self._seen.items() if seen >= cutoff}
+        return claimed
+
+    def clear(self):
+        with self._lock:
+            self._seen.clear()
+
+
+scan_deduplicator = ScanDeduplicator()
+
+
+def _tag_result(tag: RFIDTag, item: ItemSummary, location_name: Optional[str],
+                quantity_on_hand: Optional[int], now: datetime) -> ScanResponse:
+    tag_response = RFIDTagResponse(
+        id=tag.id,
+        tag_id=tag.tag_id,
+        item_id=tag.item_id,
+        current_location_id=tag.current_location_id,
+        status=tag.status,
+        lot_number=tag.lot_number,
+        serial_number=None,
+        expiration_date=tag.expiration_date,
+        assigned_date=tag.received_date,
+        last_scanned_at=tag.last_scanned_at,
+        item_name=item.name,
+        item_code=item.item_code,
+        location_name=location_name,
+        unit_of_measure=item.unit_of_measure
+    )
+
+    item_info = {
+        "name": item.name,
+        "code": item.item_code,
+        "description": item.description,
+        "current_location": location_name or "Unknown",
+        "quantity_on_hand": quantity_on_hand or 0,
+        "is_controlled_substance": item.is_controlled_substance,
+        "expiration_date": tag.expiration_date.isoformat() if tag.expiration_date else None,
+        "lot_number": tag.lot_number
+    }
+
+    suggested_action = "transfer"  # Default action for scanned items
+    if tag.expiration_date and tag.expiration_date < now:
+        suggested_action = "expired_remove"
+
+    return ScanResponse(
+        success=True,
+        tag_info=tag_response,
+        item_info=item_info,
+        message=f"Item scanned: {item.name}",
+        suggested_action=suggested_action
+    )
+
+
+def _unit_result(item: ItemSummary, location_name: Optional[str]) -> ScanResponse:
+    # Individually tracked unit (inventory_items.rfid_tag)
+    return ScanResponse(
+        success=True,
+        tag_info=None,
+        item_info={
+            "name": item.name,
+            "code": item.item_code,
+            "description": item.description,
+            "current_location": location_name or "Unknown",
+            "is_controlled_substance": item.is_controlled_substance
+        },
+        message=f"Item scanned: {item.name}",
+        suggested_action="transfer"
+    )
+
+
+def _item_result(item: ItemSummary) -> ScanResponse:
+    # Found item by code but no individual tag
+    return ScanResponse(
+        success=True,
+        tag_info=None,
+        item_info={
+            "name": item.name,
+            "code": item.item_code,
+            "description": item.description
+        },
+        message=f"Item found: {item.name}. No individual tag assigned.",
+        suggested_action="link_tag"
+    )
+
+
+def not_found_result(code: str) -> ScanResponse:
+    """Response for a code that matches no tag, unit or item"""
+    return ScanResponse(
+        success=False,
+        tag_info=None,
+        item_info=None,
+        message=f"Tag/barcode not found: {code}",
+        suggested_action="create_tag"
+    )
+
+
+class ScanIngestor:
+    """
+    Buffer scanner reads for one request and resolve them in chunks
+
+    Call add() for every read, then finish() to flush the remainder and
+    commit. Results keep the order in which tags were first read.
+    """
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None,
+                 dedup_window: Optional[float] = None,
+                 deduplicator: ScanDeduplicator = scan_deduplicator):
+        self.db = db
+        self.batch_size = batch_size or settings.SCAN_INGEST_BATCH_SIZE
+        self.dedup_window = settings.SCAN_DEDUP_WINDOW_SECONDS if dedup_window is None else dedup_window
+        self.deduplicator = deduplicator
+        self.results: Dict[str, ScanResponse] = {}
+        self.reads = 0
+        self.updated = 0
+        self._pending: List[str] = []
+        self._pending_set = set()
+
+    def add(self, scan: ScanRequest):
+        self.reads += 1
+        tag_id = scan.tag_id.strip()
+        if not tag_id or tag_id in self.results or tag_id in self._pending_set:
+            return
+        self._pending.append(tag_id)
+        self._pending_set.add(tag_id)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def extend(self, scans: Iterable[ScanRequest]):
+        for scan in scans:
+            self.add(scan)
+
+    def flush(self):
+        """Resolve the buffered tags and stamp last_scanned_at in one UPDATE"""
+        if not self._pending:
+            return
+        codes, self._pending, self._pending_set = self._pending, [], set()
+        now = datetime.utcnow()
+
+        index = get_code_index(self.db)
+        resolved = index.resolve_many(codes, self.db)
+        # Status is checked on the loaded rows; the indexed one can be stale
+        tag_ids = [
+            match.record_id for match in resolved.values()
+            if match is not None and match.kind == RFID_TAG
+        ]
+
+        # Tag details and on-hand stock for the tags in this chunk
+        found: Dict[str, Tuple] = {}
+        if tag_ids:
+            rows = self.db.query(
+                RFIDTag,
+                InventoryCurrent.quantity_on_hand
+            ).outerjoin(
+                InventoryCurrent,
+                and_(
+                    InventoryCurrent.location_id == RFIDTag.current_location_id,
+                    InventoryCurrent.item_id == RFIDTag.item_id
+                )
+            ).filter(
+                RFIDTag.id.in_(tag_ids),
+                RFIDTag.status.notin_(RETIRED_STATUSES)
+            ).all()
+            found = {tag.tag_id: (tag, quantity_on_hand) for tag, quantity_on_hand in rows}
+
+        # Coalesced last_scanned_at write for tags outside the dedup window
+        to_stamp = self.deduplicator.claim(found.keys(), self.dedup_window)
+        if to_stamp:
+            self.db.query(RFIDTag).filter(
+                RFIDTag.id.in_([found[tag_id][0].id for tag_id in to_stamp])
+            ).update({RFIDTag.last_scanned_at: now}, synchronize_session=False)
+            # Mirror the UPDATE on the loaded tags without making them dirty,
+            # which would write every tag again row by row at commit
+            for tag_id in to_stamp:
+                set_committed_value(found[tag_id][0], "last_scanned_at", now)
+            self.updated += len(to_stamp)
+
+        for code in codes:
+            match = resolved.get(code)
+            item = index.item(match.item_id) if match is not None else None
+            if code in found and item is not None:
+                tag, quantity_on_hand = found[code]
+                location_name = index.location_name(tag.current_location_id)
+                self.results[code] = _tag_result(tag, item, location_name, quantity_on_hand, now)
+            elif match is not None and match.kind == UNIT_TAG and item is not None:
+                self.results[code] = _unit_result(item, index.location_name(match.location_id))
+            elif match is not None and match.kind in (ITEM_CODE, PART_NUMBER) and item is not None:
+                self.results[code] = _item_result(item)
+            else:
+                self.results[code] = not_found_result(code)
+
+    def finish(self) -> List[ScanResponse]:
+        self.flush()
+        self.db.commit()
+        logger.debug(
+            "Scan ingest: %d reads, %d distinct tags, %d stamped",
+            self.reads, len(self.results), self.updated
+        )
+        return list(self.results.values())
+
+
+def ingest_scans(db: Session, scans: Iterable[ScanRequest]) -> List[ScanResponse]:
+    """Resolve a batch of reads and commit; one result per distinct tag"""
+    ingestor = ScanIngestor(db)
+    ingestor.extend(scans)
+    return ingestor.finish()
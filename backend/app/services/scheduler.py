@@ -0,0 +1,103 @@
+"""
+In-process scheduler for periodic background jobs
+
+Each job is a function that takes a session, does its work, commits and
+returns a dict of counters. run_job() records every execution in job_runs
+with its status, duration and counters. run_forever() runs the due jobs
+off the event loop, one at a time. run_jobs.py runs it as a standalone
+worker, the usual setup; the API starts it in its lifespan only when
+JOBS_ENABLED is set, which suits a single API worker.
+"""
+import asyncio
+import logging
+import time
+import traceback
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from anyio import to_thread
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.job_run import JobRun, JobStatus
+from app.services.expiration_sweep import sweep_expirations
+from app.services.movement_rollup import refresh_movement_daily
+
+logger = logging.getLogger(__name__)
+
+# Longest error text kept on a failed run
+ERROR_MAX_LENGTH = 4000
+
+
+class ScheduledJob:
+    """A named job and how often it runs"""
+
+    def __init__(self, name: str, run: Callable[[Session], Dict[str, int]], interval: Callable[[], float]):
+        self.name = name
+        self.run = run
+        self.interval = interval  # seconds, read from settings on every cycle
+
+
+def _rollup_movements(db: Session) -> Dict[str, int]:
+    return {"buckets": max(refresh_movement_daily(db), 0)}
+
+
+JOBS: List[ScheduledJob] = [
+    ScheduledJob("expiration_sweep", sweep_expirations, lambda: settings.EXPIRATION_SWEEP_SECONDS),
+    ScheduledJob("movement_rollup", _rollup_movements, lambda: settings.MOVEMENT_ROLLUP_SECONDS),
+]
+
+
+def get_job(name: str) -> Optional[ScheduledJob]:
+    return next((job for job in JOBS if job.name == name), None)
+
+
+def run_job(session_factory: sessionmaker, job: ScheduledJob) -> JobRun:
+    """Run job once and record the run; failures are recorded, not raised"""
+    db = session_factory()
+    try:
+        run = JobRun(job_name=job.name, status=JobStatus.RUNNING, started_at=datetime.utcnow())
+        db.add(run)
+        db.commit()
+        run_id = run.id
+
+        start = time.perf_counter()
+        try:
+            stats = job.run(db)
+            status, error = JobStatus.SUCCEEDED, None
+        except Exception:
+            db.rollback()
+            logger.exception("Job %s failed", job.name)
+            stats, status, error = None, JobStatus.FAILED, traceback.format_exc()[-ERROR_MAX_LENGTH:]
+        duration_ms = int((time.perf_counter() - start) * 1000)
+
+        run = db.get(JobRun, run_id)
+        run.status = status
+        run.finished_at = datetime.utcnow()
+        run.duration_ms = duration_ms
+        run.stats = stats
+        run.error = error
+        db.commit()
+        db.refresh(run)
+        db.expunge(run)
+        logger.info("Job %s %s in %d ms %s", job.name, status.value, duration_ms, stats or "")
+        return run
+    finally:
+        db.close()
+
+
+async def run_forever(session_factory: sessionmaker, jobs: Optional[List[ScheduledJob]] = None):
+    """Background task: run each job every interval, starting with a first run right away"""
+    jobs = JOBS if jobs is None else jobs
+    next_run = {job.name: 0.0 for job in jobs}
+    while True:
+        now = time.monotonic()
+        for job in jobs:
+            if now >= next_run[job.name]:
+                next_run[job.name] = now + job.interval()
+                try:
+                    await to_thread.run_sync(run_job, session_factory, job)
+                except Exception:
+                    # Recording the run itself failed (database unreachable); retry next interval
+                    logger.exception("Job %s could not be run", job.name)
+        await asyncio.sleep(max(0.0, min(next_run.values()) - time.monotonic()))
@@ -0,0 +1,215 @@
+"""
+Set-based stock enrichment for item listings
+
+Computes stock, par level, location and expiration details for a page of
+items using a fixed number of grouped queries instead of one round of
+queries per item.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+
+from app.models.item import Item
+from app.models.par_level import ParLevel
+from app.models.inventory import InventoryCurrent
+from app.models.inventory_item import InventoryItem
+from app.models.location import Location
+from app.models.stock_rollup import ALL_LOCATIONS
+from app.services.stock_rollup import get_item_rollups
+
+EXPIRING_SOON_DAYS = 30
+
+
+def _load_par_levels(
+    db: Session,
+    item_ids: List[UUID],
+    location_uuids: List[UUID]
+) -> Dict[UUID, Any]:
+    """Return the first par level row per item, optionally limited to locations"""
+    query = db.query(
+        ParLevel.item_id,
+        ParLevel.location_id,
+        ParLevel.par_quantity,
+        ParLevel.reorder_quantity
+    ).filter(ParLevel.item_id.in_(item_ids))
+    if location_uuids:
+        query = query.filter(ParLevel.location_id.in_(location_uuids))
+
+    par_levels: Dict[UUID, Any] = {}
+    for par in query.order_by(ParLevel.created_at.asc()).all():
+        par_levels.setdefault(par.item_id, par)
+    return par_levels
+
+
+def _load_stock(
+    db: Session,
+    item_ids: List[UUID],
+    location_uuids: List[UUID]
+) -> Dict[UUID, int]:
+    """Return summed on-hand stock per item"""
+    query = db.query(
+        InventoryCurrent.item_id,
+        func.coalesce(func.sum(InventoryCurrent.quantity_on_hand), 0)
+    ).filter(InventoryCurrent.item_id.in_(item_ids))
+    if location_uuids:
+        query = query.filter(InventoryCurrent.location_id.in_(location_uuids))
+
+    return {
+        item_id: int(on_hand or 0)
+        for item_id, on_hand in query.group_by(InventoryCurrent.item_id).all()
+    }
+
+
+def _load_expirations(
+    db: Session,
+    item_ids: List[UUID],
+    location_uuids: List[UUID],
+    now: datetime
+) -> Dict[UUID, Dict[str, Any]]:
+    """Return earliest expiration, expiring-soon and expired counts per item"""
+    soon = now + timedelta(days=EXPIRING_SOON_DAYS)
+    expiring_soon = func.sum(case(
+        (and_(InventoryItem.expiration_date <= soon, InventoryItem.expiration_date > now), 1),
+        else_=0
+    ))
+    expired = func.sum(case(
+        (InventoryItem.expiration_date <= now, 1),
+        else_=0
+    ))
+
+    query = db.query(
+        InventoryItem.item_id,
+        func.min(InventoryItem.expiration_date),
+        expiring_soon,
+        expired
+    ).filter(
+        InventoryItem.item_id.in_(item_ids),
+        InventoryItem.expiration_date.isnot(None)
+    )
+    if location_uuids:
+        query = query.filter(InventoryItem.location_id.in_(location_uuids))
+
+    return {
+        item_id: {
+            "expiration_date": earliest,
+            "expiring_soon_count": int(soon_count or 0),
+            "expired_count": int(expired_count or 0)
+        }
+        for item_id, earliest, soon_count, expired_count in query.group_by(InventoryItem.item_id).all()
+    }
+
+
+def _load_location_names(db: Session, location_ids: List[UUID]) -> Dict[UUID, str]:
+    """Return location names keyed by id"""
+    if not location_ids:
+        return {}
+    rows = db.query(Location.id, Location.name).filter(Location.id.in_(location_ids)).all()
+    return {location_id: name for location_id, name in rows}
+
+
+def enrich_items_with_stock(
+    db: Session,
+    items: List[Item],
+    location_uuids: Optional[List[UUID]] = None,
+    station: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build the stock-enriched item dictionaries returned by the items listing
+
+    Modes:
+    - one location: exact stock, par and expiration for that location
+    - several locations (station cabinet + truck, or a location subtree with
+      its root first): stock summed across them
+    - no locations: stock summed across all locations, first par location shown
+    """
+    if not items:
+        return []
+
+    location_uuids = list(location_uuids or [])
+    item_ids = [item.id for item in items]
+    now = datetime.utcnow()
+
+    par_levels = _load_par_levels(db, item_ids, location_uuids)
+    if not location_uuids:
+        # All locations - read the maintained rollup
+        rollups = get_item_rollups(db, item_ids, ALL_LOCATIONS)
+        stock = {item_id: row.quantity_on_hand for item_id, row in rollups.items()}
+    elif station and len(location_uuids) > 1:
+        # Station cabinet + truck - read the station group rollup
+        rollups = get_item_rollups(db, item_ids, f"station_{station.replace('station_', '')}")
+        stock = {item_id: row.quantity_on_hand for item_id, row in rollups.items()}
+    else:
+        stock = _load_stock(db, item_ids, location_uuids)
+    expirations = _load_expirations(db, item_ids, location_uuids, now)
+
+    if len(location_uuids) == 1:
+        location_names = _load_location_names(db, location_uuids)
+    elif not location_uuids:
+        location_names = _load_location_names(
+            db, list({par.location_id for par in par_levels.values() if par.location_id})
+        )
+    elif station:
+        location_names = {}
+    else:
+        location_names = _load_location_names(db, location_uuids[:1])
+
+    result = []
+    for item in items:
+        par_level_obj = par_levels.get(item.id)
+        expiration_info = expirations.get(
+            item.id,
+            {"expiration_date": None, "expiring_soon_count": 0, "expired_count": 0}
+        )
+
+        if len(location_uuids) == 1:
+            # Single location - return exact values
+            location_id_str = str(location_uuids[0])
+            location_name = location_names.get(location_uuids[0])
+        elif location_uuids:
+            # Multiple locations (station with cabinet + truck, or a subtree)
+            if station:
+                location_name = f"Station {station.replace('station_', '')} (Cabinet + Truck)"
+            elif location_uuids[0] in location_names:
+                location_name = f"{location_names[location_uuids[0]]} (incl. sub-locations)"
+            else:
+                location_name = "Multiple Locations"
+            location_id_str = str(location_uuids[0])
+        else:
+            # No specific location - use the first par level's location
+            location_name = None
+            location_id_str = None
+            if par_level_obj and par_level_obj.location_id in location_names:
+                location_name = location_names[par_level_obj.location_id]
+                location_id_str = str(par_level_obj.location_id)
+
+        result.append({
+            "id": item.id,
+            "name": item.name,
+            "description": item.description,
+            "category_id": item.category_id,
+            "sku": item.item_code,  # Using item_code as sku
+            "barcode": item.item_code,  # Using item_code as barcode
+            "unit_of_measure": item.unit_of_measure,
+            "unit_cost": float(item.cost_per_unit) if item.cost_per_unit else None,
+            "is_controlled_substance": item.is_controlled_substance,
+            "requires_prescription": False,  # Not in model, default to False
+            "reorder_point": None,  # Not in Item model
+            "reorder_quantity": None,  # Not in Item model
+            "created_at": item.created_at,
+            "updated_at": item.updated_at,
+            "current_stock": stock.get(item.id, 0),
+            "par_level": par_level_obj.par_quantity if par_level_obj else None,
+            "reorder_level": par_level_obj.reorder_quantity if par_level_obj else None,
+            "location_name": location_name,
+            "location_id": location_id_str,
+            "category_name": item.category.name if item.category else None,
+            "rfid_tag": item.item_code,  # Using item_code as rfid_tag
+            "expiration_date": expiration_info["expiration_date"],
+            "expiring_soon_count": expiration_info["expiring_soon_count"],
+            "expired_count": expiration_info["expired_count"]
+        })
+
+    return result
@@ -0,0 +1,300 @@
+"""
+Maintenance of the materialized per-item stock rollup
+
+Every session flush that touches InventoryCurrent or ParLevel records the
+affected item ids; right before the transaction commits the rollup rows of
+those items are recomputed, so the rollup commits (or rolls back) together
+with the inventory write that changed it. Station groups come from location
+names, so renaming or deleting a location also refreshes the items stocked
+or par-levelled there.
+"""
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event, inspect, tuple_
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.inventory import InventoryCurrent
+from app.models.item import Item
+from app.models.par_level import ParLevel
+from app.models.location import Location
+from app.models.stock_rollup import ItemStockRollup, ALL_LOCATIONS
+from app.utils.upsert import upsert
+
+_STATION_NAME = re.compile(r"^(?:Station|Truck) (\w+)$")
+_TOUCHED_KEY = "stock_rollup_touched_items"
+
+# Items per refresh statement
+ITEM_CHUNK = 500
+
+ROLLUP_FIELDS = (
+    "quantity_on_hand",
+    "quantity_allocated",
+    "quantity_available",
+    "total_par",
+    "total_reorder",
+    "par_location_count",
+    "locations_below_reorder",
+)
+
+
+def station_group_for(location_name: Optional[str]) -> Optional[str]:
+    """Map "Station 3" / "Truck 3" to the "station_3" group, other locations to None"""
+    if not location_name:
+        return None
+    match = _STATION_NAME.match(location_name)
+    return f"station_{match.group(1)}" if match else None
+
+
+def compute_item_rollups(
+    db: Session,
+    item_ids: Optional[Iterable[UUID]] = None
+) -> Dict[tuple, Dict[str, int]]:
+    """
+    Compute rollup values from live InventoryCurrent and ParLevel rows
+
+    Returns a dict keyed by (item_id, station_group). When item_ids is None
+    every item is computed.
+    """
+    stock_query = db.query(
+        InventoryCurrent.item_id,
+        InventoryCurrent.location_id,
+        Location.name,
+        InventoryCurrent.quantity_on_hand,
+        InventoryCurrent.quantity_allocated
+    ).outerjoin(Location, Location.id == InventoryCurrent.location_id)
+
+    par_query = db.query(
+        ParLevel.item_id,
+        ParLevel.location_id,
+        Location.name,
+        ParLevel.par_quantity,
+        ParLevel.reorder_quantity
+    ).outerjoin(Location, Location.id == ParLevel.location_id)
+
+    if item_ids is not None:
+        item_ids = list(item_ids)
+        if not item_ids:
+            return {}
+        stock_query = stock_query.filter(InventoryCurrent.item_id.in_(item_ids))
+        par_query = par_query.filter(ParLevel.item_id.in_(item_ids))
+
+    totals: Dict[tuple, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+    available_by_location: Dict[tuple, int] = {}
+
+    for item_id, location_id, location_name, on_hand, allocated in stock_query.all():
+        on_hand = on_hand or 0
+        allocated = allocated or 0
+        available_by_location[(item_id, location_id)] = on_hand - allocated
+        for group in (ALL_LOCATIONS, station_group_for(location_name)):
+            if group:
+                row = totals[(item_id, group)]
+                row["quantity_on_hand"] += on_hand
+                row["quantity_allocated"] += allocated
+                row["quantity_available"] += on_hand - allocated
+
+    for item_id, location_id, location_name, par_quantity, reorder_quantity in par_query.all():
+        available = available_by_location.get((item_id, location_id))
+        below = available is None or available < reorder_quantity
+        for group in (ALL_LOCATIONS, station_group_for(location_name)):
+            if group:
+                row = totals[(item_id, group)]
+                row["total_par"] += par_quantity or 0
+                row["total_reorder"] += reorder_quantity or 0
+                row["par_location_count"] += 1
+                row["locations_below_reorder"] += 1 if below else 0
+
+    return dict(totals)
+
+
+def lock_items(db: Session, item_ids: List[UUID]):
+    """
+    SELECT ... FOR UPDATE the given item rows, in id order to avoid deadlocks
+
+    SQLite has no row locks; a transaction that has flushed already holds
+    the database write lock there, so nothing is needed.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return
+    for start in range(0, len(item_ids), ITEM_CHUNK):
+        db.query(Item.id).filter(
+            Item.id.in_(item_ids[start:start + ITEM_CHUNK])
+        ).order_by(Item.id).with_for_update().all()
+
+
+def refresh_item_rollups(db: Session, item_ids: Optional[Iterable[UUID]] = None) -> int:
+    """
+    Recompute and replace the rollup rows for the given items
+
+    Runs inside the caller's transaction and does not commit. The items'
+    rows are locked before their totals are recomputed, so a concurrent
+    write to the same item waits for this one and then recomputes from its
+    committed stock instead of overwriting it with an older snapshot. Rows
+    are upserted on (item_id, station_group) and groups the items no longer
+    have are deleted. When item_ids is None the whole rollup is rebuilt.
+    Returns the number of rows written.
+    """
+    if item_ids is not None:
+        item_ids = sorted(set(item_ids))
+        if not item_ids:
+            return 0
+
+    db.flush()
+    if item_ids is not None:
+        lock_items(db, item_ids)
+    computed = compute_item_rollups(db, item_ids)
+    now = datetime.utcnow()
+    rows = [
+        {"item_id": item_id, "station_group": group, **values, "updated_at": now}
+        for (item_id, group), values in computed.items()
+    ]
+
+    if item_ids is None:
+        db.query(ItemStockRollup).delete(synchronize_session=False)
+        db.bulk_insert_mappings(ItemStockRollup, rows)
+        return len(rows)
+
+    upsert(db, ItemStockRollup, rows, ("item_id", "station_group"), ROLLUP_FIELDS + ("updated_at",))
+    for start in range(0, len(item_ids), ITEM_CHUNK):
+        chunk = item_ids[start:start + ITEM_CHUNK]
+        chunk_set = set(chunk)
+        keep = [key for key in computed if key[0] in chunk_set]
+        stale = db.query(ItemStockRollup).filter(ItemStockRollup.item_id.in_(chunk))
+        if keep:
+            stale = stale.filter(tuple_(ItemStockRollup.item_id, ItemStockRollup.station_group).notin_(keep))
+        stale.delete(synchronize_session=False)
+    return len(rows)
+
+
+def get_item_rollups(
+    db: Session,
+    item_ids: Optional[Iterable[UUID]] = None,
+    station_group: str = ALL_LOCATIONS
+) -> Dict[UUID, ItemStockRollup]:
+    """Load rollup rows for one station group keyed by item id"""
+    query = db.query(ItemStockRollup).filter(ItemStockRollup.station_group == station_group)
+    if item_ids is not None:
+        item_ids = list(item_ids)
+        if not item_ids:
+            return {}
+        query = query.filter(ItemStockRollup.item_id.in_(item_ids))
+    return {row.item_id: row for row in query.all()}
+
+
+def check_rollup_consistency(db: Session, repair: bool = False) -> List[Dict[str, Any]]:
+    """
+    Rebuild the rollup in memory and diff it against the stored rows
+
+    Returns one entry per mismatching (item, station group). With repair=True
+    the stored rollup is replaced with the recomputed values and committed.
+    """
+    expected = compute_item_rollups(db)
+    stored = {
+        (row.item_id, row.station_group): row
+        for row in db.query(ItemStockRollup).all()
+    }
+
+    differences = []
+    for key in set(expected) | set(stored):
+        item_id, group = key
+        live = expected.get(key)
+        row = stored.get(key)
+        if row is None:
+            differences.append({"item_id": item_id, "station_group": group, "issue": "missing", "expected": live})
+        elif live is None:
+            differences.append({"item_id": item_id, "station_group": group, "issue": "orphaned", "expected": None})
+        else:
+            mismatched = {
+                field: {"stored": getattr(row, field), "expected": live[field]}
+                for field in ROLLUP_FIELDS
+                if getattr(row, field) != live[field]
+            }
+            if mismatched:
+                differences.append({"item_id": item_id, "station_group": group, "issue": "stale", "fields": mismatched})
+
+    if repair and differences:
+        refresh_item_rollups(db)
+        db.commit()
+
+    return differences
+
+
+def rollup_is_empty(db: Session) -> bool:
+    """Check whether the rollup has never been populated"""
+    return db.query(ItemStockRollup.id).first() is None
+
+
+# ============================================================================
+# Session hooks
+# ============================================================================
+
+def _touched_items(session: Session) -> Set[UUID]:
+    return session.info.setdefault(_TOUCHED_KEY, set())
+
+
+def mark_items_changed(session: Session, item_ids: Iterable[UUID]):
+    """Flag items whose stock changed through bulk statements the ORM cannot see"""
+    _touched_items(session).update(
+        item_id if isinstance(item_id, UUID) else UUID(str(item_id))
+        for item_id in item_ids if item_id
+    )
+
+
+def _after_flush(session: Session, flush_context):
+    touched = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (InventoryCurrent, ParLevel)) and obj.item_id:
+            if touched is None:
+                touched = _touched_items(session)
+            item_id = obj.item_id
+            touched.add(item_id if isinstance(item_id, UUID) else UUID(str(item_id)))
+
+
+def _before_flush(session: Session, flush_context, instances):
+    # Deleting a location cascades to its stock rows in the database and a
+    # rename can move them between station groups; resolve the affected
+    # items before the flush while the rows are still there
+    location_ids = []
+    for obj in list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, Location) or obj.id is None:
+            continue
+        if obj in session.dirty and not inspect(obj).attrs.name.history.has_changes():
+            continue
+        location_ids.append(obj.id)
+    if not location_ids:
+        return
+    with session.no_autoflush:
+        item_ids = {
+            row.item_id for row in session.query(InventoryCurrent.item_id).filter(
+                InventoryCurrent.location_id.in_(location_ids)
+            ).union(
+                session.query(ParLevel.item_id).filter(ParLevel.location_id.in_(location_ids))
+            ).all()
+        }
+    if item_ids:
+        mark_items_changed(session, item_ids)
+
+
+def _before_commit(session: Session):
+    # Flush pending changes first so after_flush sees every touched item
+    session.flush()
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    if touched:
+        refresh_item_rollups(session, touched)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def register_session_hooks(session_factory: sessionmaker):
+    """Keep the rollup current for every session created by session_factory"""
+    if event.contains(session_factory, "after_flush", _after_flush):
+        return
+    event.listen(session_factory, "before_flush", _before_flush)
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "before_commit", _before_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
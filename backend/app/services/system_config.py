@@ -0,0 +1,141 @@
+"""
+Database-backed system configuration with a per-worker snapshot
+
+The SystemConfig document is stored in the system_config table with a
+version that every write bumps. Each worker keeps the parsed document in
+memory, so request handlers read it without touching the database, and a
+background task polls the stored version every SYSTEM_CONFIG_POLL_SECONDS
+and reloads the snapshot when another worker has changed it. Writes use
+the version for optimistic locking, so concurrent section updates from
+different workers cannot overwrite each other.
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from anyio import to_thread
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.system_config import SystemConfigRecord, SYSTEM_CONFIG_NAME
+from app.schemas.system_config import SystemConfig
+
+logger = logging.getLogger(__name__)
+
+# Optimistic-lock retries before a write gives up
+UPDATE_ATTEMPTS = 5
+
+
+class ConfigUpdateConflict(Exception):
+    """The stored configuration kept changing underneath an update"""
+
+
+class SystemConfigStore:
+    """In-memory snapshot of the stored SystemConfig"""
+
+    def __init__(self):
+        self.config = SystemConfig()
+        self.version = 0  # 0 = nothing stored yet, defaults in effect
+        self._lock = threading.Lock()
+
+    def get(self) -> SystemConfig:
+        """Current snapshot; treat it as read-only"""
+        return self.config
+
+    def _install(self, config: SystemConfig, version: int):
+        with self._lock:
+            # A slow poll must not replace a newer snapshot installed by a write
+            if version >= self.version:
+                self.config = config
+                self.version = version
+
+    def load(self, db: Session):
+        """Replace the snapshot with the stored document"""
+        record = db.query(SystemConfigRecord).filter(SystemConfigRecord.name == SYSTEM_CONFIG_NAME).first()
+        if record is None:
+            self._install(SystemConfig(), 0)
+        else:
+            self._install(SystemConfig.model_validate(record.data), record.version)
+
+    def poll(self, db: Session) -> bool:
+        """Reload when the stored version differs from the snapshot; True if reloaded"""
+        version = db.query(SystemConfigRecord.version).filter(
+            SystemConfigRecord.name == SYSTEM_CONFIG_NAME
+        ).scalar() or 0
+        if version == self.version:
+            return False
+        self.load(db)
+        logger.info("System configuration reloaded at version %d", self.version)
+        return True
+
+    def update(self, db: Session, change: Callable[[SystemConfig], SystemConfig],
+               user_id: Optional[Any] = None) -> SystemConfig:
+        """
+        Apply change to the stored document and commit it
+
+        change receives the latest stored config and returns the new one; it
+        is called again if another worker writes in between.
+        """
+        for _ in range(UPDATE_ATTEMPTS):
+            record = db.query(SystemConfigRecord).filter(SystemConfigRecord.name == SYSTEM_CONFIG_NAME).first()
+            if record is None:
+                config = change(SystemConfig())
+                version = 1
+                db.add(SystemConfigRecord(
+                    name=SYSTEM_CONFIG_NAME,
+                    data=config.model_dump(mode="json"),
+                    version=version,
+                    updated_by=user_id
+                ))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    db.rollback()
+                    continue
+            else:
+                config = change(SystemConfig.model_validate(record.data))
+                version = record.version + 1
+                result = db.execute(
+                    update(SystemConfigRecord)
+                    .where(
+                        SystemConfigRecord.name == SYSTEM_CONFIG_NAME,
+                        SystemConfigRecord.version == record.version
+                    )
+                    .values(
+                        data=config.model_dump(mode="json"),
+                        version=version,
+                        updated_by=user_id,
+                        updated_at=datetime.utcnow()
+                    )
+                )
+                if result.rowcount != 1:
+                    db.rollback()
+                    continue
+                db.commit()
+            self._install(config, version)
+            return config
+        raise ConfigUpdateConflict("System configuration changed concurrently, try again")
+
+
+system_config = SystemConfigStore()
+
+
+async def poll_forever(session_factory: sessionmaker):
+    """Background task: pick up configuration written by other workers"""
+    def poll_once():
+        db = session_factory()
+        try:
+            system_config.poll(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(settings.SYSTEM_CONFIG_POLL_SECONDS)
+        try:
+            await to_thread.run_sync(poll_once)
+        except Exception:
+            logger.exception("System configuration poll failed")
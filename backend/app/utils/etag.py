@@ -0,0 +1,46 @@
+"""
+Conditional GET support for read endpoints
+
+An endpoint computes a cheap fingerprint of the rows behind its response
+(counts, last-updated timestamps, quantity sums) and turns it into a weak
+ETag. When the client's If-None-Match carries that tag the endpoint
+answers 304 without running its full query; otherwise the tag is sent
+with the body so the next request can be conditional.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response
+
+ETAG_HEADER = "ETag"
+
+# Clients must revalidate, but may keep the body while the ETag still matches
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the string form of parts"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header value with etag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare for candidate in if_none_match.split(","))
+
+
+def set_etag(response: Response, etag: str):
+    response.headers[ETAG_HEADER] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag"""
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,131 @@
+"""
+Keyset (cursor) pagination for list endpoints
+
+List endpoints sort on stable keys with the primary key as tie-breaker.
+Passing the opaque ``cursor`` from a previous page's ``X-Next-Cursor``
+header continues after the last row seen with an indexed range condition,
+so every page costs the same as the first; ``skip`` still works for
+callers that do not send a cursor. ``X-Has-More`` tells whether another
+page exists.
+"""
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+HAS_MORE_HEADER = "X-Has-More"
+PAGE_HEADERS = [NEXT_CURSOR_HEADER, HAS_MORE_HEADER]
+
+
+class KeysetPage(NamedTuple):
+    rows: List[Any]
+    next_cursor: Optional[str]
+    has_more: bool
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque token for the sort key values of the last row on a page"""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """Sort key values from a cursor; raises 400 when it does not fit the columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match this listing")
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def keyset_filter(columns: Sequence, cursor: str, descending: bool = False):
+    """Condition selecting the rows after a cursor in (columns...) order"""
+    values = decode_cursor(cursor, columns)
+    clauses = []
+    for i, column in enumerate(columns):
+        prefix = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*prefix, beyond))
+    # The redundant bound on the leading column lets the planner use an
+    # index range scan instead of filtering the OR chain row by row
+    leading = columns[0] <= values[0] if descending else columns[0] >= values[0]
+    return and_(leading, or_(*clauses))
+
+
+def keyset_paginate(
+    query: Query,
+    sort_columns: Sequence,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    descending: bool = False
+) -> KeysetPage:
+    """
+    Fetch one page of query ordered by sort_columns then id_column
+
+    Any ordering already on the query is replaced. With a cursor the page
+    starts after the cursor row and skip is ignored. One extra row is read
+    to determine has_more.
+    """
+    columns = list(sort_columns) + [id_column]
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    query = query.order_by(None).order_by(*ordering)
+
+    if cursor:
+        query = query.filter(keyset_filter(columns, cursor, descending))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return KeysetPage(rows, next_cursor, has_more)
+
+
+def set_page_headers(response: Response, page: KeysetPage):
+    """Expose the next cursor and has_more flag on a list response"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    response.headers[HAS_MORE_HEADER] = "true" if page.has_more else "false"
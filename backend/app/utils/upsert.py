@@ -0,0 +1,57 @@
+"""
+INSERT ... ON CONFLICT for the databases the app runs on
+
+Used by the state tables kept current on every inventory write, where two
+transactions can insert the same natural key at the same time; the second
+one updates the row instead of failing on the unique constraint. Generated
+notifications use the DO NOTHING form, so the second copy of an alert is
+dropped.
+"""
+from typing import Iterable, List, Sequence
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def _insert(db: Session, model):
+    dialect = sqlite if db.get_bind().dialect.name == "sqlite" else postgresql
+    return dialect.insert(model.__table__)
+
+
+def upsert(
+    db: Session,
+    model,
+    rows: List[dict],
+    conflict_columns: Sequence[str],
+    update_columns: Iterable[str]
+) -> int:
+    """
+    Insert rows into model's table, updating update_columns where the conflict key exists
+
+    conflict_columns must match a unique constraint of the table. Runs in
+    the caller's transaction as one executemany. Returns the number of rows
+    sent.
+    """
+    if not rows:
+        return 0
+    stmt = _insert(db, model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={column: stmt.excluded[column] for column in update_columns}
+    )
+    db.execute(stmt, rows)
+    return len(rows)
+
+
+def insert_missing(db: Session, model, rows: List[dict], conflict_columns: Sequence[str]) -> int:
+    """
+    Insert rows into model's table, skipping those whose conflict key exists
+
+    Runs in the caller's transaction as one executemany. Returns the number
+    of rows sent, not the number inserted.
+    """
+    if not rows:
+        return 0
+    stmt = _insert(db, model).on_conflict_do_nothing(index_elements=list(conflict_columns))
+    db.execute(stmt, rows)
+    return len(rows)
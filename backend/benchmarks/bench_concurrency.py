@@ -0,0 +1,96 @@
+"""
+Load test: scanner latency while heavy reports run on the same worker
+
+Drives the app in-process over ASGI with httpx and fires single-tag scans
+at a steady rate, first on an idle worker and then while several clients
+request the cost-analysis report back to back (report cache disabled).
+Route handlers are sync and run in the threadpool, so a running report
+should not hold up the event loop. Reports p50/p95/max scan latency for
+each phase and how many reports completed.
+
+Usage:
+    python benchmarks/bench_concurrency.py [n_items]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from common import reset_database, seed_catalog
+
+import httpx
+
+from app.core.config import settings
+from app.main import app
+
+SCANS = 200
+SCAN_INTERVAL = 0.01
+REPORT_CLIENTS = 4
+
+
+async def scan_latencies(client, codes):
+    """Scan codes one at a time and return per-request latency in ms"""
+    latencies = []
+    for i in range(SCANS):
+        start = time.perf_counter()
+        response = await client.post("/api/v1/rfid/scan", json={"tag_id": codes[i % len(codes)]})
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        await asyncio.sleep(SCAN_INTERVAL)
+    return latencies
+
+
+async def report_loop(client, stop, completed):
+    while not stop.is_set():
+        response = await client.get("/api/v1/reports/cost-analysis")
+        response.raise_for_status()
+        completed.append(1)
+
+
+def summarize(label, latencies, extra=""):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"  {label:<14} p50={statistics.median(ordered):>7.1f} ms p95={p95:>7.1f} ms "
+        f"max={ordered[-1]:>7.1f} ms{extra}"
+    )
+
+
+async def run(codes):
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            await client.get("/api/v1/reports/cost-analysis")
+            print(f"  one cost-analysis report: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+            summarize("idle", await scan_latencies(client, codes))
+
+            stop = asyncio.Event()
+            completed = []
+            reports = [
+                asyncio.create_task(report_loop(client, stop, completed))
+                for _ in range(REPORT_CLIENTS)
+            ]
+            await asyncio.sleep(0.1)
+            latencies = await scan_latencies(client, codes)
+            stop.set()
+            await asyncio.gather(*reports)
+            summarize(
+                f"{REPORT_CLIENTS} reports", latencies,
+                f"  ({len(completed)} reports completed)"
+            )
+
+
+def main():
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    settings.REPORT_CACHE_ENABLED = False
+    reset_database()
+    seed_catalog(n_items, tagged_per_item=1)
+    codes = [f"TAG{n:08d}" for n in range(1, n_items + 1)]
+    print(f"{n_items} items, {SCANS} scans")
+    asyncio.run(run(codes))
+
+
+if __name__ == "__main__":
+    main()
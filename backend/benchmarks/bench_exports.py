@@ -0,0 +1,79 @@
+"""
+Benchmark the streaming movement export
+
+Seeds movement histories of increasing size and downloads
+GET /api/v1/exports/movements as gzip CSV and as NDJSON, reporting
+throughput and the peak Python memory allocated while streaming. Peak
+memory should stay flat as the row count grows. The ASGI app is driven
+directly and body chunks are discarded as they arrive (TestClient would
+buffer the whole body).
+
+Usage:
+    python benchmarks/bench_exports.py
+"""
+import asyncio
+import tracemalloc
+from urllib.parse import urlencode
+
+from common import timed, reset_database, seed_catalog, seed_movements
+
+from app.main import app
+
+PER_DAY = [50, 500, 2000]
+URL = "/api/v1/exports/movements"
+
+
+async def download(params, headers):
+    """Stream the export body and return the number of bytes received"""
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": URL, "raw_path": URL.encode(), "root_path": "",
+        "query_string": urlencode(params).encode(),
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+        "server": ("bench", 80), "client": ("bench", 50000),
+    }
+    received = {"size": 0, "status": None}
+    requested = asyncio.Event()
+
+    async def receive():
+        if requested.is_set():
+            await asyncio.Event().wait()  # the client never disconnects
+        requested.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            received["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            received["size"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    assert received["status"] == 200, received["status"]
+    return received["size"]
+
+
+def run(label, n_rows, params, headers):
+    tracemalloc.start()
+    with timed() as elapsed:
+        size = asyncio.run(download(params, headers))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    seconds = elapsed["ms"] / 1000
+    print(
+        f"  {label:<9} {size / 1e6:>7.1f} MB sent  rows/sec={n_rows / seconds:>8.0f} "
+        f"peak={peak / 1e6:>6.1f} MB"
+    )
+
+
+def main():
+    for per_day in PER_DAY:
+        reset_database()
+        seed_catalog(500, tagged_per_item=0)
+        n_rows = seed_movements(days=90, per_day=per_day)
+        print(f"{n_rows} movements")
+        run("csv+gzip", n_rows, {"format": "csv"}, {"Accept-Encoding": "gzip"})
+        run("ndjson", n_rows, {"format": "ndjson"}, {"Accept-Encoding": "identity"})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark GET /api/v1/items stock enrichment
+
+Seeds catalogs of 100, 1,000 and 10,000 items into a temporary SQLite
+database and pages through the items listing in each mode (all
+locations, single location, station cabinet + truck), reporting the
+number of SQL statements and the latency per page.
+
+Usage:
+    python benchmarks/bench_items_list.py
+"""
+from common import QueryCounter, timed, reset_database, seed_catalog
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+SIZES = [100, 1000, 10000]
+PAGE_SIZE = 1000
+
+
+def run_mode(client, label, params, n_items):
+    """Page through the whole catalog and print query count and latency"""
+    pages = 0
+    total_queries = 0
+    total_ms = 0.0
+    for skip in range(0, n_items, PAGE_SIZE):
+        with QueryCounter() as counter, timed() as elapsed:
+            response = client.get("/api/v1/items/", params={**params, "skip": skip, "limit": PAGE_SIZE})
+        response.raise_for_status()
+        pages += 1
+        total_queries += counter.count
+        total_ms += elapsed["ms"]
+
+    print(
+        f"  {label:<16} pages={pages:<3} queries/page={total_queries / pages:>6.1f} "
+        f"latency/page={total_ms / pages:>9.1f} ms"
+    )
+
+
+def main():
+    client = TestClient(app)
+    for n_items in SIZES:
+        reset_database()
+        location_ids = seed_catalog(n_items)
+        print(f"{n_items} items")
+        run_mode(client, "all locations", {}, n_items)
+        run_mode(client, "single location", {"location_id": str(location_ids[1])}, n_items)
+        run_mode(client, "station", {"station": "station_1"}, n_items)
+
+
+if __name__ == "__main__":
+    main()
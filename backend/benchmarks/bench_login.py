@@ -0,0 +1,141 @@
+"""
+Load test: login throughput and event-loop latency under concurrent logins
+
+Drives the app in-process over ASGI with httpx. Several clients log in back
+to back while a probe requests /health at a steady rate. The run is made
+twice: first with bcrypt executed inline on the event loop (how login
+worked before hashing moved to its own pool), then on the password hashing
+pool. Reports logins per second, p50/p95 login latency and p50/p95/max
+/health latency (counted from when each probe was due) for each mode.
+
+Usage:
+    python benchmarks/bench_login.py [n_logins] [concurrency]
+    BCRYPT_ROUNDS=10 python benchmarks/bench_login.py   # cheaper hashes
+"""
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from concurrent.futures import Executor, Future
+
+from common import reset_database, new_id, SessionLocal
+
+import httpx
+
+from app.core import security
+from app.core.config import settings
+from app.main import app
+from app.models.user import User, UserRole
+
+PASSWORD = "BenchPass123!"
+PROBE_INTERVAL = 0.02
+
+
+class InlineExecutor(Executor):
+    """Runs submitted calls immediately on the calling thread"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def seed_users(n_users):
+    """Users sharing one hash made with the configured cost factor"""
+    password_hash = security.get_password_hash(PASSWORD)
+    db = SessionLocal()
+    db.add_all([
+        User(
+            id=new_id(), username=f"bench{n}", email=f"bench{n}@example.com",
+            password_hash=password_hash, first_name="Bench", last_name=str(n),
+            role=UserRole.USER, is_active=True
+        )
+        for n in range(n_users)
+    ])
+    db.commit()
+    db.close()
+
+
+async def login_loop(client, username, remaining, latencies):
+    while remaining:
+        remaining.pop()
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/v1/auth/login", data={"username": username, "password": PASSWORD}
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+
+
+async def probe_loop(client, stop, latencies):
+    """/health latency measured from when the probe was due, so loop stalls count"""
+    while not stop.is_set():
+        due = time.perf_counter() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        response = await client.get("/health")
+        latencies.append((time.perf_counter() - due) * 1000)
+        response.raise_for_status()
+
+
+def percentile(ordered, q):
+    return ordered[max(0, int(len(ordered) * q) - 1)]
+
+
+async def run(label, n_logins, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = list(range(n_logins))
+        login_latencies, probe_latencies = [], []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_loop(client, stop, probe_latencies))
+
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            login_loop(client, f"bench{n}", remaining, login_latencies)
+            for n in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    logins = sorted(login_latencies)
+    probes = sorted(probe_latencies)
+    print(
+        f"  {label:<8} {n_logins / elapsed:>6.1f} logins/s  "
+        f"login p50={statistics.median(logins):>7.0f} ms p95={percentile(logins, 0.95):>7.0f} ms  "
+        f"/health p50={statistics.median(probes):>6.1f} ms p95={percentile(probes, 0.95):>6.1f} ms "
+        f"max={probes[-1]:>6.1f} ms ({len(probes)} probes)"
+    )
+
+
+async def run_all(n_logins, concurrency):
+    async with app.router.lifespan_context(app):
+        pool = security._hash_pool
+        try:
+            security._hash_pool = InlineExecutor()
+            await run("inline", n_logins, concurrency)
+        finally:
+            security._hash_pool = pool
+        await run("pool", n_logins, concurrency)
+
+
+def main():
+    n_logins = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    # Every login is a "slow request" at production cost factors
+    logging.getLogger("app.core.request_metrics").setLevel(logging.ERROR)
+    reset_database()
+    seed_users(concurrency)
+    print(
+        f"{n_logins} logins from {concurrency} clients, bcrypt cost {settings.BCRYPT_ROUNDS}, "
+        f"{security._hash_pool._max_workers} hashing threads"
+    )
+    asyncio.run(run_all(n_logins, concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark scanner read ingestion
+
+Seeds 2,000 items with three RFID tags each, then replays a truck sweep
+in which every tag is read several times (plus a few unknown codes). The
+sweep is sent once per read to POST /api/v1/rfid/scan and as a single
+NDJSON stream to POST /api/v1/rfid/scan/batch, reporting SQL statements
+and sustained reads per second for each.
+
+Usage:
+    python benchmarks/bench_scan_ingest.py [n_reads]
+"""
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+from common import QueryCounter, timed, reset_database, seed_catalog, new_id, SessionLocal
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Item, RFIDTag, TagStatus
+from app.services.scan_ingest import scan_deduplicator
+
+N_ITEMS = 2000
+TAGS_PER_ITEM = 3
+SINGLE_SAMPLE = 500
+
+
+def seed_tags(location_ids):
+    """Create RFID tags for every item and return their tag ids"""
+    rng = random.Random(11)
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        rows = []
+        for n, (item_id,) in enumerate(db.query(Item.id).all()):
+            for k in range(TAGS_PER_ITEM):
+                rows.append({
+                    "id": new_id(),
+                    "tag_id": f"E200{n:06d}{k:02d}",
+                    "item_id": item_id,
+                    "current_location_id": rng.choice(location_ids),
+                    "status": TagStatus.IN_STOCK,
+                    "expiration_date": now + timedelta(days=rng.randint(-30, 365)),
+                    "received_date": now, "created_at": now, "updated_at": now,
+                })
+        db.bulk_insert_mappings(RFIDTag, rows)
+        db.commit()
+        return [row["tag_id"] for row in rows]
+    finally:
+        db.close()
+
+
+def make_sweep(tag_ids, n_reads, seed=5):
+    """Reads drawn from a truck's worth of tags, so most reads are repeats"""
+    rng = random.Random(seed)
+    truck = rng.sample(tag_ids, min(len(tag_ids), max(1, n_reads // 8)))
+    reads = [rng.choice(truck) for _ in range(n_reads)]
+    for i in range(0, n_reads, 200):
+        reads[i] = f"UNKNOWN-{i}"
+    return [{"tag_id": tag_id, "scan_type": "rfid"} for tag_id in reads]
+
+
+def report(label, reads, queries, ms):
+    print(
+        f"  {label:<22} reads={reads:<6} queries={queries:<6} "
+        f"time={ms:>9.1f} ms  reads/sec={reads / (ms / 1000):>9.0f}"
+    )
+
+
+def main():
+    n_reads = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    client = TestClient(app)
+
+    reset_database()
+    location_ids = seed_catalog(N_ITEMS, tagged_per_item=0)
+    tag_ids = seed_tags(location_ids)
+    sweep = make_sweep(tag_ids, n_reads)
+    print(f"{len(tag_ids)} tags, {n_reads} reads, {len({r['tag_id'] for r in sweep})} distinct")
+
+    # One request (and transaction) per read, sampled then extrapolated
+    scan_deduplicator.clear()
+    sample = sweep[:SINGLE_SAMPLE]
+    with QueryCounter() as counter, timed() as elapsed:
+        for read in sample:
+            client.post("/api/v1/rfid/scan", json=read).raise_for_status()
+    report("per-read /scan", len(sample), counter.count, elapsed["ms"])
+
+    # Whole sweep as one NDJSON stream
+    scan_deduplicator.clear()
+    body = "\n".join(json.dumps(read) for read in sweep)
+    with QueryCounter() as counter, timed() as elapsed:
+        response = client.post(
+            "/api/v1/rfid/scan/batch",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+    response.raise_for_status()
+    report("NDJSON /scan/batch", n_reads, counter.count, elapsed["ms"])
+    print(f"  results returned: {len(response.json())}")
+
+    # Same sweep again inside the dedup window: no last_scanned_at writes
+    with QueryCounter() as counter, timed() as elapsed:
+        response = client.post("/api/v1/rfid/scan/batch", json=sweep)
+    response.raise_for_status()
+    report("JSON /scan/batch (dup)", n_reads, counter.count, elapsed["ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark application import (cold start) time
+
+Imports app.main in fresh interpreters with ``-X importtime`` and reports
+the total import time plus the cumulative time of every app module and the
+largest third-party packages, taking the median over several runs. Also
+times the first request to each lazily loaded router. Compare the output
+between commits to catch startup regressions.
+
+Usage:
+    python benchmarks/bench_startup.py [runs] [top_n]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+
+FIRST_USE = """
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+client = TestClient(app)
+for path in ("/api/v1/reports/cache-stats", "/api/v1/csv-import/preview"):
+    start = time.perf_counter()
+    client.get(path)
+    print(f"{path} {(time.perf_counter() - start) * 1000:.1f}")
+"""
+
+
+def run_importtime(env):
+    """Cumulative import time in microseconds per module for one cold import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=backend_dir, env=env, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    top_n = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='ems_bench_')}/startup.db")
+    env.setdefault("DEV_MODE", "true")
+
+    samples = defaultdict(list)
+    for _ in range(runs):
+        for name, micros in run_importtime(env).items():
+            samples[name].append(micros)
+    median = {name: statistics.median(values) / 1000 for name, values in samples.items()}
+
+    print(f"import app.main: {median['app.main']:.0f} ms (median of {runs} cold runs)")
+    print("  app modules (cumulative):")
+    app_modules = sorted(
+        (name for name in median if name.startswith("app.") and name != "app.main"),
+        key=median.get, reverse=True
+    )
+    for name in app_modules[:top_n]:
+        print(f"    {name:<40} {median[name]:>7.1f} ms")
+
+    print("  third-party packages (cumulative):")
+    packages = sorted(
+        (name for name in median if "." not in name and name not in ("app", "encodings")),
+        key=median.get, reverse=True
+    )
+    for name in packages[:top_n]:
+        print(f"    {name:<40} {median[name]:>7.1f} ms")
+
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_USE], cwd=backend_dir, env=env,
+        capture_output=True, text=True, check=True
+    )
+    print("  first request to lazily loaded routers:")
+    for line in result.stdout.splitlines():
+        path, ms = line.rsplit(" ", 1)
+        print(f"    {path:<40} {float(ms):>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
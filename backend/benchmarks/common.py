@@ -0,0 +1,235 @@
+"""
+Shared helpers for the benchmark scripts
+
+Points the application at a throwaway SQLite database, counts the SQL
+statements issued against the engine and seeds synthetic EMS data.
+Import this module before anything from ``app`` so the temporary
+DATABASE_URL is picked up by the settings.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+_db_dir = tempfile.mkdtemp(prefix="ems_bench_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("DEV_MODE", "true")
+
+from sqlalchemy import event
+
+from app.core.database import engine, SessionLocal, Base
+from app.models import (
+    Category,
+    Item,
+    Location,
+    LocationType,
+    ParLevel,
+    InventoryCurrent,
+    InventoryItem,
+    InventoryMovement,
+    MovementType,
+    RFIDTag,
+    TagStatus,
+)
+from app.services.stock_rollup import refresh_item_rollups
+from app.services.par_breach import refresh_par_breaches
+from app.services.movement_rollup import rebuild_movement_daily
+
+
+def new_id():
+    """
+    uuid4 whose hex form cannot be read back as a number
+
+    The UUID columns have NUMERIC affinity on SQLite, so a hex string such
+    as "1234e5678..." would be stored as a REAL.
+    """
+    while True:
+        value = uuid.uuid4()
+        if any(c in "abcdf" for c in value.hex):
+            return value
+
+
+class QueryCounter:
+    """Count SQL statements executed on the application engine"""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._on_execute)
+
+
+@contextmanager
+def timed():
+    """Yield a dict whose ``ms`` key holds the elapsed wall time afterwards"""
+    result = {"ms": 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["ms"] = (time.perf_counter() - start) * 1000
+
+
+def reset_database():
+    """Drop and recreate every table in the benchmark database"""
+    import app.models  # noqa: F401 - register all models
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def seed_catalog(n_items, n_stations=4, tagged_per_item=2, stock_scale=1.0, par_coverage=1.0, seed=42):
+    """
+    Seed a synthetic catalog
+
+    Creates one supply station plus a cabinet and truck per station (linked
+    supply station -> cabinet -> truck), current stock for every item at
+    every location, par levels for a par_coverage share of those and a few
+    individually tagged units with mixed expiration dates, each with a
+    matching in-stock RFID tag so scans of those tags resolve. Lower
+    stock_scale values leave more items below their reorder points. Returns
+    the list of created location ids.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        categories = [
+            Category(id=f"cat_{i}", name=f"Category {i}", sort_order=i)
+            for i in range(5)
+        ]
+        db.add_all(categories)
+
+        supply = Location(id=new_id(), name="Supply Station", type=LocationType.SUPPLY_STATION)
+        locations = [supply]
+        for n in range(1, n_stations + 1):
+            cabinet = Location(
+                id=new_id(), name=f"Station {n}", type=LocationType.STATION_CABINET,
+                parent_location_id=supply.id
+            )
+            truck = Location(
+                id=new_id(), name=f"Truck {n}", type=LocationType.VEHICLE,
+                parent_location_id=cabinet.id
+            )
+            locations.extend([cabinet, truck])
+        db.add_all(locations)
+        db.flush()
+
+        items = []
+        for i in range(n_items):
+            items.append(Item(
+                id=new_id(),
+                item_code=f"ITEM-{i:06d}",
+                name=f"Supply Item {i}",
+                category_id=categories[i % len(categories)].id,
+                unit_of_measure="EA",
+                cost_per_unit=round(rng.uniform(0.5, 80), 2),
+                is_active=True,
+            ))
+        db.bulk_save_objects(items)
+
+        par_rows = []
+        stock_rows = []
+        tagged_rows = []
+        rfid_rows = []
+        tag_seq = 0
+        for item in items:
+            for location in locations:
+                par = rng.randint(5, 40)
+                if par_coverage >= 1 or rng.random() < par_coverage:
+                    par_rows.append({
+                        "id": new_id(), "item_id": item.id, "location_id": location.id,
+                        "par_quantity": par, "reorder_quantity": max(1, par // 3),
+                        "created_at": now, "updated_at": now,
+                    })
+                stock_rows.append({
+                    "id": new_id(), "item_id": item.id, "location_id": location.id,
+                    "quantity_on_hand": rng.randint(0, int((par + 10) * stock_scale)), "quantity_allocated": 0,
+                    "created_at": now, "updated_at": now,
+                })
+            for _ in range(tagged_per_item):
+                tag_seq += 1
+                unit = {
+                    "item_id": item.id,
+                    "location_id": rng.choice(locations).id,
+                    "rfid_tag": f"TAG{tag_seq:08d}",
+                    "expiration_date": now + timedelta(days=rng.randint(-30, 365)),
+                    "received_date": now, "created_at": now, "updated_at": now,
+                }
+                tagged_rows.append(unit)
+                rfid_rows.append({
+                    "id": new_id(), "tag_id": unit["rfid_tag"], "item_id": item.id,
+                    "current_location_id": unit["location_id"], "status": TagStatus.IN_STOCK,
+                    "expiration_date": unit["expiration_date"],
+                    "received_date": now, "created_at": now, "updated_at": now,
+                })
+
+        db.bulk_insert_mappings(ParLevel, par_rows)
+        db.bulk_insert_mappings(InventoryCurrent, stock_rows)
+        db.bulk_insert_mappings(InventoryItem, tagged_rows)
+        db.bulk_insert_mappings(RFIDTag, rfid_rows)
+        refresh_item_rollups(db)
+        refresh_par_breaches(db)
+        db.commit()
+        return [location.id for location in locations]
+    finally:
+        db.close()
+
+
+def seed_movements(days=90, per_day=200, seed=7):
+    """
+    Seed a movement history spread over the last ``days`` days
+
+    Mixes usage (from-only), receipts (to-only), transfers and adjustments
+    across the existing items and locations.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        item_ids = [row[0] for row in db.query(Item.id).all()]
+        location_ids = [row[0] for row in db.query(Location.id).all()]
+        kinds = [
+            (MovementType.USE, True, False),
+            (MovementType.RECEIVE, False, True),
+            (MovementType.TRANSFER, True, True),
+            (MovementType.ADJUSTMENT, False, True),
+        ]
+        rows = []
+        for day in range(days):
+            for _ in range(per_day):
+                movement_type, has_from, has_to = rng.choice(kinds)
+                when = now - timedelta(days=day, minutes=rng.randint(0, 1439))
+                rows.append({
+                    "id": new_id(),
+                    "item_id": rng.choice(item_ids),
+                    "from_location_id": rng.choice(location_ids) if has_from else None,
+                    "to_location_id": rng.choice(location_ids) if has_to else None,
+                    "movement_type": movement_type,
+                    "quantity": rng.randint(1, 5),
+                    "timestamp": when, "created_at": when, "updated_at": when,
+                })
+        db.bulk_insert_mappings(InventoryMovement, rows)
+        db.commit()
+        # Deployments backfill movement_daily in init_db.py, not in requests
+        rebuild_movement_daily(db)
+        return len(rows)
+    finally:
+        db.close()
@@ -0,0 +1,187 @@
+"""
+Fixtures for the performance regression suite
+
+Seeds one synthetic EMS dataset per session into the throwaway benchmark
+database, drives the app through TestClient and compares the median
+latency and query count of every measurement with the JSON baseline.
+Dataset sizes come from BENCH_* environment variables; a baseline only
+applies to the dataset it was recorded on.
+
+Usage (from backend/):
+    python -m pytest benchmarks                        # compare with the baseline
+    python -m pytest benchmarks --update-baselines     # record a new baseline
+    python -m pytest benchmarks --perf-tolerance 1.0   # allow up to 2x slower
+"""
+import gc
+import json
+import os
+import statistics
+from pathlib import Path
+
+import pytest
+
+from common import QueryCounter, timed, reset_database, seed_catalog, seed_movements
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "perf_baseline.json"
+
+DATASET = {
+    "stations": int(os.environ.get("BENCH_STATIONS", 4)),  # one cabinet and one truck each
+    "items": int(os.environ.get("BENCH_ITEMS", 1000)),
+    "par_coverage": float(os.environ.get("BENCH_PAR_COVERAGE", 0.8)),
+    "tagged_per_item": int(os.environ.get("BENCH_TAGGED_PER_ITEM", 2)),
+    "history_years": float(os.environ.get("BENCH_HISTORY_YEARS", 1)),
+    "movements_per_day": int(os.environ.get("BENCH_MOVEMENTS_PER_DAY", 100)),
+}
+
+# Latency differences below this are timer and scheduler noise
+LATENCY_FLOOR_MS = 5.0
+# Share of extra SQL statements tolerated before a query count regresses
+QUERY_TOLERANCE = 0.1
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "performance regression suite")
+    group.addoption(
+        "--update-baselines", action="store_true",
+        help="record this run as the new baseline instead of comparing"
+    )
+    group.addoption(
+        "--perf-tolerance", type=float, default=float(os.environ.get("BENCH_TOLERANCE", 0.5)),
+        help="allowed median latency increase over the baseline (0.5 = 50%%)"
+    )
+    group.addoption(
+        "--perf-baseline", default=str(BASELINE_PATH),
+        help="baseline JSON file"
+    )
+
+
+class PerfRecorder:
+    """Measure calls and compare them with the recorded baseline"""
+
+    def __init__(self, baseline_path: Path, tolerance: float, update: bool):
+        self.baseline_path = baseline_path
+        self.tolerance = tolerance
+        self.update = update
+        self.baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        self.results = {}
+
+    def measure(self, name, call, repeat=5, warmup=1, setup=None):
+        """
+        Run call() warmup + repeat times and check the median against the baseline
+
+        When setup is given, each run calls call(setup()) and only the call
+        is measured. Query counts are the maximum over the measured runs.
+        Garbage is collected before each measured run, so a full collection
+        over the seeded dataset does not land inside one call at random.
+        """
+        for _ in range(warmup):
+            call(setup()) if setup else call()
+
+        latencies = []
+        queries = []
+        for _ in range(repeat):
+            args = (setup(),) if setup else ()
+            gc.collect()
+            with QueryCounter() as counter, timed() as elapsed:
+                call(*args)
+            latencies.append(elapsed["ms"])
+            queries.append(counter.count)
+
+        result = {"latency_ms": round(statistics.median(latencies), 2), "queries": max(queries)}
+        self.results[name] = result
+        self._check(name, result)
+        return result
+
+    def _check(self, name, result):
+        if self.update:
+            return
+        if self.baseline.get("dataset") != DATASET:
+            pytest.skip("baseline was recorded on a different dataset; run with --update-baselines")
+        expected = self.baseline.get("results", {}).get(name)
+        if expected is None:
+            pytest.skip(f"no baseline for {name}; run with --update-baselines")
+
+        problems = []
+        latency_limit = max(expected["latency_ms"] * (1 + self.tolerance), expected["latency_ms"] + LATENCY_FLOOR_MS)
+        if result["latency_ms"] > latency_limit:
+            problems.append(
+                f"median latency {result['latency_ms']:.1f} ms > {latency_limit:.1f} ms "
+                f"(baseline {expected['latency_ms']:.1f} ms)"
+            )
+        query_limit = int(expected["queries"] * (1 + QUERY_TOLERANCE))
+        if result["queries"] > query_limit:
+            problems.append(f"{result['queries']} queries > {query_limit} (baseline {expected['queries']})")
+        if problems:
+            pytest.fail(f"{name} regressed: " + "; ".join(problems))
+
+    def save(self):
+        self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        results = dict(self.baseline.get("results", {})) if self.baseline.get("dataset") == DATASET else {}
+        results.update(self.results)
+        self.baseline_path.write_text(
+            json.dumps({"dataset": DATASET, "results": dict(sorted(results.items()))}, indent=2) + "\n"
+        )
+
+
+@pytest.fixture(scope="session")
+def perf(pytestconfig):
+    recorder = PerfRecorder(
+        Path(pytestconfig.getoption("--perf-baseline")),
+        pytestconfig.getoption("--perf-tolerance"),
+        pytestconfig.getoption("--update-baselines"),
+    )
+    pytestconfig._perf_recorder = recorder
+    yield recorder
+    if recorder.update:
+        recorder.save()
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    """Seed the synthetic dataset once; returns the sizes plus the location ids"""
+    reset_database()
+    location_ids = seed_catalog(
+        DATASET["items"],
+        n_stations=DATASET["stations"],
+        tagged_per_item=DATASET["tagged_per_item"],
+        par_coverage=DATASET["par_coverage"],
+    )
+    movements = seed_movements(
+        days=int(DATASET["history_years"] * 365),
+        per_day=DATASET["movements_per_day"],
+    )
+    return {**DATASET, "location_ids": location_ids, "movement_rows": movements}
+
+
+@pytest.fixture(scope="session")
+def client(dataset):
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.main import app
+
+    # Measure the report queries, not cache hits
+    settings.REPORT_CACHE_ENABLED = False
+    # Keep the background config poll out of the query counts
+    settings.SYSTEM_CONFIG_POLL_SECONDS = 24 * 3600
+    # Background jobs are measured on their own, not inside request timings
+    settings.JOBS_ENABLED = False
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = getattr(config, "_perf_recorder", None)
+    if recorder is None or not recorder.results:
+        return
+    baseline = recorder.baseline.get("results", {}) if recorder.baseline.get("dataset") == DATASET else {}
+    terminalreporter.section("performance")
+    terminalreporter.write_line(f"{'measurement':<40} {'median ms':>10} {'baseline':>10} {'queries':>8} {'baseline':>9}")
+    for name, result in recorder.results.items():
+        expected = baseline.get(name, {})
+        terminalreporter.write_line(
+            f"{name:<40} {result['latency_ms']:>10.1f} {expected.get('latency_ms', float('nan')):>10.1f} "
+            f"{result['queries']:>8} {expected.get('queries', '-'):>9}"
+        )
+    if recorder.update:
+        terminalreporter.write_line(f"baseline written to {recorder.baseline_path}")
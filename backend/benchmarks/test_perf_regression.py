@@ -0,0 +1,163 @@
+"""
+Performance regression suite for the hot endpoints
+
+Each test measures one endpoint against the seeded dataset (see conftest.py)
+and fails when its median latency or query count regresses beyond the
+tolerance. Read endpoints run first; the scanner, expiration sweep and CSV
+import tests write to the database.
+"""
+import csv
+import io
+import itertools
+
+import pytest
+
+from app.api.v1 import reports
+
+SCAN_SWEEP = 200
+CSV_ROWS = 2000
+
+READ_ENDPOINTS = [
+    ("items_list", "/api/v1/items/?limit=100"),
+    ("items_list_station", "/api/v1/items/?station=station_1&limit=100"),
+    ("items_list_search", "/api/v1/items/?search=Item%2012&limit=100"),
+    ("reorder_suggestions", "/api/v1/orders/suggestions/reorder"),
+    ("inventory_current", "/api/v1/inventory/current?limit=100"),
+    ("inventory_low_stock", "/api/v1/inventory/low-stock"),
+    ("inventory_movements", "/api/v1/inventory/movements?limit=100"),
+    ("inventory_expiring_items", "/api/v1/inventory/expiring-items?days_ahead=90&limit=100"),
+    ("inventory_expired_items", "/api/v1/inventory/expired-items?limit=100"),
+    ("inventory_expiring_summary", "/api/v1/inventory/expiring-items/summary?days_ahead=90&group_by=lot"),
+    ("inventory_expired_summary", "/api/v1/inventory/expired-items/summary?group_by=location"),
+    ("locations_list", "/api/v1/locations/"),
+]
+
+# Every report without path parameters
+REPORT_ENDPOINTS = [
+    (f"report_{route.path.strip('/').replace('-', '_')}", f"/api/v1/reports{route.path}")
+    for route in reports.router.routes
+    if "GET" in route.methods and "{" not in route.path and route.path != "/cache-stats"
+]
+
+
+def get_ok(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, f"{url}: {response.status_code} {response.text[:200]}"
+    return response
+
+
+@pytest.mark.parametrize("name,url", READ_ENDPOINTS, ids=[name for name, _ in READ_ENDPOINTS])
+def test_read_endpoint(perf, client, name, url):
+    perf.measure(name, lambda: get_ok(client, url))
+
+
+@pytest.mark.parametrize("name,url", REPORT_ENDPOINTS, ids=[name for name, _ in REPORT_ENDPOINTS])
+def test_report(perf, client, name, url):
+    perf.measure(name, lambda: get_ok(client, url), repeat=3)
+
+
+def test_location_inventory(perf, client, dataset):
+    url = f"/api/v1/locations/{dataset['location_ids'][2]}/inventory"
+    perf.measure("location_inventory", lambda: get_ok(client, url))
+
+    etag = get_ok(client, url).headers["ETag"]
+
+    def revalidate():
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304, response.status_code
+
+    perf.measure("location_inventory_not_modified", revalidate)
+
+
+def test_scan_batch(perf, client, dataset):
+    # A fresh slice of tags per run so the duplicate-read window does not skip writes
+    n_tags = dataset["items"] * dataset["tagged_per_item"]
+    offsets = itertools.count(0, SCAN_SWEEP)
+
+    def next_sweep():
+        start = next(offsets)
+        return [{"tag_id": f"TAG{(start + n) % n_tags + 1:08d}", "scan_type": "rfid"} for n in range(SCAN_SWEEP)]
+
+    def scan(sweep):
+        response = client.post("/api/v1/rfid/scan/batch", json=sweep)
+        assert response.status_code == 200, response.text[:200]
+
+    perf.measure("scan_batch", scan, setup=next_sweep)
+
+
+def test_batch_receive(perf, client, dataset):
+    body = {
+        "location_id": str(dataset["location_ids"][0]),
+        "items": [{"barcode": f"ITEM-{n:06d}", "quantity": 2} for n in range(100)],
+    }
+
+    def receive():
+        response = client.post("/api/v1/rfid/batch-receive", json=body)
+        assert response.status_code == 200, response.text[:200]
+
+    perf.measure("batch_receive", receive)
+
+
+def test_inventory_count(perf, client, dataset):
+    scanned = {f"ITEM-{n:06d}": 5 for n in range(0, dataset["items"], 2)}
+    url = f"/api/v1/rfid/inventory-count?location_id={dataset['location_ids'][1]}"
+
+    def count():
+        response = client.post(url, json=scanned)
+        assert response.status_code == 200, response.text[:200]
+
+    perf.measure("inventory_count", count)
+
+
+def test_expiration_sweep(perf, client):
+    # The warmup run raises the notifications; measured runs find nothing new
+    from app.core.database import SessionLocal
+    from app.services.scheduler import get_job, run_job
+
+    job = get_job("expiration_sweep")
+    perf.measure("expiration_sweep", lambda: run_job(SessionLocal, job))
+
+
+def catalog_csv():
+    """Half updates of seeded items, half new items with stock for a location"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[
+        "item_code", "name", "category_id", "unit_of_measure", "cost_per_unit",
+        "location_name", "current_stock", "par_level", "reorder_level",
+    ])
+    writer.writeheader()
+    for n in range(CSV_ROWS):
+        code = f"ITEM-{n:06d}" if n % 2 == 0 else f"CSV-{n:06d}"
+        writer.writerow({
+            "item_code": code, "name": f"Imported {code}", "category_id": f"cat_{n % 5}",
+            "unit_of_measure": "EA", "cost_per_unit": "4.25",
+            "location_name": "Station 1", "current_stock": "12", "par_level": "20", "reorder_level": "6",
+        })
+    return buffer.getvalue().encode()
+
+
+def upload(client, content):
+    response = client.post(
+        "/api/v1/csv-import/preview",
+        files={"file": ("catalog.csv", content, "text/csv")}
+    )
+    assert response.status_code == 200, response.text[:200]
+    return response.json()["cache_key"]
+
+
+def test_csv_import_preview(perf, client):
+    content = catalog_csv()
+    perf.measure("csv_import_preview", lambda: upload(client, content), repeat=3)
+
+
+def test_csv_import_execute(perf, client):
+    content = catalog_csv()
+
+    def execute(cache_key):
+        response = client.post(
+            f"/api/v1/csv-import/execute?cache_key={cache_key}",
+            json={"conflict_resolution": "replace"}
+        )
+        assert response.status_code == 200, response.text[:200]
+
+    perf.measure("csv_import_execute", execute, repeat=3, setup=lambda: upload(client, content))
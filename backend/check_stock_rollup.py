@@ -0,0 +1,67 @@
+"""
+Check the materialized item stock rollup and the par breach table against
+live inventory data
+
+Usage:
+    python check_stock_rollup.py            # report differences
+    python check_stock_rollup.py --repair   # rebuild whatever drifted
+"""
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+import app.models  # noqa: F401 - register all models
+from app.core.database import SessionLocal
+from app.services.stock_rollup import check_rollup_consistency
+from app.services.par_breach import refresh_par_breaches
+
+
+def check_par_breaches(db, repair: bool) -> bool:
+    """Reconcile par_breaches with live stock; changes are kept only with repair"""
+    transitions = refresh_par_breaches(db)
+    missing, stale, orphaned = (len(transitions[key]) for key in ("inserted", "updated", "exited"))
+    if repair:
+        db.commit()
+    else:
+        db.rollback()
+    if not missing and not stale and not orphaned:
+        print("✓ Par breaches match live inventory")
+        return True
+    print(f"✗ Par breaches: {missing} missing, {stale} stale, {orphaned} no longer in breach")
+    if repair:
+        print("✓ Par breaches rebuilt")
+    return repair
+
+
+def main():
+    repair = "--repair" in sys.argv[1:]
+    db = SessionLocal()
+
+    try:
+        breaches_ok = check_par_breaches(db, repair)
+        differences = check_rollup_consistency(db, repair=repair)
+
+        if not differences:
+            print("✓ Stock rollup matches live inventory")
+            return 0 if breaches_ok else 1
+
+        print(f"✗ {len(differences)} rollup rows differ from live inventory")
+        for diff in differences[:50]:
+            detail = diff.get("fields") or diff.get("expected")
+            print(f"  - {diff['item_id']} [{diff['station_group']}] {diff['issue']}: {detail}")
+        if len(differences) > 50:
+            print(f"  ... and {len(differences) - 50} more")
+
+        if repair:
+            print("✓ Stock rollup rebuilt")
+            return 0
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Index advisor for the report and list endpoints
+
+Calls every GET endpoint without path parameters (plus any extra URLs given
+on the command line), captures the SELECT statements each one issues and
+runs EXPLAIN on them against the configured database. Full table scans are
+flagged: "SCAN <table>" without an index on SQLite, "Seq Scan on <table>" on
+PostgreSQL. Run it against a database with realistic data; planners pick
+scans for tiny tables regardless of the indexes available.
+
+Usage:
+    python index_advisor.py                                   # all list/report endpoints
+    python index_advisor.py "/api/v1/inventory/movements?item_id=<uuid>"
+    python index_advisor.py --verbose                         # print every plan
+"""
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api.v1.auth import DevUser, get_current_user
+from app.core.config import settings
+from app.core.database import engine
+from app.core.lazy_routes import load_lazy_routers
+from app.main import app
+
+SQLITE_SCAN = re.compile(r"\bSCAN (?:TABLE )?(\w+)(?! USING (?:COVERING )?INDEX)(?!\w)")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+# Plan steps that read no base table: constant rows and derived-table aliases
+NOT_TABLES = re.compile(r"^(?:CONSTANT|anon_\d+)$")
+
+# Endpoints that change state or stream whole tables by design
+SKIPPED_PREFIXES = ("/api/v1/exports", "/api/v1/auth")
+
+
+def endpoint_urls():
+    """GET endpoints under /api/v1 that take no path parameters"""
+    load_lazy_routers(app)
+    urls = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        if "{" in route.path or not route.path.startswith("/api/v1"):
+            continue
+        if route.path.startswith(SKIPPED_PREFIXES):
+            continue
+        urls.append(route.path)
+    return sorted(set(urls))
+
+
+def capture_statements(client, url):
+    """SELECT statements (with parameters) issued while serving url"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return response.status_code, statements
+
+
+def explain(statement, parameters):
+    """Plan lines for statement on the configured database"""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if engine.dialect.name == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+
+def sequential_scans(plan):
+    pattern = SQLITE_SCAN if engine.dialect.name == "sqlite" else POSTGRES_SCAN
+    return [
+        match.group(1) for line in plan for match in pattern.finditer(line)
+        if not NOT_TABLES.match(match.group(1))
+    ]
+
+
+def main():
+    args = sys.argv[1:]
+    verbose = "--verbose" in args
+    urls = [arg for arg in args if arg != "--verbose"] or endpoint_urls()
+
+    # Run the real queries rather than serving cached report payloads
+    settings.REPORT_CACHE_ENABLED = False
+    app.dependency_overrides[get_current_user] = DevUser
+    client = TestClient(app, raise_server_exceptions=False)
+
+    scans_by_table = defaultdict(set)
+    for url in urls:
+        status_code, statements = capture_statements(client, url)
+        flagged = []
+        explained = set()
+        for statement, parameters in statements:
+            # N+1 loops repeat one statement; its plan does not change
+            if statement in explained:
+                continue
+            explained.add(statement)
+            plan = explain(statement, parameters)
+            tables = sequential_scans(plan)
+            if tables or verbose:
+                flagged.append((statement, plan, tables))
+            for table in tables:
+                scans_by_table[table].add(url)
+
+        marker = "✗" if any(tables for _, _, tables in flagged) else "✓"
+        print(f"{marker} {url} [{status_code}] {len(statements)} queries")
+        for statement, plan, tables in flagged:
+            if tables:
+                print(f"    sequential scan on {', '.join(sorted(set(tables)))}")
+            print("      " + " ".join(statement.split())[:200])
+            for line in plan:
+                print(f"        {line}")
+
+    print("-" * 50)
+    if not scans_by_table:
+        print("✓ No sequential scans found")
+        return
+    print("Tables scanned sequentially:")
+    for table, table_urls in sorted(scans_by_table.items(), key=lambda entry: -len(entry[1])):
+        print(f"  {table:<30} {len(table_urls)} endpoint(s)")
+
+
+if __name__ == "__main__":
+    main()
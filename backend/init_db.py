@@ -1,6 +1,8 @@
 """
 Initialize database and create default admin user
-Run this before starting the application for the first time
+Run this before starting the application; the API does not create tables
+on import. Applies the Alembic migrations in migrations/versions up to the
+latest revision. Safe to re-run: existing tables and users are kept.
 """
 import sys
 from pathlib import Path
@@ -9,15 +11,45 @@ from pathlib import Path
 backend_dir = Path(__file__).resolve().parent
 sys.path.insert(0, str(backend_dir))
 
-from app.core.database import engine, SessionLocal, Base
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.core.database import engine, SessionLocal
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole
+from app.services.movement_rollup import refresh_movement_daily
+
+# Revision matching the schema that Base.metadata.create_all() used to build
+BASELINE_REVISION = "0001"
+
 
 def init_db():
-    """Initialize database tables"""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✓ Database tables created")
+    """Bring the database schema up to the latest migration"""
+    config = Config(str(backend_dir / "alembic.ini"))
+    config.set_main_option("script_location", str(backend_dir / "migrations"))
+
+    tables = inspect(engine).get_table_names()
+    if tables and "alembic_version" not in tables:
+        # Database created by create_all() before migrations existed
+        print(f"Stamping existing database at baseline revision {BASELINE_REVISION}...")
+        command.stamp(config, BASELINE_REVISION)
+
+    print("Applying database migrations...")
+    command.upgrade(config, "head")
+    print("✓ Database schema up to date")
+
+def backfill_movement_daily():
+    """Build the movement_daily fact table from the movement log if it was never built"""
+    db = SessionLocal()
+    try:
+        buckets = refresh_movement_daily(db)
+        if buckets < 0:
+            print("✓ movement_daily backfilled")
+        else:
+            print("✓ movement_daily up to date")
+    finally:
+        db.close()
 
 def create_admin_user():
     """Create default admin user if it doesn't exist"""
@@ -57,6 +89,7 @@ if __name__ == "__main__":
     print("Initializing EMS Supply Tracking Database...")
     print("-" * 50)
     init_db()
+    backfill_movement_daily()
     create_admin_user()
     print("-" * 50)
     print("✓ Database initialization complete!")
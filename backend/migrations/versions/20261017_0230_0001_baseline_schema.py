@@ -0,0 +1,477 @@
+"""baseline schema
+
+Tables and indexes as they stood before migrations were introduced. Existing
+databases built with Base.metadata.create_all() are stamped at this revision
+by init_db.py instead of running it.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 02:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('categories',
+    sa.Column('id', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.Column('color', sa.String(length=7), nullable=True),
+    sa.Column('sort_order', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_categories_id'), 'categories', ['id'], unique=False)
+    op.create_table('employees',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('employee_id', sa.String(length=50), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('department', sa.String(length=100), nullable=True),
+    sa.Column('position', sa.String(length=100), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('hire_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_index(op.f('ix_employees_employee_id'), 'employees', ['employee_id'], unique=True)
+    op.create_table('locations',
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('type', sa.Enum('SUPPLY_STATION', 'STATION_CABINET', 'VEHICLE', name='locationtype'), nullable=False),
+    sa.Column('parent_location_id', sa.UUID(), nullable=True),
+    sa.Column('address', sa.String(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['parent_location_id'], ['locations.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_locations_name'), 'locations', ['name'], unique=False)
+    op.create_table('users',
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('role', sa.Enum('ADMIN', 'USER', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('vendors',
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('contact_name', sa.String(length=255), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('address', sa.String(length=500), nullable=True),
+    sa.Column('website', sa.String(length=255), nullable=True),
+    sa.Column('notes', sa.String(length=1000), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_vendors_name'), 'vendors', ['name'], unique=True)
+    op.create_table('assets',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('asset_tag', sa.String(length=100), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('manufacturer', sa.String(length=255), nullable=True),
+    sa.Column('model', sa.String(length=255), nullable=True),
+    sa.Column('serial_number', sa.String(length=255), nullable=True),
+    sa.Column('purchase_date', sa.DateTime(), nullable=True),
+    sa.Column('purchase_price', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('warranty_expiration', sa.DateTime(), nullable=True),
+    sa.Column('condition', sa.String(length=50), nullable=False),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('employee_id', sa.String(), nullable=True),
+    sa.Column('assigned_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_assets_asset_tag'), 'assets', ['asset_tag'], unique=True)
+    op.create_index(op.f('ix_assets_serial_number'), 'assets', ['serial_number'], unique=False)
+    op.create_table('audit_logs',
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('entity_type', sa.String(length=100), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=True),
+    sa.Column('action', sa.Enum('CREATE', 'READ', 'UPDATE', 'DELETE', 'SCAN', 'LOGIN', 'LOGOUT', name='auditaction'), nullable=False),
+    sa.Column('changes', sa.JSON(), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.String(length=500), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_audit_logs_entity_type'), 'audit_logs', ['entity_type'], unique=False)
+    op.create_index(op.f('ix_audit_logs_timestamp'), 'audit_logs', ['timestamp'], unique=False)
+    op.create_table('form_templates',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('fields', sa.JSON(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('requires_signature', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('internal_orders',
+    sa.Column('order_number', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'ORDER_RECEIVED', 'OUT_FOR_DELIVERY', 'COMPLETED', 'CANCELLED', name='internalorderstatus'), nullable=False),
+    sa.Column('order_date', sa.DateTime(), nullable=False),
+    sa.Column('completed_date', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.UUID(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('location_details', sa.JSON(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_internal_orders_order_number'), 'internal_orders', ['order_number'], unique=True)
+    op.create_table('items',
+    sa.Column('item_code', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.String(length=1000), nullable=True),
+    sa.Column('category_id', sa.String(length=50), nullable=True),
+    sa.Column('unit_of_measure', sa.String(length=50), nullable=False),
+    sa.Column('requires_expiration_tracking', sa.Boolean(), nullable=False),
+    sa.Column('is_controlled_substance', sa.Boolean(), nullable=False),
+    sa.Column('manufacturer', sa.String(length=255), nullable=True),
+    sa.Column('manufacturer_part_number', sa.String(length=255), nullable=True),
+    sa.Column('cost_per_unit', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('supplier_name', sa.String(length=255), nullable=True),
+    sa.Column('supplier_contact', sa.String(length=255), nullable=True),
+    sa.Column('supplier_email', sa.String(length=255), nullable=True),
+    sa.Column('supplier_phone', sa.String(length=50), nullable=True),
+    sa.Column('supplier_website', sa.String(length=500), nullable=True),
+    sa.Column('supplier_account_number', sa.String(length=100), nullable=True),
+    sa.Column('minimum_order_quantity', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('max_reorder_quantity_per_station', sa.Integer(), nullable=True),
+    sa.Column('order_unit', sa.String(length=100), nullable=True),
+    sa.Column('lead_time_days', sa.Numeric(precision=5, scale=0), nullable=True),
+    sa.Column('preferred_vendor', sa.String(length=255), nullable=True),
+    sa.Column('alternate_vendor', sa.String(length=255), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_items_item_code'), 'items', ['item_code'], unique=True)
+    op.create_index(op.f('ix_items_name'), 'items', ['name'], unique=False)
+    op.create_table('notifications',
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('type', sa.Enum('LOW_STOCK', 'EXPIRATION_WARNING', 'EXPIRATION_CRITICAL', 'ORDER_RECEIVED', 'ORDER_PLACED', 'PAR_LEVEL_BREACH', 'SYSTEM_ALERT', name='notificationtype'), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.String(length=1000), nullable=False),
+    sa.Column('severity', sa.Enum('INFO', 'WARNING', 'CRITICAL', name='notificationseverity'), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=False),
+    sa.Column('related_entity_type', sa.String(length=100), nullable=True),
+    sa.Column('related_entity_id', sa.UUID(), nullable=True),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_table('purchase_orders',
+    sa.Column('po_number', sa.String(length=100), nullable=False),
+    sa.Column('vendor_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'ORDERED', 'SHIPPED', 'PARTIAL', 'RECEIVED', 'CANCELLED', name='orderstatus'), nullable=False),
+    sa.Column('order_date', sa.DateTime(), nullable=False),
+    sa.Column('expected_delivery_date', sa.DateTime(), nullable=True),
+    sa.Column('received_date', sa.DateTime(), nullable=True),
+    sa.Column('total_cost', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('created_by', sa.UUID(), nullable=True),
+    sa.Column('tracking_number', sa.String(length=100), nullable=True),
+    sa.Column('carrier', sa.Enum('UPS', 'FEDEX', 'USPS', 'DHL', 'AMAZON', 'ONTRAC', 'OTHER', name='shippingcarrier'), nullable=True),
+    sa.Column('carrier_other', sa.String(length=100), nullable=True),
+    sa.Column('shipped_date', sa.DateTime(), nullable=True),
+    sa.Column('tracking_url', sa.String(length=500), nullable=True),
+    sa.Column('shipping_notes', sa.Text(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['vendor_id'], ['vendors.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_purchase_orders_po_number'), 'purchase_orders', ['po_number'], unique=True)
+    op.create_index(op.f('ix_purchase_orders_tracking_number'), 'purchase_orders', ['tracking_number'], unique=False)
+    op.create_table('auto_order_rules',
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('trigger_quantity', sa.Integer(), nullable=False),
+    sa.Column('order_quantity', sa.Integer(), nullable=False),
+    sa.Column('preferred_vendor_id', sa.UUID(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['preferred_vendor_id'], ['vendors.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id'),
+    sa.UniqueConstraint('item_id')
+    )
+    op.create_table('form_submissions',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('template_id', sa.String(), nullable=False),
+    sa.Column('submitted_by', sa.String(), nullable=True),
+    sa.Column('submitted_by_name', sa.String(length=255), nullable=True),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.Column('signature', sa.Text(), nullable=True),
+    sa.Column('signature_name', sa.String(length=255), nullable=True),
+    sa.Column('signature_date', sa.DateTime(), nullable=True),
+    sa.Column('location_id', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('reviewed_by', sa.String(), nullable=True),
+    sa.Column('reviewed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.ForeignKeyConstraint(['reviewed_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['submitted_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['template_id'], ['form_templates.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('internal_order_items',
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('location_id', sa.UUID(), nullable=False),
+    sa.Column('quantity_needed', sa.Integer(), nullable=False),
+    sa.Column('quantity_delivered', sa.Integer(), nullable=False),
+    sa.Column('current_stock', sa.Integer(), nullable=True),
+    sa.Column('par_level', sa.Integer(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['order_id'], ['internal_orders.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_table('inventory_current',
+    sa.Column('location_id', sa.UUID(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('quantity_on_hand', sa.Integer(), nullable=False),
+    sa.Column('quantity_allocated', sa.Integer(), nullable=False),
+    sa.Column('expiration_date', sa.DateTime(), nullable=True),
+    sa.Column('last_counted_at', sa.DateTime(), nullable=True),
+    sa.Column('last_counted_by', sa.UUID(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['last_counted_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id'),
+    sa.UniqueConstraint('location_id', 'item_id', name='unique_location_item_inventory')
+    )
+    op.create_table('inventory_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('location_id', sa.UUID(), nullable=False),
+    sa.Column('rfid_tag', sa.String(length=255), nullable=False),
+    sa.Column('expiration_date', sa.TIMESTAMP(), nullable=True),
+    sa.Column('lot_number', sa.String(length=100), nullable=True),
+    sa.Column('truck_location', sa.String(length=100), nullable=True),
+    sa.Column('received_date', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_inventory_items_id'), 'inventory_items', ['id'], unique=False)
+    op.create_index(op.f('ix_inventory_items_item_id'), 'inventory_items', ['item_id'], unique=False)
+    op.create_index(op.f('ix_inventory_items_location_id'), 'inventory_items', ['location_id'], unique=False)
+    op.create_index(op.f('ix_inventory_items_rfid_tag'), 'inventory_items', ['rfid_tag'], unique=True)
+    op.create_table('par_levels',
+    sa.Column('location_id', sa.UUID(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('par_quantity', sa.Integer(), nullable=False),
+    sa.Column('reorder_quantity', sa.Integer(), nullable=False),
+    sa.Column('max_quantity', sa.Integer(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id'),
+    sa.UniqueConstraint('location_id', 'item_id', name='unique_location_item_par')
+    )
+    op.create_table('purchase_order_items',
+    sa.Column('po_id', sa.UUID(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('quantity_ordered', sa.Integer(), nullable=False),
+    sa.Column('quantity_received', sa.Integer(), nullable=False),
+    sa.Column('unit_cost', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('total_cost', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['po_id'], ['purchase_orders.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_table('rfid_tags',
+    sa.Column('tag_id', sa.String(length=255), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('current_location_id', sa.UUID(), nullable=True),
+    sa.Column('status', sa.Enum('IN_STOCK', 'IN_USE', 'DEPLETED', 'EXPIRED', 'DISPOSED', name='tagstatus'), nullable=False),
+    sa.Column('expiration_date', sa.DateTime(), nullable=True),
+    sa.Column('lot_number', sa.String(length=100), nullable=True),
+    sa.Column('received_date', sa.DateTime(), nullable=False),
+    sa.Column('cost', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['current_location_id'], ['locations.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_rfid_tags_tag_id'), 'rfid_tags', ['tag_id'], unique=True)
+    op.create_table('controlled_substance_logs',
+    sa.Column('rfid_tag_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('action', sa.Enum('RECEIVE', 'DISPENSE', 'WASTE', 'COUNT', 'TRANSFER', name='substanceaction'), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('patient_encounter_id', sa.String(length=255), nullable=True),
+    sa.Column('witness_user_id', sa.UUID(), nullable=True),
+    sa.Column('notes', sa.String(length=1000), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['rfid_tag_id'], ['rfid_tags.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['witness_user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_controlled_substance_logs_timestamp'), 'controlled_substance_logs', ['timestamp'], unique=False)
+    op.create_table('inventory_movements',
+    sa.Column('rfid_tag_id', sa.UUID(), nullable=True),
+    sa.Column('item_id', sa.UUID(), nullable=True),
+    sa.Column('from_location_id', sa.UUID(), nullable=True),
+    sa.Column('to_location_id', sa.UUID(), nullable=True),
+    sa.Column('movement_type', sa.Enum('RECEIVE', 'TRANSFER', 'USE', 'DISPOSE', 'RESTOCK', 'ADJUSTMENT', name='movementtype'), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('reference_number', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.String(length=1000), nullable=True),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['from_location_id'], ['locations.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['rfid_tag_id'], ['rfid_tags.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['to_location_id'], ['locations.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_index(op.f('ix_inventory_movements_timestamp'), 'inventory_movements', ['timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_inventory_movements_timestamp'), table_name='inventory_movements')
+    op.drop_table('inventory_movements')
+    op.drop_index(op.f('ix_controlled_substance_logs_timestamp'), table_name='controlled_substance_logs')
+    op.drop_table('controlled_substance_logs')
+    op.drop_index(op.f('ix_rfid_tags_tag_id'), table_name='rfid_tags')
+    op.drop_table('rfid_tags')
+    op.drop_table('purchase_order_items')
+    op.drop_table('par_levels')
+    op.drop_index(op.f('ix_inventory_items_rfid_tag'), table_name='inventory_items')
+    op.drop_index(op.f('ix_inventory_items_location_id'), table_name='inventory_items')
+    op.drop_index(op.f('ix_inventory_items_item_id'), table_name='inventory_items')
+    op.drop_index(op.f('ix_inventory_items_id'), table_name='inventory_items')
+    op.drop_table('inventory_items')
+    op.drop_table('inventory_current')
+    op.drop_table('internal_order_items')
+    op.drop_table('form_submissions')
+    op.drop_table('auto_order_rules')
+    op.drop_index(op.f('ix_purchase_orders_tracking_number'), table_name='purchase_orders')
+    op.drop_index(op.f('ix_purchase_orders_po_number'), table_name='purchase_orders')
+    op.drop_table('purchase_orders')
+    op.drop_table('notifications')
+    op.drop_index(op.f('ix_items_name'), table_name='items')
+    op.drop_index(op.f('ix_items_item_code'), table_name='items')
+    op.drop_table('items')
+    op.drop_index(op.f('ix_internal_orders_order_number'), table_name='internal_orders')
+    op.drop_table('internal_orders')
+    op.drop_table('form_templates')
+    op.drop_index(op.f('ix_audit_logs_timestamp'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_entity_type'), table_name='audit_logs')
+    op.drop_table('audit_logs')
+    op.drop_index(op.f('ix_assets_serial_number'), table_name='assets')
+    op.drop_index(op.f('ix_assets_asset_tag'), table_name='assets')
+    op.drop_table('assets')
+    op.drop_index(op.f('ix_vendors_name'), table_name='vendors')
+    op.drop_table('vendors')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_locations_name'), table_name='locations')
+    op.drop_table('locations')
+    op.drop_index(op.f('ix_employees_employee_id'), table_name='employees')
+    op.drop_table('employees')
+    op.drop_index(op.f('ix_categories_id'), table_name='categories')
+    op.drop_table('categories')
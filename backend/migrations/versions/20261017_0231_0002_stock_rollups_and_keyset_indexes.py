@@ -0,0 +1,100 @@
+"""stock rollups, movement daily facts and keyset indexes
+
+Databases created with Base.metadata.create_all() after these models were
+added already have some of these objects, so each one is created only when
+it is missing.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 02:31:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name):
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_index(table, name):
+    return any(index['name'] == name for index in sa.inspect(op.get_bind()).get_indexes(table))
+
+
+def _has_column(table, name):
+    return any(column['name'] == name for column in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    if not _has_table('rollup_watermarks'):
+        op.create_table('rollup_watermarks',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_processed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+        )
+    if not _has_table('item_stock_rollup'):
+        op.create_table('item_stock_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('item_id', sa.UUID(), nullable=False),
+        sa.Column('station_group', sa.String(length=50), nullable=False),
+        sa.Column('quantity_on_hand', sa.Integer(), nullable=False),
+        sa.Column('quantity_allocated', sa.Integer(), nullable=False),
+        sa.Column('quantity_available', sa.Integer(), nullable=False),
+        sa.Column('total_par', sa.Integer(), nullable=False),
+        sa.Column('total_reorder', sa.Integer(), nullable=False),
+        sa.Column('par_location_count', sa.Integer(), nullable=False),
+        sa.Column('locations_below_reorder', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('item_id', 'station_group', name='unique_item_station_group_rollup')
+        )
+        op.create_index(op.f('ix_item_stock_rollup_id'), 'item_stock_rollup', ['id'], unique=False)
+        op.create_index(op.f('ix_item_stock_rollup_item_id'), 'item_stock_rollup', ['item_id'], unique=False)
+    if not _has_table('movement_daily'):
+        op.create_table('movement_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('item_id', sa.UUID(), nullable=False),
+        sa.Column('location_id', sa.UUID(), nullable=True),
+        sa.Column('used', sa.Integer(), nullable=False),
+        sa.Column('received', sa.Integer(), nullable=False),
+        sa.Column('adjusted', sa.Integer(), nullable=False),
+        sa.Column('movement_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('date', 'item_id', 'location_id', name='unique_movement_daily_bucket')
+        )
+        op.create_index(op.f('ix_movement_daily_date'), 'movement_daily', ['date'], unique=False)
+        op.create_index(op.f('ix_movement_daily_id'), 'movement_daily', ['id'], unique=False)
+        op.create_index(op.f('ix_movement_daily_item_id'), 'movement_daily', ['item_id'], unique=False)
+    if not _has_column('rfid_tags', 'last_scanned_at'):
+        op.add_column('rfid_tags', sa.Column('last_scanned_at', sa.DateTime(), nullable=True))
+    if not _has_index('inventory_movements', 'ix_inventory_movements_created_at_id'):
+        op.create_index('ix_inventory_movements_created_at_id', 'inventory_movements', ['created_at', 'id'], unique=False)
+    if not _has_index('audit_logs', 'ix_audit_logs_timestamp_id'):
+        op.create_index('ix_audit_logs_timestamp_id', 'audit_logs', ['timestamp', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_timestamp_id', table_name='audit_logs')
+    op.drop_index('ix_inventory_movements_created_at_id', table_name='inventory_movements')
+    with op.batch_alter_table('rfid_tags') as batch_op:
+        batch_op.drop_column('last_scanned_at')
+    op.drop_index(op.f('ix_movement_daily_item_id'), table_name='movement_daily')
+    op.drop_index(op.f('ix_movement_daily_id'), table_name='movement_daily')
+    op.drop_index(op.f('ix_movement_daily_date'), table_name='movement_daily')
+    op.drop_table('movement_daily')
+    op.drop_index(op.f('ix_item_stock_rollup_item_id'), table_name='item_stock_rollup')
+    op.drop_index(op.f('ix_item_stock_rollup_id'), table_name='item_stock_rollup')
+    op.drop_table('item_stock_rollup')
+    op.drop_table('rollup_watermarks')
@@ -0,0 +1,42 @@
+"""composite indexes for hot report and list filters
+
+Movement history per item and per location, expiration lookups, par levels
+by item, audit activity per user and form submissions per template.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 02:32:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_inventory_movements_item_id_created_at', 'inventory_movements', ['item_id', 'created_at']),
+    ('ix_inventory_movements_from_location_id_created_at', 'inventory_movements', ['from_location_id', 'created_at']),
+    ('ix_inventory_movements_to_location_id_created_at', 'inventory_movements', ['to_location_id', 'created_at']),
+    ('ix_inventory_items_item_id_location_id_expiration_date', 'inventory_items', ['item_id', 'location_id', 'expiration_date']),
+    ('ix_par_levels_item_id', 'par_levels', ['item_id']),
+    ('ix_audit_logs_user_id_timestamp', 'audit_logs', ['user_id', 'timestamp']),
+    ('ix_form_submissions_template_id_created_at', 'form_submissions', ['template_id', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        # Skip indexes already created by Base.metadata.create_all()
+        if not any(index['name'] == name for index in inspector.get_indexes(table)):
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
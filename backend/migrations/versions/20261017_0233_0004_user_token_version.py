@@ -0,0 +1,30 @@
+"""user token version
+
+Bumped on logout, password reset and deactivation to revoke every token
+issued to the user before it.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 02:33:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = [column['name'] for column in sa.inspect(op.get_bind()).get_columns('users')]
+    if 'token_version' not in columns:
+        op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('token_version')
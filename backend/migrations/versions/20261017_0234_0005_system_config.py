@@ -0,0 +1,36 @@
+"""system config table
+
+Stores the system configuration document with a version that workers poll
+to refresh their in-memory copy.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 02:34:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('system_config'):
+        op.create_table('system_config',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_by', sa.UUID(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['updated_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('name')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('system_config')
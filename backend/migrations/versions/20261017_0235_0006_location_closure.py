@@ -0,0 +1,52 @@
+"""location closure table
+
+Ancestor/descendant pairs of the location hierarchy, backfilled from
+locations.parent_location_id.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 02:35:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table('location_closure'):
+        return
+    closure = op.create_table('location_closure',
+    sa.Column('ancestor_id', sa.UUID(), nullable=False),
+    sa.Column('descendant_id', sa.UUID(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('ix_location_closure_descendant_id_depth', 'location_closure', ['descendant_id', 'depth'], unique=False)
+
+    locations = sa.table('locations', sa.column('id', sa.UUID()), sa.column('parent_location_id', sa.UUID()))
+    parents = dict(bind.execute(sa.select(locations.c.id, locations.c.parent_location_id)).all())
+    rows = []
+    for location_id in parents:
+        seen = set()
+        ancestor_id, depth = location_id, 0
+        while ancestor_id is not None and ancestor_id in parents and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append({'ancestor_id': ancestor_id, 'descendant_id': location_id, 'depth': depth})
+            ancestor_id, depth = parents[ancestor_id], depth + 1
+    if rows:
+        op.bulk_insert(closure, rows)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_location_closure_descendant_id_depth', table_name='location_closure')
+    op.drop_table('location_closure')
@@ -0,0 +1,32 @@
+"""inventory items expiration window index
+
+Range scans on expiration_date for the expiring and expired endpoints,
+with location_id alongside so location filters are checked in the index.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 02:36:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_inventory_items_expiration_date_location_id'
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Skip the index if Base.metadata.create_all() already created it
+    if not any(index['name'] == INDEX_NAME for index in inspector.get_indexes('inventory_items')):
+        op.create_index(INDEX_NAME, 'inventory_items', ['expiration_date', 'location_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name='inventory_items')
@@ -0,0 +1,50 @@
+"""job runs and notification dedup keys
+
+Run history of the background job scheduler, and a unique key on
+notifications so the expiration sweep reports each condition once.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 02:37:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('job_runs'):
+        op.create_table('job_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_name', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.Enum('RUNNING', 'SUCCEEDED', 'FAILED', name='jobstatus'), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_ms', sa.Integer(), nullable=True),
+        sa.Column('stats', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_job_runs_id'), 'job_runs', ['id'], unique=False)
+        op.create_index('ix_job_runs_job_name_started_at', 'job_runs', ['job_name', 'started_at'], unique=False)
+
+    if 'dedup_key' not in [column['name'] for column in inspector.get_columns('notifications')]:
+        op.add_column('notifications', sa.Column('dedup_key', sa.String(length=255), nullable=True))
+        op.create_index(op.f('ix_notifications_dedup_key'), 'notifications', ['dedup_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_notifications_dedup_key'), table_name='notifications')
+    with op.batch_alter_table('notifications') as batch_op:
+        batch_op.drop_column('dedup_key')
+    op.drop_index('ix_job_runs_job_name_started_at', table_name='job_runs')
+    op.drop_index(op.f('ix_job_runs_id'), table_name='job_runs')
+    op.drop_table('job_runs')
@@ -0,0 +1,80 @@
+"""par breach state table
+
+(item, location) pairs currently below par or reorder, maintained on
+inventory writes and read by the low-stock endpoints. Backfilled from par
+levels and current stock, missing stock counting as 0.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 02:38:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table('par_breaches'):
+        return
+    breaches = op.create_table('par_breaches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('location_id', sa.UUID(), nullable=False),
+    sa.Column('quantity_available', sa.Integer(), nullable=False),
+    sa.Column('par_quantity', sa.Integer(), nullable=False),
+    sa.Column('reorder_quantity', sa.Integer(), nullable=False),
+    sa.Column('below_reorder', sa.Boolean(), nullable=False),
+    sa.Column('entered_at', sa.DateTime(), nullable=False),
+    sa.Column('below_reorder_since', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('item_id', 'location_id', name='unique_item_location_par_breach')
+    )
+    op.create_index(op.f('ix_par_breaches_id'), 'par_breaches', ['id'], unique=False)
+    op.create_index('ix_par_breaches_location_id', 'par_breaches', ['location_id'], unique=False)
+
+    inventory = sa.table('inventory_current',
+        sa.column('item_id', sa.UUID()), sa.column('location_id', sa.UUID()),
+        sa.column('quantity_on_hand', sa.Integer()), sa.column('quantity_allocated', sa.Integer()))
+    par_levels = sa.table('par_levels',
+        sa.column('item_id', sa.UUID()), sa.column('location_id', sa.UUID()),
+        sa.column('par_quantity', sa.Integer()), sa.column('reorder_quantity', sa.Integer()))
+    available = (sa.func.coalesce(inventory.c.quantity_on_hand, 0)
+                 - sa.func.coalesce(inventory.c.quantity_allocated, 0))
+    rows = bind.execute(
+        sa.select(par_levels.c.item_id, par_levels.c.location_id, available,
+                  par_levels.c.par_quantity, par_levels.c.reorder_quantity)
+        .select_from(par_levels)
+        .outerjoin(inventory, sa.and_(inventory.c.item_id == par_levels.c.item_id,
+                                      inventory.c.location_id == par_levels.c.location_id))
+        .where(sa.or_(available < par_levels.c.par_quantity, available < par_levels.c.reorder_quantity))
+    ).all()
+    now = datetime.utcnow()
+    if rows:
+        op.bulk_insert(breaches, [
+            {
+                'item_id': item_id, 'location_id': location_id, 'quantity_available': quantity,
+                'par_quantity': par_quantity, 'reorder_quantity': reorder_quantity,
+                'below_reorder': quantity < reorder_quantity, 'entered_at': now,
+                'below_reorder_since': now if quantity < reorder_quantity else None, 'updated_at': now,
+            }
+            for item_id, location_id, quantity, par_quantity, reorder_quantity in rows
+        ])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_par_breaches_location_id', table_name='par_breaches')
+    op.drop_index(op.f('ix_par_breaches_id'), table_name='par_breaches')
+    op.drop_table('par_breaches')
@@ -0,0 +1,32 @@
+"""inventory movements updated_at index
+
+Index for the movement_daily rollup, which reads the movements changed
+since its watermark on every report request and job run.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 02:39:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_inventory_movements_updated_at'
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Skip the index if Base.metadata.create_all() already created it
+    if not any(index['name'] == INDEX_NAME for index in inspector.get_indexes('inventory_movements')):
+        op.create_index(INDEX_NAME, 'inventory_movements', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name='inventory_movements')
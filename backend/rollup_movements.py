@@ -0,0 +1,42 @@
+"""
+Maintain the movement_daily fact table
+
+Usage:
+    python rollup_movements.py                  # incremental run from the watermark
+    python rollup_movements.py --backfill       # rebuild the whole history
+    python rollup_movements.py --backfill 30    # rebuild the last 30 days only
+"""
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+import app.models  # noqa: F401 - register all models
+from app.core.database import SessionLocal
+from app.services.movement_rollup import rebuild_movement_daily, refresh_movement_daily
+
+
+def main():
+    args = sys.argv[1:]
+    db = SessionLocal()
+
+    try:
+        if args and args[0] == "--backfill":
+            if len(args) > 1:
+                start_day = date.today() - timedelta(days=int(args[1]))
+                written = rebuild_movement_daily(db, start_day, date.today() + timedelta(days=1))
+            else:
+                written = rebuild_movement_daily(db)
+            print(f"✓ Backfilled movement_daily: {written} buckets")
+        else:
+            buckets = refresh_movement_daily(db)
+            print(f"✓ movement_daily refreshed: {max(buckets, 0)} buckets re-aggregated")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
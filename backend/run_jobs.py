@@ -0,0 +1,51 @@
+"""
+Run the scheduled background jobs (expiration sweep, movement rollup)
+
+Run this as one process next to the API workers (which leave JOBS_ENABLED
+off) so only one place sweeps; without arguments it runs every job on its
+interval until stopped.
+
+Usage:
+    python run_jobs.py                        # run forever
+    python run_jobs.py --once                 # run every job once and exit
+    python run_jobs.py --once expiration_sweep
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+import app.models  # noqa: F401 - register all models
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.scheduler import JOBS, get_job, run_forever, run_job
+
+
+def main():
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args = sys.argv[1:]
+
+    if args and args[0] == "--once":
+        jobs = [get_job(name) for name in args[1:]] if len(args) > 1 else JOBS
+        if None in jobs:
+            sys.exit(f"Unknown job; expected one of: {', '.join(job.name for job in JOBS)}")
+        failed = False
+        for job in jobs:
+            run = run_job(SessionLocal, job)
+            print(f"{'✓' if run.error is None else '✗'} {job.name}: {run.status.value} in {run.duration_ms} ms {run.stats or ''}")
+            failed = failed or run.error is not None
+        sys.exit(1 if failed else 0)
+
+    print(f"Running {', '.join(job.name for job in JOBS)} (Ctrl+C to stop)")
+    try:
+        asyncio.run(run_forever(SessionLocal))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -369,9 +369,7 @@ export default function ItemManagementPage() {
       try {
         const response = await csvImportApi.preview(file);
         setImportPreviewData(response.data);
-        // Extract cache key from response headers or generate from timestamp
-        const cacheKey = `${response.data.total_rows}_${Date.now()}`;
-        setImportCacheKey(cacheKey);
+        setImportCacheKey(response.data.cache_key || "");
         setConflictResolution("skip");
         setSelectedConflicts(new Set());
       } catch (error: any) {
@@ -385,11 +383,8 @@ export default function ItemManagementPage() {
     if (!importFile || !importPreviewData) return;
 
     try {
-      // Re-upload to get cache key
-      const previewResponse = await csvImportApi.preview(importFile);
-      const timestamp = Date.now();
-      const userId = localStorage.getItem("userId") || "unknown";
-      const cacheKey = `${userId}_${timestamp / 1000}`;
+      // The preview staged the upload on the server under this key
+      const cacheKey = importCacheKey;
 
       // Determine which items to replace based on resolution strategy
       let itemCodesToReplace: string[] | undefined;
@@ -401,7 +396,7 @@ export default function ItemManagementPage() {
       ) {
         // If replace mode, exclude unselected items
         const allConflictCodes = new Set(
-          previewResponse.data.conflicts.map((c) => c.item_code)
+          importPreviewData.conflicts.map((c) => c.item_code)
         );
         itemCodesToReplace = Array.from(allConflictCodes).filter(
           (code) => !selectedConflicts.has(code)
@@ -970,6 +970,61 @@ export const reportsApi = {
     }),
 };
 
+// Full-period streaming exports (every row carries a resume `cursor`)
+export type ExportFormat = "csv" | "ndjson";
+
+export const exportsApi = {
+  movements: (params?: {
+    format?: ExportFormat;
+    start_date?: string;
+    end_date?: string;
+    location_id?: string;
+    item_id?: string;
+    movement_type?: string;
+    cursor?: string;
+  }) =>
+    apiClient.get<Blob>("/api/v1/exports/movements", {
+      params,
+      responseType: "blob",
+    }),
+
+  audit: (params?: {
+    format?: ExportFormat;
+    start_date?: string;
+    end_date?: string;
+    user_id?: string;
+    action?: string;
+    entity_type?: string;
+    cursor?: string;
+  }) =>
+    apiClient.get<Blob>("/api/v1/exports/audit", {
+      params,
+      responseType: "blob",
+    }),
+
+  inventory: (params?: {
+    format?: ExportFormat;
+    location_id?: string;
+    cursor?: string;
+  }) =>
+    apiClient.get<Blob>("/api/v1/exports/inventory", {
+      params,
+      responseType: "blob",
+    }),
+
+  expirations: (params?: {
+    format?: ExportFormat;
+    days_ahead?: number;
+    include_expired?: boolean;
+    location_id?: string;
+    cursor?: string;
+  }) =>
+    apiClient.get<Blob>("/api/v1/exports/expirations", {
+      params,
+      responseType: "blob",
+    }),
+};
+
 // ============================================================================
 // USERS
 // ============================================================================
@@ -1338,6 +1393,7 @@ export interface CSVImportPreviewResponse {
   new_items: number;
   conflicts: CSVImportConflict[];
   errors: Array<{ row: number; field?: string; error: string }>;
+  cache_key?: string;
 }
 
 export interface CSVImportRequest {
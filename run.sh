@@ -97,7 +97,8 @@ case $choice in
         echo "${GREEN}📦 Starting Backend (Port 8000)...${NC}"
         cd backend
         source venv/bin/activate
-        PYTHONPATH=$(pwd) python -m uvicorn app.main:app --reload --port 8000 > ../backend.log 2>&1 &
+        PYTHONPATH=$(pwd) python init_db.py > ../backend.log 2>&1
+        JOBS_ENABLED=true PYTHONPATH=$(pwd) python -m uvicorn app.main:app --reload --port 8000 >> ../backend.log 2>&1 &
         BACKEND_PID=$!
         cd ..
         
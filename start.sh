@@ -28,7 +28,8 @@ fi
 echo "${GREEN}📦 Starting Backend (Port 8000)...${NC}"
 cd backend
 source venv/bin/activate
-PYTHONPATH=$(pwd) python -m uvicorn app.main:app --reload --port 8000 &
+PYTHONPATH=$(pwd) python init_db.py
+JOBS_ENABLED=true PYTHONPATH=$(pwd) python -m uvicorn app.main:app --reload --port 8000 &
 BACKEND_PID=$!
 cd ..
 